@@ -0,0 +1,444 @@
+import asyncio
+import time
+
+import aiohttp
+from requests.exceptions import HTTPError, RequestException
+from src.api.balancer import resolve_base_url
+from src.api.clients import JSON_CONTENT_TYPE, get_codec, with_query
+from src.api.coalesce import AsyncRequestCoalescer
+from src.api.compression import build_accept_encoding, compress_body
+from src.api.metrics import get_default_recorder
+from src.api.rate_limit import get_default_rate_limiter
+from src.api.retry import get_default_retry_policy
+from src.api.streaming import JSONArrayDecoder
+from src.config.settings import settings
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI, HAS_ZSTD
+except ImportError:
+    # aiohttp releases without zstd support
+    from aiohttp.http_parser import HAS_BROTLI
+    HAS_ZSTD = False
+
+# Transient failures worth retrying for idempotent requests
+RETRYABLE_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+# Content codings aiohttp can decode here; br and zstd depend on optional packages
+SUPPORTED_ENCODINGS = ('gzip', 'deflate') + (('br',) if HAS_BROTLI else ()) + (('zstd',) if HAS_ZSTD else ())
+
+
+def _wire_bytes_in(response, bytes_in):
+    """
+    Returns the size of a read response body as received. aiohttp 3.12+ counts the compressed bytes;
+    older releases only know them from Content-Length.
+    """
+    wire_bytes = getattr(response.content, 'total_raw_bytes', None)
+    if wire_bytes is None:
+        wire_bytes = response.content_length
+    return bytes_in if wire_bytes is None else wire_bytes
+
+
+def _timing_trace_config():
+    """
+    Builds an aiohttp trace config that fills in the RequestTiming passed as ``trace_request_ctx``.
+    aiohttp times DNS inside connection setup and does not expose the TLS handshake separately,
+    so ``connect`` covers TCP and TLS and ``tls`` stays None.
+
+    Returns:
+        aiohttp.TraceConfig: The trace config to install on the session.
+    """
+
+    async def on_dns_start(session, ctx, params):
+        ctx.dns_started = time.perf_counter()
+
+    async def on_dns_end(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        if timing is not None:
+            timing.dns = time.perf_counter() - ctx.dns_started
+
+    async def on_connection_start(session, ctx, params):
+        ctx.connect_started = time.perf_counter()
+
+    async def on_connection_end(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        if timing is not None:
+            timing.connect = time.perf_counter() - ctx.connect_started - (timing.dns or 0.0)
+
+    async def on_chunk_sent(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        if timing is not None:
+            timing.bytes_out += len(params.chunk)
+
+    async def on_headers_sent(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        if timing is not None:
+            timing.sent = time.perf_counter()
+
+    async def on_request_end(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        if timing is not None and timing.sent is not None:
+            timing.ttfb = time.perf_counter() - timing.sent
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_end)
+    trace_config.on_connection_create_start.append(on_connection_start)
+    trace_config.on_connection_create_end.append(on_connection_end)
+    trace_config.on_request_chunk_sent.append(on_chunk_sent)
+    trace_config.on_request_headers_sent.append(on_headers_sent)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+class AsyncAPIClient:
+    """
+    AsyncAPIClient is the asyncio counterpart of APIClient.
+    It supports GET, POST, PUT, and DELETE requests over a single pooled aiohttp session
+    and caps the number of requests in flight at once.
+
+    Attributes:
+        base_url (str): The base URL for the API; with several replicas, the first one.
+        balancer (LoadBalancer): Spreads requests over the replicas, or None with a single base URL.
+        max_concurrency (int): Maximum number of requests in flight at once.
+        retry (RetryPolicy): The retry policy applied to every request.
+        timeout (tuple): The (connect, read) timeouts in seconds.
+        rate_limiter (RateLimiter): The per-endpoint rate limiter and in-flight governor.
+        metrics (MetricsRecorder): The recorder receiving per-request timings.
+        codec (JSONCodec): The JSON backend encoding request bodies and decoding responses.
+        accept_encoding (str): The Accept-Encoding header sent with every request.
+        compress_min_size (int): Smallest request body sent gzipped, in bytes; 0 when request compression is off.
+        coalescer (AsyncRequestCoalescer): Shares concurrent identical GETs, or None when coalescing is off.
+    """
+
+    def __init__(self, base_url=None, max_concurrency=None, idle_timeout=None, retry=None, timeout=None,
+                 rate_limiter=None, metrics=None, codec=None, accept_encoding=None, compress_min_size=None,
+                 coalescer=None, balancer=None):
+        """
+        Initializes the AsyncAPIClient with the given base URL.
+
+        Args:
+            base_url (str or list): The base URL for the API, or the base URLs of several replicas to balance requests
+                over. Defaults to the replicas in API_BASE_URLS, then API_BASE_URL from settings.
+            max_concurrency (int): Maximum number of requests in flight at once.
+                Defaults to ASYNC_MAX_CONCURRENCY from settings.
+            idle_timeout (float): Keep-alive idle timeout in seconds for pooled connections.
+                Defaults to POOL_IDLE_TIMEOUT from settings.
+            retry (RetryPolicy): The retry policy to use. Defaults to the process-wide policy and its shared retry budget.
+            timeout (tuple): The (connect, read) timeouts in seconds. Defaults to CONNECT_TIMEOUT and TIMEOUT from settings.
+            rate_limiter (RateLimiter): The rate limiter to use. Defaults to the process-wide limiter, shared with APIClient.
+            metrics (MetricsRecorder): The metrics recorder to use. Defaults to the process-wide recorder, shared with APIClient.
+            codec (JSONCodec): The JSON codec to use. Defaults to the one selected by JSON_CODEC.
+            accept_encoding (str): 'auto' for every coding aiohttp can decode, 'identity', or a list such as 'gzip, br'.
+                Defaults to ACCEPT_ENCODING from settings.
+            compress_min_size (int): Smallest POST/PUT body to gzip, in bytes; 0 disables request compression.
+                Defaults to REQUEST_COMPRESSION_MIN_SIZE from settings.
+            coalescer (AsyncRequestCoalescer): The request coalescer to use, or False to send every GET. Defaults to
+                one per client, like the session, when COALESCE_REQUESTS is set, otherwise every GET is sent.
+        """
+        self.base_url, self.balancer = resolve_base_url(base_url, balancer)
+        self.max_concurrency = max_concurrency or settings.ASYNC_MAX_CONCURRENCY
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.POOL_IDLE_TIMEOUT
+        self.retry = retry if retry is not None else get_default_retry_policy()
+        self.timeout = timeout if timeout is not None else (settings.CONNECT_TIMEOUT, settings.TIMEOUT)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_default_rate_limiter()
+        self.metrics = metrics if metrics is not None else get_default_recorder()
+        self.codec = codec if codec is not None else get_codec()
+        self.accept_encoding = build_accept_encoding(accept_encoding or settings.ACCEPT_ENCODING, SUPPORTED_ENCODINGS)
+        self.compress_min_size = compress_min_size if compress_min_size is not None \
+            else settings.REQUEST_COMPRESSION_MIN_SIZE
+        if coalescer is None and settings.COALESCE_REQUESTS:
+            coalescer = AsyncRequestCoalescer()
+        self.coalescer = coalescer or None
+        self._session = None
+        self._semaphore = None
+
+    def _ensure_session(self):
+        """
+        Creates the aiohttp session on first use, inside the running event loop.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=self.idle_timeout)
+            connect_timeout, read_timeout = self.timeout
+            timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                                  trace_configs=[_timing_trace_config()])
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _http(self, method, endpoint, url, read_body=True, **kwargs):
+        """
+        Sends a request with the client's rate limits and retry policy.
+        A ``json`` payload is encoded once with the client's codec, and gzipped when it reaches
+        ``compress_min_size``, before any retries.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The API endpoint, used to pick the rate limit.
+            url (str): The full request URL.
+            read_body (bool): Read the whole body before returning; streaming callers pass False.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Returns:
+            aiohttp.ClientResponse: The final HTTP response.
+        """
+        session = self._ensure_session()
+        limit = self.rate_limiter.limit_for(endpoint)
+        headers = {'Accept-Encoding': self.accept_encoding, **kwargs.get('headers', {})}
+        payload_size = None
+        if 'json' in kwargs:
+            payload = self.codec.dumps(kwargs.pop('json'))
+            payload_size = len(payload)
+            kwargs['data'], content_headers = compress_body(payload, self.compress_min_size)
+            headers.update(JSON_CONTENT_TYPE, **content_headers)
+        kwargs['headers'] = headers
+
+        async def send():
+            async with limit.slot_async():
+                # Each attempt picks a replica, so retries move away from a failing one
+                replica = self.balancer.acquire() if self.balancer is not None else None
+                target = self.balancer.route(url, replica) if replica is not None else url
+                timing = self.metrics.start(method, endpoint, bind=False)
+                started = time.perf_counter()
+                try:
+                    response = await session.request(method, target, trace_request_ctx=timing, **kwargs)
+                    if read_body:
+                        # read() returns the connection to the pool once the body is in, and keeps the bytes
+                        bytes_in = len(await response.read())
+                        wire_bytes_in = _wire_bytes_in(response, bytes_in)
+                    else:
+                        bytes_in = wire_bytes_in = response.content_length or 0
+                except Exception as error:
+                    self.metrics.finish(timing, error=error, bytes_out=timing.bytes_out if timing else 0)
+                    if replica is not None:
+                        self.balancer.release(replica, time.perf_counter() - started, error=error)
+                    raise
+                except asyncio.CancelledError:
+                    if replica is not None:
+                        self.balancer.release(replica, None)
+                    raise
+                if replica is not None:
+                    self.balancer.release(replica, time.perf_counter() - started, response.status)
+            wire_bytes_out = timing.bytes_out if timing else 0
+            self.metrics.finish(timing, response.status, bytes_in,
+                                wire_bytes_out if payload_size is None else payload_size,
+                                wire_bytes_in=wire_bytes_in, wire_bytes_out=wire_bytes_out)
+            limit.observe(response.status, response.headers)
+            return response
+
+        return await self.retry.execute_async(method, send, RETRYABLE_ERRORS)
+
+    async def _request(self, method, endpoint, **kwargs):
+        """
+        Internal method to handle HTTP requests.
+
+        Args:
+            method (str): The HTTP method (e.g., 'GET', 'POST', etc.).
+            endpoint (str): The API endpoint.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Returns:
+            dict or int: The JSON response for 'GET', 'POST', and 'PUT' requests, or the status code for 'DELETE'.
+
+        Raises:
+            HTTPError: An error occurred during the HTTP request.
+            RequestException: A non-HTTP error occurred (e.g., network issues).
+        """
+        url = f"{self.base_url}/{endpoint}"
+        self._ensure_session()
+        try:
+            async with self._semaphore:
+                response = await self._http(method, endpoint, url, **kwargs)
+            if response.status >= 400:
+                raise HTTPError(f"{response.status} Error: {response.reason} for url: {url}")
+            if method == 'DELETE':
+                return response.status
+            return self.codec.loads(await response.read())
+        except HTTPError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as req_err:
+            print(f"Request error occurred: {req_err}")
+            raise RequestException(str(req_err)) from req_err
+
+    async def get(self, endpoint, params=None):
+        """
+        Sends a GET request to the specified endpoint. Calls for the same URL made while one is in flight
+        wait for it and return the same result.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict): Query parameters such as filters ({'postId': 1}) or pagination ({'_page': 2, '_limit': 20}).
+
+        Returns:
+            dict: The JSON response.
+        """
+        endpoint = with_query(endpoint, params)
+        if self.coalescer is None:
+            return await self._request('GET', endpoint)
+        return await self.coalescer.do(('GET', f"{self.base_url}/{endpoint}"), self._request, 'GET', endpoint)
+
+    async def get_page(self, endpoint, params=None):
+        """
+        Sends a GET request for one page of a collection and reads the collection size from ``X-Total-Count``.
+        Concurrent requests for the same page are coalesced like ``get``.
+
+        Args:
+            endpoint (str): The collection endpoint.
+            params (dict): Query parameters including the pagination, e.g. {'_page': 2, '_limit': 20}.
+
+        Returns:
+            tuple: The page items and the total count, or None when the server did not send it.
+
+        Raises:
+            HTTPError: An error occurred during the HTTP request.
+            RequestException: A non-HTTP error occurred (e.g., network issues).
+        """
+        endpoint = with_query(endpoint, params)
+        url = f"{self.base_url}/{endpoint}"
+        if self.coalescer is None:
+            return await self._get_page(endpoint, url)
+        return await self.coalescer.do(('GET page', url), self._get_page, endpoint, url)
+
+    async def _get_page(self, endpoint, url):
+        self._ensure_session()
+        try:
+            async with self._semaphore:
+                response = await self._http('GET', endpoint, url)
+            if response.status >= 400:
+                raise HTTPError(f"{response.status} Error: {response.reason} for url: {url}")
+            total = response.headers.get('X-Total-Count')
+            return self.codec.loads(await response.read()), int(total) if total is not None else None
+        except HTTPError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as req_err:
+            print(f"Request error occurred: {req_err}")
+            raise RequestException(str(req_err)) from req_err
+
+    async def stream(self, endpoint, chunk_size=None, params=None):
+        """
+        Sends a GET request to a collection endpoint and yields its items as they arrive.
+
+        Args:
+            endpoint (str): The API endpoint.
+            chunk_size (int): Number of bytes read from the socket at a time.
+                Defaults to STREAM_CHUNK_SIZE from settings.
+            params (dict): Query parameters, as for ``get``.
+
+        Yields:
+            dict: Each item of the JSON array response.
+
+        Raises:
+            HTTPError: An error occurred during the HTTP request.
+            RequestException: A non-HTTP error occurred (e.g., network issues).
+        """
+        chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+        endpoint = with_query(endpoint, params)
+        url = f"{self.base_url}/{endpoint}"
+        self._ensure_session()
+        try:
+            async with self._semaphore:
+                async with await self._http('GET', endpoint, url, read_body=False) as response:
+                    if response.status >= 400:
+                        raise HTTPError(f"{response.status} Error: {response.reason} for url: {url}")
+                    decoder = JSONArrayDecoder()
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        for item in decoder.feed(chunk):
+                            yield item
+                    for item in decoder.close():
+                        yield item
+        except HTTPError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as req_err:
+            print(f"Request error occurred: {req_err}")
+            raise RequestException(str(req_err)) from req_err
+
+    async def post(self, endpoint, data):
+        """
+        Sends a POST request to the specified endpoint with the given data.
+
+        Args:
+            endpoint (str): The API endpoint.
+            data (dict): The JSON payload to send in the request body.
+
+        Returns:
+            dict: The JSON response.
+        """
+        return await self._request('POST', endpoint, json=data)
+
+    async def put(self, endpoint, data):
+        """
+        Sends a PUT request to the specified endpoint with the given data.
+
+        Args:
+            endpoint (str): The API endpoint.
+            data (dict): The JSON payload to send in the request body.
+
+        Returns:
+            dict: The JSON response.
+        """
+        return await self._request('PUT', endpoint, json=data)
+
+    async def delete(self, endpoint):
+        """
+        Sends a DELETE request to the specified endpoint.
+
+        Args:
+            endpoint (str): The API endpoint.
+
+        Returns:
+            int: The status code of the response.
+        """
+        return await self._request('DELETE', endpoint)
+
+    async def close(self):
+        """
+        Closes the underlying session and its pooled connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def coalesce_stats(self):
+        """
+        Returns the request coalescing counters.
+
+        Returns:
+            dict: GETs executed, GETs that joined one in flight and GETs in flight, or an empty dict when coalescing is off.
+        """
+        return self.coalescer.stats() if self.coalescer is not None else {}
+
+    def balancer_stats(self):
+        """
+        Returns the load balancer counters.
+
+        Returns:
+            dict: Per-replica requests, failures, ejections, requests outstanding, latency estimate and ejection
+                state, or an empty dict with a single base URL.
+        """
+        return self.balancer.stats() if self.balancer is not None else {}
+
+    def metrics_summary(self):
+        """
+        Returns the aggregated request metrics.
+
+        Returns:
+            dict: Per-endpoint and per-method request counts, statuses, bytes and p50/p90/p99 timings.
+        """
+        return self.metrics.summary()
+
+    def retry_stats(self):
+        """
+        Returns the retry policy counters.
+
+        Returns:
+            dict: Requests, retries (total and per reason), retries given up and retries denied by the budget.
+        """
+        return self.retry.stats()
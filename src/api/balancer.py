@@ -0,0 +1,330 @@
+import math
+import threading
+import time
+
+from src.config.settings import settings
+
+# Response statuses that count against a host's health, like a connection error or a timeout
+UNHEALTHY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class Endpoint:
+    """
+    One backend replica and its passive health state.
+
+    Attributes:
+        base_url (str): The replica's base URL.
+        outstanding (int): Requests sent to it and not completed yet.
+        cost (float): Peak-EWMA of its response time in seconds, 0 until the first response.
+        failures (int): Consecutive failed requests.
+        ejected_until (float): ``time.monotonic()`` deadline of the current ejection, 0 when not ejected.
+    """
+
+    __slots__ = ('base_url', 'outstanding', 'cost', 'updated', 'failures', 'ejected_until', '_counters')
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.outstanding = 0
+        self.cost = 0.0
+        self.updated = 0.0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self._counters = {'requests': 0, 'failures': 0, 'ejections': 0}
+
+    def decayed_cost(self, now, decay):
+        """
+        Returns the latency estimate decayed toward zero for the time since the last response, so an idle
+        replica, e.g. one that was slow a while ago, is eventually tried again.
+
+        Args:
+            now (float): The current ``time.monotonic()``.
+            decay (float): The decay time constant in seconds.
+
+        Returns:
+            float: The estimate in seconds.
+        """
+        return self.cost * math.exp(-max(0.0, now - self.updated) / decay)
+
+
+class RoundRobin:
+    """
+    Sends requests to the healthy replicas in turn.
+    """
+
+    def __init__(self):
+        self._next = 0
+
+    def choose(self, endpoints, now):
+        """
+        Picks the endpoint for the next request.
+
+        Args:
+            endpoints (list): The candidate Endpoints, never empty.
+            now (float): The current ``time.monotonic()``.
+
+        Returns:
+            Endpoint: The chosen endpoint.
+        """
+        self._next += 1
+        return endpoints[self._next % len(endpoints)]
+
+
+class LeastOutstanding(RoundRobin):
+    """
+    Sends requests to the replica with the fewest requests in flight; ties go round-robin.
+    """
+
+    def score(self, endpoint, now):
+        return endpoint.outstanding
+
+    def choose(self, endpoints, now):
+        self._next += 1
+        start = self._next % len(endpoints)
+        rotated = endpoints[start:] + endpoints[:start]
+        return min(rotated, key=lambda endpoint: self.score(endpoint, now))
+
+
+class PeakEWMA(LeastOutstanding):
+    """
+    Latency-aware balancing: sends requests to the replica with the lowest expected wait, its Peak-EWMA
+    response time multiplied by the requests it already has in flight. A slow response raises the estimate
+    at once, fast ones lower it gradually, so a degraded replica is avoided before it hurts tail latency.
+
+    Attributes:
+        decay (float): Time constant in seconds of the moving average.
+    """
+
+    def __init__(self, decay=None):
+        super().__init__()
+        self.decay = decay or settings.BALANCER_EWMA_DECAY
+
+    def score(self, endpoint, now):
+        return endpoint.decayed_cost(now, self.decay) * (endpoint.outstanding + 1), endpoint.outstanding
+
+    def observe(self, endpoint, elapsed, now):
+        """
+        Updates the endpoint's latency estimate with a response time.
+
+        Args:
+            endpoint (Endpoint): The endpoint that answered.
+            elapsed (float): The response time in seconds.
+            now (float): The current ``time.monotonic()``.
+        """
+        cost = endpoint.decayed_cost(now, self.decay)
+        if elapsed > cost:
+            endpoint.cost = elapsed
+        else:
+            weight = math.exp(-max(0.0, now - endpoint.updated) / self.decay)
+            endpoint.cost = cost * weight + elapsed * (1 - weight)
+        endpoint.updated = now
+
+
+# Balancing strategies selectable by name
+STRATEGIES = {'round_robin': RoundRobin, 'least_outstanding': LeastOutstanding, 'ewma': PeakEWMA}
+
+
+class LoadBalancer:
+    """
+    LoadBalancer spreads requests over several replicas of the API and keeps failing ones out of rotation.
+
+    Health is tracked passively, from the requests themselves: a connection error, a timeout or a 5xx response
+    is a failure, and a replica with ``max_failures`` consecutive failures is ejected for ``ejection_time``
+    seconds. It then gets traffic again on probation, where a single failure ejects it again. When every
+    replica is ejected, requests go to all of them rather than none.
+
+    Attributes:
+        endpoints (list): The Endpoints, in configuration order.
+        strategy: The balancing strategy, an object with ``choose(endpoints, now)``.
+        max_failures (int): Consecutive failures that eject a replica.
+        ejection_time (float): Seconds an ejected replica receives no traffic.
+    """
+
+    def __init__(self, base_urls, strategy=None, max_failures=None, ejection_time=None):
+        """
+        Initializes the LoadBalancer.
+
+        Args:
+            base_urls (list): The replicas' base URLs.
+            strategy (str or object): 'round_robin', 'least_outstanding' or 'ewma', or a strategy instance.
+                Defaults to LOAD_BALANCER from settings.
+            max_failures (int): Consecutive failures that eject a replica. Defaults to BALANCER_MAX_FAILURES.
+            ejection_time (float): Seconds a replica stays ejected. Defaults to BALANCER_EJECTION_TIME.
+
+        Raises:
+            ValueError: No base URL was given, or the strategy is unknown.
+        """
+        if not base_urls:
+            raise ValueError("LoadBalancer needs at least one base URL.")
+        strategy = strategy or settings.LOAD_BALANCER
+        if isinstance(strategy, str):
+            if strategy not in STRATEGIES:
+                raise ValueError(f"Unknown balancing strategy '{strategy}'; choose from {', '.join(STRATEGIES)}")
+            strategy = STRATEGIES[strategy]()
+        self.endpoints = [Endpoint(base_url) for base_url in base_urls]
+        self.strategy = strategy
+        self.max_failures = max_failures or settings.BALANCER_MAX_FAILURES
+        self.ejection_time = ejection_time if ejection_time is not None else settings.BALANCER_EJECTION_TIME
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        """
+        str: The first replica's base URL, identifying the API in cache and coalescing keys.
+        """
+        return self.endpoints[0].base_url
+
+    def acquire(self):
+        """
+        Picks the replica for one request attempt and counts the request as outstanding on it.
+        Every call must be paired with ``release``.
+
+        Returns:
+            Endpoint: The chosen replica.
+        """
+        with self._lock:
+            now = time.monotonic()
+            healthy = [endpoint for endpoint in self.endpoints if endpoint.ejected_until <= now]
+            endpoint = self.strategy.choose(healthy or self.endpoints, now)
+            endpoint.outstanding += 1
+            endpoint._counters['requests'] += 1
+            return endpoint
+
+    def release(self, endpoint, elapsed, status=None, error=None):
+        """
+        Records the outcome of a request sent to ``endpoint``.
+
+        Args:
+            endpoint (Endpoint): The replica returned by ``acquire``.
+            elapsed (float): Seconds the request took, or None when it was abandoned, e.g. cancelled.
+            status (int): The response status, when a response arrived.
+            error (Exception): The error raised instead of a response.
+        """
+        with self._lock:
+            now = time.monotonic()
+            endpoint.outstanding -= 1
+            if elapsed is None:
+                return
+            failed = error is not None or status in UNHEALTHY_STATUSES
+            observe = getattr(self.strategy, 'observe', None)
+            if observe is not None:
+                # A replica failing fast must not look fast: failures count as twice the slowest replica
+                observe(endpoint, max(elapsed, 2 * max(other.cost for other in self.endpoints)) if failed else elapsed,
+                        now)
+            if not failed:
+                endpoint.failures = 0
+                return
+            endpoint.failures += 1
+            endpoint._counters['failures'] += 1
+            if endpoint.failures >= self.max_failures and endpoint.ejected_until <= now:
+                endpoint.ejected_until = now + self.ejection_time
+                endpoint._counters['ejections'] += 1
+                # Back in rotation, one more failure is enough to eject it again
+                endpoint.failures = self.max_failures - 1
+
+    def route(self, url, endpoint):
+        """
+        Rewrites a URL built on ``base_url`` to point at ``endpoint``.
+
+        Args:
+            url (str): The request URL.
+            endpoint (Endpoint): The chosen replica.
+
+        Returns:
+            str: The URL on the replica.
+        """
+        if endpoint is self.endpoints[0] or not url.startswith(self.base_url):
+            return url
+        return endpoint.base_url + url[len(self.base_url):]
+
+    def stats(self):
+        """
+        Returns the per-replica counters.
+
+        Returns:
+            dict: For each base URL, requests sent, failures, ejections, requests outstanding, the latency
+                estimate in milliseconds (EWMA strategy only) and whether it is ejected now.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {endpoint.base_url: {**endpoint._counters, 'outstanding': endpoint.outstanding,
+                                        'ewma_ms': round(endpoint.cost * 1000, 3),
+                                        'ejected': endpoint.ejected_until > now}
+                    for endpoint in self.endpoints}
+
+
+def parse_base_urls(value):
+    """
+    Splits a comma-separated list of base URLs.
+
+    Args:
+        value (str or list): E.g. 'http://10.0.0.1:8080, http://10.0.0.2:8080', or a list of URLs.
+
+    Returns:
+        list: The base URLs, without trailing slashes.
+    """
+    urls = value.split(',') if isinstance(value, str) else value
+    return [url.strip().rstrip('/') for url in urls if url and url.strip()]
+
+
+_default_balancer = None
+_default_balancer_lock = threading.Lock()
+
+
+def get_default_balancer():
+    """
+    Returns the process-wide LoadBalancer over API_BASE_URLS, creating it on first use, so every client
+    shares one view of replica health.
+
+    Returns:
+        LoadBalancer: The shared balancer, or None when API_BASE_URLS lists fewer than two replicas.
+    """
+    global _default_balancer
+    default = _default_balancer
+    if default is None:
+        with _default_balancer_lock:
+            if _default_balancer is None:
+                base_urls = parse_base_urls(settings.API_BASE_URLS)
+                if len(base_urls) < 2:
+                    return None
+                _default_balancer = LoadBalancer(base_urls)
+            default = _default_balancer
+    return default
+
+
+@settings.on_reload
+def _reset_default_balancer():
+    # The next get builds it from the reloaded settings; clients created before keep the old one
+    global _default_balancer
+    with _default_balancer_lock:
+        _default_balancer = None
+
+
+def resolve_base_url(base_url=None, balancer=None):
+    """
+    Works out where a client sends its requests.
+
+    Args:
+        base_url (str or list): One base URL, several as a list or a comma-separated string, or None for the
+            settings: the shared balancer when API_BASE_URLS lists replicas, otherwise API_BASE_URL.
+        balancer (LoadBalancer): A balancer to use instead of ``base_url``.
+
+    Returns:
+        tuple: The client's base URL and its LoadBalancer, or None when there is a single replica.
+
+    Raises:
+        ValueError: ``base_url`` or API_BASE_URLS is given but names no URL, e.g. ``[]`` or ``','``.
+    """
+    if balancer is None and base_url is None:
+        balancer = get_default_balancer()
+        if balancer is None:
+            if not settings.API_BASE_URLS.strip():
+                return settings.API_BASE_URL, None
+            base_url = settings.API_BASE_URLS
+    if balancer is None:
+        base_urls = parse_base_urls(base_url)
+        if not base_urls:
+            raise ValueError(f"No base URL in {base_url!r}.")
+        if len(base_urls) == 1:
+            return base_urls[0], None
+        balancer = LoadBalancer(base_urls)
+    return balancer.base_url, balancer
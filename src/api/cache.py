@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import OrderedDict
+
+from src.config.settings import settings
+
+
+def _path_of(endpoint):
+    """
+    Returns the endpoint path without its query string or surrounding slashes.
+    """
+    return endpoint.split('?', 1)[0].strip('/')
+
+
+class CacheEntry:
+    """
+    A cached GET response body with its freshness and validators.
+
+    Attributes:
+        path (str): The endpoint path the entry was fetched from.
+        content (bytes): The raw response body.
+        etag (str): The ETag validator, if the server sent one.
+        last_modified (str): The Last-Modified validator, if the server sent one.
+        expires_at (float): Monotonic time after which the entry must be revalidated.
+    """
+
+    def __init__(self, path, content, etag, last_modified, expires_at):
+        self.path = path
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self):
+        """
+        bool: True while the entry may be served without contacting the server.
+        """
+        return time.monotonic() < self.expires_at
+
+    def conditional_headers(self):
+        """
+        Builds the headers for a conditional revalidation request.
+
+        Returns:
+            dict: If-None-Match and/or If-Modified-Since headers.
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    ResponseCache is a bounded, thread-safe LRU cache of GET responses keyed by method and URL.
+    Entries expire after a per-endpoint TTL and are then revalidated with ETag or
+    Last-Modified validators when the server provided them.
+
+    Attributes:
+        max_entries (int): Maximum number of cached responses before the least recently used is evicted.
+        default_ttl (float): Seconds a response stays fresh when no endpoint-specific TTL matches.
+        ttls (dict): Mapping of endpoint path prefix (e.g. 'users' or 'posts/1') to TTL in seconds.
+        offline (bool): Always False; the in-memory cache never replaces the network.
+    """
+
+    offline = False
+
+    def __init__(self, max_entries=None, default_ttl=None, ttls=None):
+        """
+        Initializes the ResponseCache.
+
+        Args:
+            max_entries (int): Maximum number of cached responses. Defaults to CACHE_MAX_ENTRIES from settings.
+            default_ttl (float): Default freshness lifetime in seconds. Defaults to CACHE_TTL from settings.
+            ttls (dict): Per-endpoint TTL overrides, matched on the longest path prefix.
+                Defaults to CACHE_TTLS from settings.
+        """
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self.default_ttl = default_ttl if default_ttl is not None else settings.CACHE_TTL
+        self.ttls = dict(ttls if ttls is not None else settings.CACHE_TTLS)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def key(method, url):
+        """
+        Returns the cache key for a request.
+        """
+        return f"{method} {url}"
+
+    def ttl_for(self, endpoint):
+        """
+        Resolves the TTL of an endpoint from the longest matching path prefix.
+
+        Args:
+            endpoint (str): The API endpoint.
+
+        Returns:
+            float: The TTL in seconds.
+        """
+        path = _path_of(endpoint)
+        best, best_len = self.default_ttl, -1
+        for prefix, ttl in self.ttls.items():
+            prefix = prefix.strip('/')
+            if (path == prefix or path.startswith(prefix + '/')) and len(prefix) > best_len:
+                best, best_len = ttl, len(prefix)
+        return best
+
+    def lookup(self, key):
+        """
+        Looks up an entry and records a hit when it is still fresh.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            CacheEntry: The entry, fresh or stale, or None when nothing is cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if entry is not None and entry.is_fresh():
+                self._counters['hits'] += 1
+            else:
+                self._counters['misses'] += 1
+            return entry
+
+    def store(self, key, endpoint, response):
+        """
+        Caches a successful GET response unless the server forbids it.
+
+        Args:
+            key (str): The cache key.
+            endpoint (str): The API endpoint the response belongs to.
+            response (requests.Response): The response to cache.
+        """
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+        entry = CacheEntry(_path_of(endpoint), response.content, response.headers.get('ETag'),
+                           response.headers.get('Last-Modified'), time.monotonic() + self.ttl_for(endpoint))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def refresh(self, entry, endpoint, response):
+        """
+        Extends the lifetime of an entry after the server answered 304 Not Modified.
+
+        Args:
+            entry (CacheEntry): The revalidated entry.
+            endpoint (str): The API endpoint the entry belongs to.
+            response (requests.Response): The 304 response, whose validators replace the cached ones.
+        """
+        with self._lock:
+            entry.etag = response.headers.get('ETag', entry.etag)
+            entry.last_modified = response.headers.get('Last-Modified', entry.last_modified)
+            entry.expires_at = time.monotonic() + self.ttl_for(endpoint)
+            self._counters['revalidated'] += 1
+
+    def invalidate(self, endpoint):
+        """
+        Drops every entry a write to ``endpoint`` may have changed: the resource itself,
+        its nested resources and the collections above it.
+
+        Args:
+            endpoint (str): The API endpoint that was written to.
+        """
+        path = _path_of(endpoint)
+        parts = path.split('/')
+        ancestors = {'/'.join(parts[:i]) for i in range(1, len(parts))}
+        with self._lock:
+            stale = [key for key, entry in self._entries.items()
+                     if entry.path == path or entry.path.startswith(path + '/') or entry.path in ancestors]
+            for key in stale:
+                del self._entries[key]
+            self._counters['invalidations'] += len(stale)
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns a snapshot of the cache counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``revalidated``, ``evictions`` and ``invalidations`` totals plus the current ``size``.
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot['size'] = len(self._entries)
+        return snapshot
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Returns the process-wide ResponseCache shared by API clients when caching is enabled, creating it on first use.
+
+    Returns:
+        ResponseCache: The shared cache.
+    """
+    global _default_cache
+    default = _default_cache
+    if default is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ResponseCache()
+            default = _default_cache
+    return default
+
+
+@settings.on_reload
+def _reset_default_cache():
+    # The next get builds it from the reloaded settings; clients created before keep the old one
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = None
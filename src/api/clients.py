@@ -1,6 +1,147 @@
-import requests
-from requests.exceptions import HTTPError, RequestException
-from src.config.settings import API_BASE_URL
+import json
+import time
+from urllib.parse import urlencode
+
+from requests.exceptions import (ChunkedEncodingError, ConnectionError, ContentDecodingError, HTTPError,
+                                 RequestException, Timeout)
+from src.api.balancer import resolve_base_url
+from src.api.cache import get_default_cache
+from src.api.coalesce import RequestCoalescer
+from src.api.compression import build_accept_encoding, compress_body
+from src.api.disk_cache import DiskCache, get_default_disk_cache
+from src.api.metrics import get_default_recorder
+from src.api.pool import get_default_pool
+from src.api.rate_limit import get_default_rate_limiter
+from src.api.retry import get_default_retry_policy
+from src.api.streaming import JSONArrayDecoder
+from src.config.settings import settings
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ACCEPT_ENCODING
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Transient failures worth retrying for idempotent requests
+RETRYABLE_ERRORS = (ConnectionError, Timeout)
+
+JSON_CONTENT_TYPE = {'Content-Type': 'application/json'}
+
+# Content codings urllib3 can decode here; br and zstd depend on the brotli and zstandard packages
+SUPPORTED_ENCODINGS = tuple(URLLIB3_ACCEPT_ENCODING.split(','))
+
+
+def _read_body(response):
+    """
+    Reads a streamed response body in one urllib3 read, which, unlike the chunked reads requests makes,
+    counts the bytes received before decompression in ``response.raw.tell()``. Errors are raised as
+    requests would raise them.
+
+    Args:
+        response (requests.Response): A response requested with ``stream=True``.
+
+    Returns:
+        bytes: The decoded body, also stored as ``response.content``.
+    """
+    try:
+        content = response.raw.read(decode_content=True)
+    except ProtocolError as error:
+        raise ChunkedEncodingError(error, response=response)
+    except DecodeError as error:
+        raise ContentDecodingError(error, response=response)
+    except ReadTimeoutError as error:
+        raise ConnectionError(error, response=response)
+    response._content = content
+    response._content_consumed = True
+    return content
+
+
+class JSONCodec:
+    """
+    A JSON backend. ``dumps`` encodes to UTF-8 bytes ready for the request body and ``loads`` decodes
+    the raw response bytes, so no intermediate str is built by the faster backends.
+
+    Attributes:
+        name (str): The backend name, e.g. 'orjson'.
+        dumps (callable): Encodes an object to bytes.
+        loads (callable): Decodes bytes to an object.
+    """
+
+    def __init__(self, name, dumps, loads):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+
+def _available_codecs():
+    codecs = {}
+    if orjson is not None:
+        # Like the stdlib, accept int and other non-str dict keys and write them as strings
+        codecs['orjson'] = JSONCodec('orjson', lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+                                     orjson.loads)
+    if msgspec is not None:
+        codecs['msgspec'] = JSONCodec('msgspec', msgspec.json.encode, msgspec.json.decode)
+    if ujson is not None:
+        codecs['ujson'] = JSONCodec('ujson', lambda obj: ujson.dumps(obj, ensure_ascii=False).encode('utf-8'),
+                                    ujson.loads)
+    codecs['json'] = JSONCodec('json', lambda obj: json.dumps(obj, ensure_ascii=False,
+                                                              separators=(',', ':')).encode('utf-8'), json.loads)
+    return codecs
+
+
+# Installed codecs, fastest first; the stdlib codec is always available
+CODECS = _available_codecs()
+
+
+def get_codec(name=None):
+    """
+    Returns a JSON codec by name.
+
+    Args:
+        name (str): 'auto' for the fastest installed backend, or one of 'orjson', 'msgspec', 'ujson' and 'json'.
+            Defaults to JSON_CODEC from settings.
+
+    Returns:
+        JSONCodec: The codec.
+
+    Raises:
+        ValueError: The backend is unknown or not installed.
+    """
+    name = name or settings.JSON_CODEC
+    if name == 'auto':
+        return next(iter(CODECS.values()))
+    if name not in CODECS:
+        raise ValueError(f"JSON codec '{name}' is not available; choose from auto, {', '.join(CODECS)}")
+    return CODECS[name]
+
+
+def with_query(endpoint, params=None):
+    """
+    Appends query parameters to an endpoint. Parameters are sorted so equal queries
+    share cache entries, and None values are dropped.
+
+    Args:
+        endpoint (str): The API endpoint, possibly with a query string already.
+        params (dict): Query parameters, e.g. {'postId': 1} or {'_page': 2, '_limit': 20}.
+
+    Returns:
+        str: The endpoint with the encoded query.
+    """
+    if not params:
+        return endpoint
+    query = urlencode(sorted((name, value) for name, value in params.items() if value is not None), doseq=True)
+    if not query:
+        return endpoint
+    return f"{endpoint}{'&' if '?' in endpoint else '?'}{query}"
 
 
 class APIClient:
@@ -9,17 +150,121 @@ class APIClient:
     It supports GET, POST, PUT, and DELETE requests.
 
     Attributes:
-        base_url (str): The base URL for the API.
+        base_url (str): The base URL for the API; with several replicas, the first one, which keys cached responses.
+        balancer (LoadBalancer): Spreads requests over the replicas, or None with a single base URL.
+        pool (ConnectionPool): The keep-alive connection pool used to send requests.
+        cache (ResponseCache or DiskCache): The GET response cache, or None when caching is off.
+        retry (RetryPolicy): The retry policy applied to every request.
+        timeout (tuple): The (connect, read) timeouts in seconds.
+        rate_limiter (RateLimiter): The per-endpoint rate limiter and in-flight governor.
+        metrics (MetricsRecorder): The recorder receiving per-request timings.
+        codec (JSONCodec): The JSON backend encoding request bodies and decoding responses.
+        accept_encoding (str): The Accept-Encoding header sent with every request.
+        compress_min_size (int): Smallest request body sent gzipped, in bytes; 0 when request compression is off.
+        coalescer (RequestCoalescer): Shares concurrent identical GETs, or None when coalescing is off.
     """
 
-    def __init__(self, base_url=API_BASE_URL):
+    def __init__(self, base_url=None, pool=None, cache=None, retry=None, timeout=None, rate_limiter=None,
+                 metrics=None, codec=None, accept_encoding=None, compress_min_size=None, coalescer=None, balancer=None):
         """
         Initializes the APIClient with the given base URL.
 
         Args:
-            base_url (str): The base URL for the API. Defaults to API_BASE_URL from settings.
+            base_url (str or list): The base URL for the API, or the base URLs of several replicas to balance requests
+                over. Defaults to the replicas in API_BASE_URLS, then API_BASE_URL from settings.
+            pool (ConnectionPool): The connection pool to use. Defaults to the process-wide shared pool.
+            cache (ResponseCache or DiskCache): The response cache to use. Defaults to the shared disk cache
+                when DISK_CACHE_MODE is set, then to the shared in-memory cache when RESPONSE_CACHE_ENABLED is set,
+                otherwise responses are not cached.
+            retry (RetryPolicy): The retry policy to use. Defaults to the process-wide policy and its shared retry budget.
+            timeout (tuple): The (connect, read) timeouts in seconds. Defaults to CONNECT_TIMEOUT and TIMEOUT from settings.
+            rate_limiter (RateLimiter): The rate limiter to use. Defaults to the process-wide limiter.
+            metrics (MetricsRecorder): The metrics recorder to use. Defaults to the process-wide recorder.
+            codec (JSONCodec): The JSON codec to use. Defaults to the one selected by JSON_CODEC.
+            accept_encoding (str): 'auto' for every coding urllib3 can decode, 'identity', or a list such as 'gzip, br'.
+                Defaults to ACCEPT_ENCODING from settings.
+            compress_min_size (int): Smallest POST/PUT body to gzip, in bytes; 0 disables request compression.
+                Defaults to REQUEST_COMPRESSION_MIN_SIZE from settings.
+            coalescer (RequestCoalescer): The request coalescer to use, or False to send every GET. Defaults to a
+                coalescer of this client's own when COALESCE_REQUESTS is set, otherwise every GET is sent.
+            balancer (LoadBalancer): The load balancer to use instead of ``base_url``, e.g. one shared by clients.
+        """
+        self.base_url, self.balancer = resolve_base_url(base_url, balancer)
+        self.pool = pool if pool is not None else get_default_pool()
+        if cache is None and settings.DISK_CACHE_MODE != 'off':
+            cache = get_default_disk_cache()
+        elif cache is None and settings.RESPONSE_CACHE_ENABLED:
+            cache = get_default_cache()
+        self.cache = cache
+        self.retry = retry if retry is not None else get_default_retry_policy()
+        self.timeout = timeout if timeout is not None else (settings.CONNECT_TIMEOUT, settings.TIMEOUT)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_default_rate_limiter()
+        self.metrics = metrics if metrics is not None else get_default_recorder()
+        self.codec = codec if codec is not None else get_codec()
+        self.accept_encoding = build_accept_encoding(accept_encoding or settings.ACCEPT_ENCODING, SUPPORTED_ENCODINGS)
+        self.compress_min_size = compress_min_size if compress_min_size is not None \
+            else settings.REQUEST_COMPRESSION_MIN_SIZE
+        if coalescer is None and settings.COALESCE_REQUESTS:
+            coalescer = RequestCoalescer()
+        self.coalescer = coalescer or None
+
+    def _http(self, method, endpoint, url, **kwargs):
+        """
+        Sends a request through the connection pool with the client's rate limits, timeouts and retry policy.
+        A ``json`` payload is encoded once with the client's codec, and gzipped when it reaches
+        ``compress_min_size``, before any retries.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The API endpoint, used to pick the rate limit.
+            url (str): The full request URL.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Returns:
+            requests.Response: The final HTTP response.
         """
-        self.base_url = base_url
+        kwargs.setdefault('timeout', self.timeout)
+        headers = {'Accept-Encoding': self.accept_encoding, **kwargs.get('headers', {})}
+        payload_size = None
+        if 'json' in kwargs:
+            payload = self.codec.dumps(kwargs.pop('json'))
+            payload_size = len(payload)
+            kwargs['data'], content_headers = compress_body(payload, self.compress_min_size)
+            headers.update(JSON_CONTENT_TYPE, **content_headers)
+        kwargs['headers'] = headers
+        streamed = kwargs.pop('stream', False)
+        limit = self.rate_limiter.limit_for(endpoint)
+
+        def send():
+            with limit.slot():
+                # Each attempt picks a replica, so retries move away from a failing one
+                replica = self.balancer.acquire() if self.balancer is not None else None
+                target = self.balancer.route(url, replica) if replica is not None else url
+                timing = self.metrics.start(method, endpoint)
+                started = time.perf_counter()
+                try:
+                    response = self.pool.request(method, target, **{**kwargs, 'stream': True})
+                    if streamed:
+                        bytes_in = wire_bytes_in = int(response.headers.get('Content-Length', 0))
+                    else:
+                        bytes_in = len(_read_body(response))
+                        wire_bytes_in = response.raw.tell()
+                except Exception as error:
+                    self.metrics.finish(timing, error=error)
+                    if replica is not None:
+                        self.balancer.release(replica, time.perf_counter() - started, error=error)
+                    raise
+                if replica is not None:
+                    self.balancer.release(replica, time.perf_counter() - started, response.status_code)
+            body = response.request.body
+            wire_bytes_out = len(body) if body else 0
+            self.metrics.finish(timing, response.status_code, bytes_in,
+                                wire_bytes_out if payload_size is None else payload_size,
+                                wire_bytes_in=wire_bytes_in, wire_bytes_out=wire_bytes_out)
+            limit.observe(response.status_code, response.headers)
+            return response
+
+        return self.retry.execute(method, send, RETRYABLE_ERRORS)
 
     def _request(self, method, endpoint, **kwargs):
         """
@@ -39,11 +284,18 @@ class APIClient:
         """
         url = f"{self.base_url}/{endpoint}"
         try:
-            response = requests.request(method, url, **kwargs)
+            if self.cache is not None:
+                if method == 'GET':
+                    return self._cached_get(endpoint, url, **kwargs)
+                self.cache.invalidate(endpoint)
+            response = self._send(method, endpoint, url, **kwargs)
             response.raise_for_status()
+            if self.cache is not None:
+                # Again once the write is applied: a GET sent while it was in flight may have cached the old data
+                self.cache.invalidate(endpoint)
             if method == 'DELETE':
                 return response.status_code
-            return response.json()
+            return self.codec.loads(response.content)
         except HTTPError as http_err:
             print(f"HTTP error occurred: {http_err}")
             raise
@@ -51,17 +303,152 @@ class APIClient:
             print(f"Request error occurred: {req_err}")
             raise
 
-    def get(self, endpoint):
+    def _send(self, method, endpoint, url, **kwargs):
         """
-        Sends a GET request to the specified endpoint.
+        Sends a non-cached request, recording or replaying it when a DiskCache runs in record or replay mode.
+        Successful GETs are recorded like cached ones, so they expire and are served by ``get``; other GETs
+        are not recorded.
 
         Args:
+            method (str): The HTTP method.
             endpoint (str): The API endpoint.
+            url (str): The full request URL.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Returns:
+            requests.Response: The HTTP response.
+        """
+        if not isinstance(self.cache, DiskCache) or self.cache.mode == 'cache':
+            return self._http(method, endpoint, url, **kwargs)
+        key = self.cache.key(method, url, kwargs.get('json'))
+        if self.cache.offline:
+            return self.cache.replay(key, url)
+        response = self._http(method, endpoint, url, **kwargs)
+        if method != 'GET':
+            self.cache.record(key, endpoint, response)
+        elif 200 <= response.status_code < 300:
+            self.cache.store(key, endpoint, response)
+        return response
+
+    def _cached_get(self, endpoint, url, **kwargs):
+        """
+        Serves a GET from the response cache, revalidating stale entries with the server.
+
+        Args:
+            endpoint (str): The API endpoint.
+            url (str): The full request URL.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Returns:
+            dict: The JSON response.
+        """
+        key = self.cache.key('GET', url)
+        entry = self.cache.lookup(key)
+        if entry is not None and (entry.is_fresh() or self.cache.offline):
+            return self.codec.loads(entry.content)
+        if self.cache.offline:
+            raise RequestException(f"No recorded response for '{key}' in replay mode.")
+        headers = entry.conditional_headers() if entry is not None else {}
+        response = self._http('GET', endpoint, url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(entry, endpoint, response)
+            return self.codec.loads(entry.content)
+        response.raise_for_status()
+        self.cache.store(key, endpoint, response)
+        return self.codec.loads(response.content)
+
+    def get(self, endpoint, params=None):
+        """
+        Sends a GET request to the specified endpoint. Calls for the same URL made while one is in flight
+        wait for it and return the same result.
+
+        Args:
+            endpoint (str): The API endpoint.
+            params (dict): Query parameters such as filters ({'postId': 1}) or pagination ({'_page': 2, '_limit': 20}).
 
         Returns:
             dict: The JSON response.
         """
-        return self._request('GET', endpoint)
+        endpoint = with_query(endpoint, params)
+        if self.coalescer is None:
+            return self._request('GET', endpoint)
+        return self.coalescer.do(('GET', f"{self.base_url}/{endpoint}"), self._request, 'GET', endpoint)
+
+    def get_page(self, endpoint, params=None):
+        """
+        Sends a GET request for one page of a collection and reads the collection size from ``X-Total-Count``.
+        Pages bypass the response cache, which does not keep headers, but are recorded and replayed by a DiskCache.
+        Concurrent requests for the same page are coalesced like ``get``.
+
+        Args:
+            endpoint (str): The collection endpoint.
+            params (dict): Query parameters including the pagination, e.g. {'_page': 2, '_limit': 20}.
+
+        Returns:
+            tuple: The page items and the total count, or None when the server did not send it.
+
+        Raises:
+            HTTPError: An error occurred during the HTTP request.
+            RequestException: A non-HTTP error occurred (e.g., network issues).
+        """
+        endpoint = with_query(endpoint, params)
+        url = f"{self.base_url}/{endpoint}"
+        if self.coalescer is None:
+            return self._get_page(endpoint, url)
+        return self.coalescer.do(('GET page', url), self._get_page, endpoint, url)
+
+    def _get_page(self, endpoint, url):
+        try:
+            response = self._send('GET', endpoint, url)
+            response.raise_for_status()
+            total = response.headers.get('X-Total-Count')
+            return self.codec.loads(response.content), int(total) if total is not None else None
+        except HTTPError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+            raise
+        except RequestException as req_err:
+            print(f"Request error occurred: {req_err}")
+            raise
+
+    def stream(self, endpoint, chunk_size=None, params=None):
+        """
+        Sends a GET request to a collection endpoint and yields its items as they arrive.
+        The body is decoded incrementally, so memory stays flat regardless of the collection size.
+        With a DiskCache in record mode the body is read in full and recorded; in replay mode it is served
+        from the recording, like ``get``.
+
+        Args:
+            endpoint (str): The API endpoint.
+            chunk_size (int): Number of bytes read from the socket at a time.
+                Defaults to STREAM_CHUNK_SIZE from settings.
+            params (dict): Query parameters, as for ``get``.
+
+        Yields:
+            dict: Each item of the JSON array response.
+
+        Raises:
+            HTTPError: An error occurred during the HTTP request.
+            RequestException: A non-HTTP error occurred (e.g., network issues).
+        """
+        chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+        endpoint = with_query(endpoint, params)
+        url = f"{self.base_url}/{endpoint}"
+        try:
+            response = self._send('GET', endpoint, url, stream=True)
+            try:
+                response.raise_for_status()
+                decoder = JSONArrayDecoder()
+                for chunk in response.iter_content(chunk_size):
+                    yield from decoder.feed(chunk)
+                yield from decoder.close()
+            finally:
+                response.close()
+        except HTTPError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+            raise
+        except RequestException as req_err:
+            print(f"Request error occurred: {req_err}")
+            raise
 
     def post(self, endpoint, data):
         """
@@ -100,3 +487,58 @@ class APIClient:
             int: The status code of the response.
         """
         return self._request('DELETE', endpoint)
+
+    def pool_stats(self):
+        """
+        Returns the connection pool counters.
+
+        Returns:
+            dict: Connections opened, reused, expired and currently idle, plus total requests.
+        """
+        return self.pool.stats()
+
+    def cache_stats(self):
+        """
+        Returns the response cache counters.
+
+        Returns:
+            dict: Cache hits, misses, revalidations, evictions and invalidations, or an empty dict when caching is off.
+        """
+        return self.cache.stats() if self.cache is not None else {}
+
+    def coalesce_stats(self):
+        """
+        Returns the request coalescing counters.
+
+        Returns:
+            dict: GETs executed, GETs that joined one in flight and GETs in flight, or an empty dict when coalescing is off.
+        """
+        return self.coalescer.stats() if self.coalescer is not None else {}
+
+    def balancer_stats(self):
+        """
+        Returns the load balancer counters.
+
+        Returns:
+            dict: Per-replica requests, failures, ejections, requests outstanding, latency estimate and ejection
+                state, or an empty dict with a single base URL.
+        """
+        return self.balancer.stats() if self.balancer is not None else {}
+
+    def metrics_summary(self):
+        """
+        Returns the aggregated request metrics.
+
+        Returns:
+            dict: Per-endpoint and per-method request counts, statuses, bytes and p50/p90/p99 timings.
+        """
+        return self.metrics.summary()
+
+    def retry_stats(self):
+        """
+        Returns the retry policy counters.
+
+        Returns:
+            dict: Requests, retries (total and per reason), retries given up and retries denied by the budget.
+        """
+        return self.retry.stats()
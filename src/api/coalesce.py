@@ -0,0 +1,164 @@
+import asyncio
+import copy
+import threading
+
+
+class _Call:
+    """
+    A request in flight, the number of callers that joined it and the outcome they receive.
+    """
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class _AsyncCall:
+    """
+    A request task in flight and the number of callers awaiting it.
+    """
+
+    __slots__ = ('task', 'callers')
+
+    def __init__(self, task):
+        self.task = task
+        self.callers = 1
+
+
+class RequestCoalescer:
+    """
+    RequestCoalescer deduplicates concurrent identical requests across threads ("singleflight"): the first
+    caller for a key runs the request, and callers arriving while it is in flight wait for it and receive
+    its decoded result, or the same exception. Once it completes the key is released, so later calls
+    go to the network (or the response cache) again.
+
+    When a call was shared, every caller receives its own deep copy of the result, so one caller changing
+    it cannot affect another. Uncontended calls return the result as is.
+    """
+
+    def __init__(self):
+        """
+        Initializes the RequestCoalescer with no requests in flight.
+        """
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = {'executed': 0, 'coalesced': 0}
+
+    def do(self, key, function, *args):
+        """
+        Runs ``function(*args)`` unless a call with the same key is already in flight, in which case
+        waits for that call and returns its result.
+
+        Args:
+            key (hashable): Identifies identical requests, e.g. the method and full URL.
+            function (callable): Sends the request and decodes the response.
+            *args: Arguments passed to ``function``.
+
+        Returns:
+            object: The result of the call that ran, copied when the call was shared.
+
+        Raises:
+            Exception: Whatever the call that ran raised.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters['executed'] += 1
+            else:
+                call.waiters += 1
+                self._counters['coalesced'] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+        try:
+            call.result = function(*args)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        # The original stays with the call for the waiters to copy
+        return copy.deepcopy(call.result) if shared else call.result
+
+    def stats(self):
+        """
+        Returns the coalescing counters.
+
+        Returns:
+            dict: Requests executed, requests served by joining one in flight, and requests in flight now.
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot['in_flight'] = len(self._calls)
+        return snapshot
+
+
+class AsyncRequestCoalescer:
+    """
+    Asyncio counterpart of RequestCoalescer for the tasks of one event loop. The request runs in its own
+    task, so cancelling one waiter does not cancel it for the others. As with RequestCoalescer, the callers
+    of a shared call each receive their own copy of the result.
+    """
+
+    def __init__(self):
+        """
+        Initializes the AsyncRequestCoalescer with no requests in flight.
+        """
+        self._calls = {}
+        self._counters = {'executed': 0, 'coalesced': 0}
+
+    async def do(self, key, function, *args):
+        """
+        Awaits ``function(*args)`` unless a call with the same key is already in flight, in which case
+        awaits that call instead.
+
+        Args:
+            key (hashable): Identifies identical requests, e.g. the method and full URL.
+            function (callable): Coroutine function sending the request and decoding the response.
+            *args: Arguments passed to ``function``.
+
+        Returns:
+            object: The result of the call that ran, copied when the call was shared.
+
+        Raises:
+            Exception: Whatever the call that ran raised.
+        """
+        call = self._calls.get(key)
+        if call is None or call.task.done():
+            self._counters['executed'] += 1
+            call = self._calls[key] = _AsyncCall(asyncio.ensure_future(function(*args)))
+            call.task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            call.callers += 1
+            self._counters['coalesced'] += 1
+        result = await asyncio.shield(call.task)
+        # Nobody joins a finished task, so every caller sees the final count
+        return copy.deepcopy(result) if call.callers > 1 else result
+
+    def _release(self, key, task):
+        call = self._calls.get(key)
+        if call is not None and call.task is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Marks the exception retrieved when every waiter was cancelled before it was raised
+            task.exception()
+
+    def stats(self):
+        """
+        Returns the coalescing counters.
+
+        Returns:
+            dict: Requests executed, requests served by joining one in flight, and requests in flight now.
+        """
+        return {**self._counters, 'in_flight': len(self._calls)}
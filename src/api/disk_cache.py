@@ -0,0 +1,357 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.exceptions import RequestException
+from requests.structures import CaseInsensitiveDict
+from src.api.cache import CacheEntry, _path_of
+from src.config.settings import settings
+
+MODES = ('cache', 'record', 'replay')
+
+# Response headers kept with each entry and restored on replay, e.g. the collection size read by get_page
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link', 'X-Total-Count')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    content BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    headers TEXT
+)
+"""
+
+# Running total of the stored body sizes, kept by triggers so eviction checks need not scan the store
+META_SCHEMA = 'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)'
+SIZE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS responses_added AFTER INSERT ON responses "
+    "BEGIN UPDATE meta SET value = value + NEW.size WHERE name = 'bytes'; END",
+    "CREATE TRIGGER IF NOT EXISTS responses_removed AFTER DELETE ON responses "
+    "BEGIN UPDATE meta SET value = value - OLD.size WHERE name = 'bytes'; END",
+    "CREATE TRIGGER IF NOT EXISTS responses_resized AFTER UPDATE OF size ON responses "
+    "BEGIN UPDATE meta SET value = value - OLD.size + NEW.size WHERE name = 'bytes'; END",
+)
+
+# Seconds between updates of an entry's last access time; reads within it leave the row alone
+ACCESS_RESOLUTION = 60
+
+
+class DiskCacheEntry(CacheEntry):
+    """
+    A response loaded from the disk cache. Expiry is wall-clock based so it holds across processes.
+    """
+
+    def is_fresh(self):
+        return time.time() < self.expires_at
+
+
+class DiskCache:
+    """
+    DiskCache is a persistent response cache stored in a SQLite database, shared by every
+    process and xdist worker pointing at the same path. It is a drop-in replacement for
+    ResponseCache and adds record/replay modes:
+
+    - ``cache``: serve fresh GETs from disk, revalidate or fetch the rest and store them.
+    - ``record``: always hit the network and record every response, writes included.
+    - ``replay``: serve every request from disk without touching the network.
+
+    Attributes:
+        path (str): Location of the SQLite database file.
+        mode (str): One of ``cache``, ``record`` or ``replay``.
+        max_bytes (int): Total body size above which least recently used entries are evicted.
+        default_ttl (float): Seconds a GET response stays fresh in ``cache`` mode.
+    """
+
+    def __init__(self, path=None, mode='cache', max_bytes=None, default_ttl=None):
+        """
+        Initializes the DiskCache, creating the database on first use.
+
+        Args:
+            path (str): Location of the SQLite database file. Defaults to DISK_CACHE_PATH from settings.
+            mode (str): One of ``cache``, ``record`` or ``replay``.
+            max_bytes (int): Size limit for stored bodies, in bytes. Defaults to DISK_CACHE_MAX_BYTES from settings.
+            default_ttl (float): Freshness lifetime of GET responses in seconds.
+                Defaults to DISK_CACHE_TTL from settings.
+
+        Raises:
+            ValueError: The mode is not supported.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unsupported disk cache mode '{mode}'. Expected one of {', '.join(MODES)}.")
+        self.path = path = path or settings.DISK_CACHE_PATH
+        self.mode = mode
+        self.max_bytes = max_bytes or settings.DISK_CACHE_MAX_BYTES
+        self.default_ttl = default_ttl if default_ttl is not None else settings.DISK_CACHE_TTL
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0, 'invalidations': 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(SCHEMA)
+            if 'headers' not in {column[1] for column in conn.execute('PRAGMA table_info(responses)')}:
+                conn.execute('ALTER TABLE responses ADD COLUMN headers TEXT')
+            conn.execute(META_SCHEMA)
+            # Stores created before the running total start from the size of their rows
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('bytes', (SELECT COALESCE(SUM(size), 0) FROM responses))")
+            for trigger in SIZE_TRIGGERS:
+                conn.execute(trigger)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    @property
+    def offline(self):
+        """
+        bool: True when requests must be served from disk only.
+        """
+        return self.mode == 'replay'
+
+    def _connection(self):
+        """
+        Returns this thread's SQLite connection. WAL journaling lets readers run while another process writes.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    @staticmethod
+    def key(method, url, body=None):
+        """
+        Returns the cache key for a request. Writes are keyed on their JSON body as well.
+        """
+        if body is None:
+            return f"{method} {url}"
+        digest = hashlib.sha256(json.dumps(body, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{method} {url} {digest}"
+
+    def lookup(self, key):
+        """
+        Looks up a stored successful GET response. Always misses in ``record`` mode. The entry's last access
+        time, which orders eviction, is updated at most every ACCESS_RESOLUTION seconds.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            DiskCacheEntry: The entry, fresh or stale, or None when nothing is stored.
+        """
+        row = None
+        if self.mode != 'record':
+            conn = self._connection()
+            row = conn.execute('SELECT path, content, etag, last_modified, expires_at, accessed_at FROM responses '
+                               'WHERE key = ? AND status BETWEEN 200 AND 299', (key,)).fetchone()
+            now = time.time()
+            if row is not None and now - row[-1] >= ACCESS_RESOLUTION:
+                conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+        entry = None
+        if row is not None:
+            entry = DiskCacheEntry(*row[:-1])
+            entry.key = key
+        self._count('hits' if entry is not None and (entry.is_fresh() or self.offline) else 'misses')
+        return entry
+
+    def store(self, key, endpoint, response):
+        """
+        Stores a successful GET response unless the server forbids it.
+
+        Args:
+            key (str): The cache key.
+            endpoint (str): The API endpoint the response belongs to.
+            response (requests.Response): The response to store.
+        """
+        if self.mode == 'cache' and 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+        self._write(key, endpoint, response, time.time() + self.default_ttl)
+
+    def _write(self, key, endpoint, response, expires_at):
+        content = response.content
+        now = time.time()
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        conn = self._connection()
+        # An upsert rather than REPLACE, whose implicit delete would not fire the size trigger
+        conn.execute('INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET '
+                     'path = excluded.path, status = excluded.status, content = excluded.content, '
+                     'etag = excluded.etag, last_modified = excluded.last_modified, expires_at = excluded.expires_at, '
+                     'accessed_at = excluded.accessed_at, size = excluded.size, headers = excluded.headers',
+                     (key, _path_of(endpoint), response.status_code, content, response.headers.get('ETag'),
+                      response.headers.get('Last-Modified'), expires_at, now, len(content), json.dumps(headers)))
+        self._evict(conn)
+
+    @staticmethod
+    def _total(conn):
+        return conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+
+    def _evict(self, conn):
+        """
+        Deletes least recently used entries until the stored bodies fit in ``max_bytes``.
+        """
+        if self._total(conn) <= self.max_bytes:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Re-read under the write lock: another worker may have evicted already
+            total = self._total(conn)
+            evicted = 0
+            for key, size in conn.execute('SELECT key, size FROM responses ORDER BY accessed_at').fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                total -= size
+                evicted += 1
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self._count('evictions', evicted)
+
+    def refresh(self, entry, endpoint, response):
+        """
+        Extends the lifetime of an entry after the server answered 304 Not Modified.
+
+        Args:
+            entry (DiskCacheEntry): The revalidated entry.
+            endpoint (str): The API endpoint the entry belongs to.
+            response (requests.Response): The 304 response, whose validators replace the stored ones.
+        """
+        entry.etag = response.headers.get('ETag', entry.etag)
+        entry.last_modified = response.headers.get('Last-Modified', entry.last_modified)
+        entry.expires_at = time.time() + self.default_ttl
+        self._connection().execute(
+            'UPDATE responses SET etag = ?, last_modified = ?, expires_at = ?, accessed_at = ? WHERE key = ?',
+            (entry.etag, entry.last_modified, entry.expires_at, time.time(), entry.key))
+        self._count('revalidated')
+
+    def record(self, key, endpoint, response):
+        """
+        Records a write response so it can be replayed later.
+
+        Args:
+            key (str): The cache key, including the body digest.
+            endpoint (str): The API endpoint.
+            response (requests.Response): The response to record.
+        """
+        self._write(key, endpoint, response, float('inf'))
+
+    def replay(self, key, url):
+        """
+        Rebuilds a recorded response, with its body and the headers in STORED_HEADERS.
+
+        Args:
+            key (str): The cache key.
+            url (str): The request URL, set on the rebuilt response.
+
+        Returns:
+            requests.Response: The recorded response.
+
+        Raises:
+            RequestException: Nothing was recorded for the request.
+        """
+        row = self._connection().execute('SELECT status, content, headers FROM responses WHERE key = ?',
+                                         (key,)).fetchone()
+        if row is None:
+            self._count('misses')
+            raise RequestException(f"No recorded response for '{key}' in replay mode.")
+        self._count('hits')
+        response = requests.Response()
+        response.status_code, response._content, headers = row
+        # The body is already read, so iter_content serves it from memory
+        response._content_consumed = True
+        response.headers = CaseInsensitiveDict(json.loads(headers or '{}'))
+        response.url = url
+        response.reason = 'Replayed'
+        response.encoding = 'utf-8'
+        return response
+
+    def invalidate(self, endpoint):
+        """
+        Drops stored GET responses a write to ``endpoint`` may have changed. Recordings are left
+        untouched in ``record`` and ``replay`` modes so a suite replays exactly what it recorded.
+
+        Args:
+            endpoint (str): The API endpoint that was written to.
+        """
+        if self.mode != 'cache':
+            return
+        path = _path_of(endpoint)
+        parts = path.split('/')
+        ancestors = ['/'.join(parts[:i]) for i in range(1, len(parts))]
+        placeholders = ', '.join('?' for _ in ancestors) or "''"
+        cursor = self._connection().execute(
+            f"DELETE FROM responses WHERE key LIKE 'GET %' AND (path = ? OR path LIKE ? OR path IN ({placeholders}))",
+            (path, path + '/%', *ancestors))
+        self._count('invalidations', cursor.rowcount)
+
+    def clear(self):
+        """
+        Removes every stored response.
+        """
+        self._connection().execute('DELETE FROM responses')
+
+    def stats(self):
+        """
+        Returns a snapshot of this process's counters and the shared store size.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``revalidated``, ``evictions`` and ``invalidations`` totals
+            plus the stored entry count as ``size`` and body total as ``bytes``.
+        """
+        conn = self._connection()
+        size = conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        total = self._total(conn)
+        with self._lock:
+            snapshot = dict(self._counters)
+        snapshot['size'] = size
+        snapshot['bytes'] = total
+        return snapshot
+
+
+_default_disk_cache = None
+_default_disk_cache_lock = threading.Lock()
+
+
+def get_default_disk_cache():
+    """
+    Returns the process-wide DiskCache configured by DISK_CACHE_PATH and DISK_CACHE_MODE, creating it on first use.
+
+    Returns:
+        DiskCache: The shared disk cache.
+    """
+    global _default_disk_cache
+    default = _default_disk_cache
+    if default is None:
+        with _default_disk_cache_lock:
+            if _default_disk_cache is None:
+                _default_disk_cache = DiskCache(mode=settings.DISK_CACHE_MODE)
+            default = _default_disk_cache
+    return default
+
+
+@settings.on_reload
+def _reset_default_disk_cache():
+    # The next get builds it from the reloaded settings; clients created before keep the old one
+    global _default_disk_cache
+    with _default_disk_cache_lock:
+        _default_disk_cache = None
@@ -0,0 +1,470 @@
+import atexit
+import bisect
+import json
+import os
+import re
+import threading
+import time
+
+from src.config.settings import settings
+
+# Log-spaced histogram bucket upper bounds from 0.1 ms to ~100 s, 10% apart
+BUCKET_BOUNDS = tuple(0.0001 * 1.1 ** i for i in range(146))
+
+# Coarser bucket bounds exported to Prometheus
+PROMETHEUS_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PERCENTILES = (50, 90, 99)
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'total')
+
+_ID_SEGMENT = re.compile(r'(?<=/)\d+(?=/|$)|^\d+(?=/|$)')
+
+_active = threading.local()
+
+# Callables notified with every finished RequestTiming, from any recorder
+_listeners = []
+
+
+def endpoint_template(endpoint):
+    """
+    Collapses numeric path segments so metrics group by route: 'posts/1/comments' -> 'posts/{id}/comments'.
+
+    Args:
+        endpoint (str): The API endpoint.
+
+    Returns:
+        str: The route template without query string.
+    """
+    return _ID_SEGMENT.sub('{id}', endpoint.split('?', 1)[0].strip('/'))
+
+
+class RequestTiming:
+    """
+    Timing and size measurements of a single request. Phases that did not happen
+    (e.g. DNS and connect on a reused connection) stay None.
+
+    Attributes:
+        method (str): The HTTP method.
+        endpoint (str): The endpoint route template.
+        status (int): The response status code, or None when the request failed.
+        dns (float): Name resolution time in seconds.
+        connect (float): TCP connect time in seconds.
+        tls (float): TLS handshake time in seconds.
+        ttfb (float): Time from the request being sent to the response headers arriving, in seconds.
+        total (float): Wall-clock time of the whole request in seconds.
+        bytes_out (int): Request body size before compression.
+        bytes_in (int): Response body size after decompression.
+        wire_bytes_out (int): Request body size as sent.
+        wire_bytes_in (int): Response body size as received.
+        error (str): The exception type name when the request failed.
+    """
+
+    __slots__ = ('method', 'endpoint', 'status', 'dns', 'connect', 'tls', 'ttfb', 'total',
+                 'bytes_out', 'bytes_in', 'wire_bytes_out', 'wire_bytes_in', 'error', 'started', 'sent')
+
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint_template(endpoint)
+        self.status = None
+        self.dns = self.connect = self.tls = self.ttfb = self.total = None
+        self.bytes_out = self.bytes_in = self.wire_bytes_out = self.wire_bytes_in = 0
+        self.error = None
+        self.started = time.perf_counter()
+        self.sent = None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name not in ('started', 'sent')}
+
+
+def active_timing():
+    """
+    Returns the RequestTiming of the request running on this thread, so the connection layer can fill in its phases.
+    """
+    return getattr(_active, 'timing', None)
+
+
+def add_listener(listener):
+    """
+    Registers a callable invoked with each finished RequestTiming of every enabled recorder,
+    e.g. to attribute requests to the test that made them.
+
+    Args:
+        listener (callable): Called with the RequestTiming on the thread that finished the request.
+    """
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    """
+    Unregisters a listener added with ``add_listener``.
+    """
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+class Histogram:
+    """
+    Fixed log-bucket histogram: recording is a single bisect, percentiles are accurate to one bucket (10%).
+    """
+
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """
+        Returns the upper bound of the bucket holding the given percentile, capped at the observed maximum.
+        """
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self, bound):
+        """
+        Returns the number of observations in buckets whose upper bound is at most ``bound``.
+        """
+        return sum(self.counts[:bisect.bisect_right(BUCKET_BOUNDS, bound)])
+
+    def to_dict(self):
+        """
+        Returns a compact JSON-serializable form that ``merge`` adds back, e.g. to ship a histogram between processes.
+        """
+        return {'buckets': {str(index): count for index, count in enumerate(self.counts) if count},
+                'sum': self.sum, 'max': self.max}
+
+    def merge(self, data):
+        """
+        Adds the observations of a histogram exported with ``to_dict``.
+        """
+        for index, count in data['buckets'].items():
+            self.counts[int(index)] += count
+            self.count += count
+        self.sum += data['sum']
+        self.max = max(self.max, data['max'])
+
+    def summary(self):
+        summary = {'count': self.count, 'mean': self.sum / self.count if self.count else None, 'max': self.max}
+        for percent in PERCENTILES:
+            summary[f'p{percent}'] = self.percentile(percent)
+        return summary
+
+
+class _Series:
+    """
+    Aggregates for one (method, endpoint) pair.
+    """
+
+    __slots__ = ('phases', 'statuses', 'errors', 'bytes_in', 'bytes_out', 'wire_bytes_in', 'wire_bytes_out')
+
+    def __init__(self):
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.statuses = {}
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.wire_bytes_in = 0
+        self.wire_bytes_out = 0
+
+
+class InMemorySink:
+    """
+    Keeps the latest exported snapshot in memory.
+
+    Attributes:
+        snapshot (dict): The last snapshot emitted, or None.
+    """
+
+    def __init__(self):
+        self.snapshot = None
+
+    def emit(self, snapshot, recorder):
+        self.snapshot = snapshot
+
+
+class JSONFileSink:
+    """
+    Writes each snapshot to a JSON file.
+
+    Attributes:
+        path (str): The output file path.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, snapshot, recorder):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(snapshot, f, indent=2)
+
+
+class PrometheusFileSink:
+    """
+    Writes each snapshot in the Prometheus text exposition format, e.g. for the node exporter textfile collector.
+
+    Attributes:
+        path (str): The output file path.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, snapshot, recorder):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            f.write(recorder.prometheus_text())
+
+
+class MetricsRecorder:
+    """
+    MetricsRecorder aggregates RequestTiming records into per-endpoint and per-method histograms
+    and exports snapshots to pluggable sinks. Recording only touches preallocated counters,
+    so it is cheap enough to run on every request.
+
+    Attributes:
+        sinks (list): Objects with an ``emit(snapshot, recorder)`` method called on ``flush``.
+        enabled (bool): When False, ``start`` returns None and nothing is recorded.
+    """
+
+    def __init__(self, sinks=None, enabled=True):
+        """
+        Initializes the MetricsRecorder.
+
+        Args:
+            sinks (list): Sinks to export snapshots to.
+            enabled (bool): Whether requests are recorded.
+        """
+        self.sinks = list(sinks or [])
+        self.enabled = enabled
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def start(self, method, endpoint, bind=True):
+        """
+        Starts timing a request.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The API endpoint.
+            bind (bool): Make the timing visible to the connection layer of the current thread;
+                async callers pass False and hand the timing to aiohttp tracing instead.
+
+        Returns:
+            RequestTiming: The timing to pass to ``finish``, or None when disabled.
+        """
+        if not self.enabled:
+            return None
+        timing = RequestTiming(method, endpoint)
+        if bind:
+            _active.timing = timing
+        return timing
+
+    def finish(self, timing, status=None, bytes_in=0, bytes_out=0, error=None, wire_bytes_in=None,
+               wire_bytes_out=None):
+        """
+        Completes a timing and records it.
+
+        Args:
+            timing (RequestTiming): The timing returned by ``start``.
+            status (int): The response status code.
+            bytes_in (int): The response body size after decompression.
+            bytes_out (int): The request body size before compression.
+            error (Exception): The exception that ended the request, if any.
+            wire_bytes_in (int): The response body size as received; defaults to ``bytes_in``.
+            wire_bytes_out (int): The request body size as sent; defaults to ``bytes_out``.
+        """
+        if timing is None:
+            return
+        if getattr(_active, 'timing', None) is timing:
+            _active.timing = None
+        timing.total = time.perf_counter() - timing.started
+        timing.status = status
+        timing.bytes_in = bytes_in
+        timing.bytes_out = bytes_out
+        timing.wire_bytes_in = bytes_in if wire_bytes_in is None else wire_bytes_in
+        timing.wire_bytes_out = bytes_out if wire_bytes_out is None else wire_bytes_out
+        timing.error = type(error).__name__ if error is not None else None
+        self.record(timing)
+        for listener in tuple(_listeners):
+            listener(timing)
+
+    def record(self, timing):
+        """
+        Adds a completed RequestTiming to the aggregates.
+        """
+        with self._lock:
+            for key in ((timing.method, timing.endpoint), (timing.method, '*')):
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _Series()
+                for phase in PHASES:
+                    value = getattr(timing, phase)
+                    if value is not None:
+                        series.phases[phase].observe(value)
+                if timing.error is not None:
+                    series.errors += 1
+                else:
+                    series.statuses[timing.status] = series.statuses.get(timing.status, 0) + 1
+                series.bytes_in += timing.bytes_in
+                series.bytes_out += timing.bytes_out
+                series.wire_bytes_in += timing.wire_bytes_in
+                series.wire_bytes_out += timing.wire_bytes_out
+
+    def summary(self):
+        """
+        Returns the aggregated metrics.
+
+        Returns:
+            dict: ``endpoints`` maps 'METHOD endpoint' and ``methods`` maps each method to its request count,
+            errors, status counts, body bytes in/out before and after compression (``bytes_*`` and ``wire_bytes_*``),
+            and count/mean/max/p50/p90/p99 per timing phase.
+        """
+        summary = {'endpoints': {}, 'methods': {}}
+        with self._lock:
+            for (method, endpoint), series in sorted(self._series.items()):
+                entry = {
+                    'requests': series.phases['total'].count,
+                    'errors': series.errors,
+                    'statuses': {str(status): count for status, count in series.statuses.items()},
+                    'bytes_in': series.bytes_in,
+                    'bytes_out': series.bytes_out,
+                    'wire_bytes_in': series.wire_bytes_in,
+                    'wire_bytes_out': series.wire_bytes_out,
+                    'timings': {phase: histogram.summary() for phase, histogram in series.phases.items()
+                                if histogram.count},
+                }
+                if endpoint == '*':
+                    summary['methods'][method] = entry
+                else:
+                    summary['endpoints'][f'{method} {endpoint}'] = entry
+        return summary
+
+    def prometheus_text(self):
+        """
+        Renders the aggregates in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = ['# HELP api_request_duration_seconds Total API request time.',
+                 '# TYPE api_request_duration_seconds histogram']
+        with self._lock:
+            series_items = sorted((key, series) for key, series in self._series.items() if key[1] != '*')
+            for (method, endpoint), series in series_items:
+                histogram = series.phases['total']
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                for bound in PROMETHEUS_BOUNDS:
+                    lines.append(f'api_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                                 f'{histogram.cumulative(bound)}')
+                lines.append(f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'api_request_duration_seconds_sum{{{labels}}} {histogram.sum}')
+                lines.append(f'api_request_duration_seconds_count{{{labels}}} {histogram.count}')
+            lines += ['# HELP api_request_phase_seconds API request time percentiles per phase.',
+                      '# TYPE api_request_phase_seconds gauge']
+            for (method, endpoint), series in series_items:
+                for phase, histogram in series.phases.items():
+                    for percent in PERCENTILES:
+                        value = histogram.percentile(percent)
+                        if value is not None:
+                            lines.append(f'api_request_phase_seconds{{method="{method}",endpoint="{endpoint}",'
+                                         f'phase="{phase}",quantile="{percent / 100}"}} {value}')
+            lines += ['# HELP api_requests_total API responses by status code.',
+                      '# TYPE api_requests_total counter']
+            for (method, endpoint), series in series_items:
+                for status, count in sorted(series.statuses.items()):
+                    lines.append(f'api_requests_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} '
+                                 f'{count}')
+                if series.errors:
+                    lines.append(f'api_requests_total{{method="{method}",endpoint="{endpoint}",status="error"}} '
+                                 f'{series.errors}')
+            lines += ['# HELP api_bytes_total API body bytes by direction.',
+                      '# TYPE api_bytes_total counter']
+            for (method, endpoint), series in series_items:
+                lines.append(f'api_bytes_total{{method="{method}",endpoint="{endpoint}",direction="in"}} '
+                             f'{series.bytes_in}')
+                lines.append(f'api_bytes_total{{method="{method}",endpoint="{endpoint}",direction="out"}} '
+                             f'{series.bytes_out}')
+            lines += ['# HELP api_wire_bytes_total API body bytes on the wire, after compression, by direction.',
+                      '# TYPE api_wire_bytes_total counter']
+            for (method, endpoint), series in series_items:
+                lines.append(f'api_wire_bytes_total{{method="{method}",endpoint="{endpoint}",direction="in"}} '
+                             f'{series.wire_bytes_in}')
+                lines.append(f'api_wire_bytes_total{{method="{method}",endpoint="{endpoint}",direction="out"}} '
+                             f'{series.wire_bytes_out}')
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        """
+        Exports the current summary to every sink.
+        """
+        snapshot = self.summary()
+        for sink in self.sinks:
+            sink.emit(snapshot, self)
+        return snapshot
+
+    def reset(self):
+        """
+        Drops all aggregates.
+        """
+        with self._lock:
+            self._series.clear()
+
+
+_default_recorder = None
+_default_recorder_lock = threading.Lock()
+
+
+def get_default_recorder():
+    """
+    Returns the process-wide MetricsRecorder, creating it on first use. File sinks configured
+    through METRICS_JSON_PATH and METRICS_PROMETHEUS_PATH are flushed when the process exits.
+
+    Returns:
+        MetricsRecorder: The shared recorder.
+    """
+    global _default_recorder
+    default = _default_recorder
+    if default is None:
+        with _default_recorder_lock:
+            if _default_recorder is None:
+                sinks = [InMemorySink()]
+                if settings.METRICS_JSON_PATH:
+                    sinks.append(JSONFileSink(settings.METRICS_JSON_PATH))
+                if settings.METRICS_PROMETHEUS_PATH:
+                    sinks.append(PrometheusFileSink(settings.METRICS_PROMETHEUS_PATH))
+                _default_recorder = MetricsRecorder(sinks=sinks, enabled=settings.METRICS_ENABLED)
+                if len(sinks) > 1:
+                    atexit.register(_default_recorder.flush)
+            default = _default_recorder
+    return default
+
+
+@settings.on_reload
+def _reset_default_recorder():
+    # The next get builds it from the reloaded settings; clients created before keep the old one
+    global _default_recorder
+    with _default_recorder_lock:
+        _default_recorder = None
@@ -0,0 +1,223 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import settings
+
+# Query parameters owned by the collection; callers' values for them are ignored
+PAGINATION_PARAMS = ('_page', '_limit', '_start', '_end')
+
+
+class LazyCollection:
+    """
+    A collection fetched page by page while it is iterated. The next page is requested on a background
+    thread while the caller processes the current one, so network time overlaps processing and at most
+    two pages are held at once. Breaking out of the loop stops further requests.
+
+    ``len()`` uses the ``X-Total-Count`` header of the first page. When the server does not send it,
+    the pages are counted one at a time without being kept.
+
+    Attributes:
+        page_size (int): Records requested per page.
+        params (dict): Filters sent with every page.
+        prefetch (bool): Request the next page in the background while the current one is consumed.
+        transform (callable): Applied to each page's items after download.
+        pages_fetched (int): Pages requested so far, across all iterations.
+    """
+
+    def __init__(self, fetch_page, page_size=None, params=None, prefetch=True, transform=None):
+        """
+        Initializes the LazyCollection. Nothing is requested until it is iterated or measured.
+
+        Args:
+            fetch_page (callable): Function taking the query params of a page and returning
+                the page items and the total count, like ``APIClient.get_page``.
+            page_size (int): Records requested per page. Defaults to PAGE_SIZE from settings.
+            params (dict): Filters sent with every page; pagination params are replaced.
+            prefetch (bool): Request the next page in the background while the current one is consumed.
+            transform (callable): Applied to each page's items after download, e.g. to build models.
+        """
+        self._fetch_page = fetch_page
+        self.page_size = page_size or settings.PAGE_SIZE
+        self.params = {name: value for name, value in (params or {}).items() if name not in PAGINATION_PARAMS}
+        self.prefetch = prefetch
+        self.transform = transform
+        self.pages_fetched = 0
+        self._total = None
+        self._first = None
+        self._lock = threading.Lock()
+
+    @property
+    def total(self):
+        """
+        int: The collection size reported by the server so far, or None before the first page.
+        """
+        return self._total
+
+    def _fetch(self, page):
+        items, total = self._fetch_page({**self.params, '_page': page, '_limit': self.page_size})
+        with self._lock:
+            self.pages_fetched += 1
+            if total is not None:
+                self._total = total
+        return self.transform(items) if self.transform is not None else items
+
+    def _is_last(self, page, items):
+        return len(items) < self.page_size or (self._total is not None and page * self.page_size >= self._total)
+
+    def pages(self):
+        """
+        Yields the collection one page at a time.
+
+        Yields:
+            list: The records of each page.
+        """
+        items, self._first = (self._first, None) if self._first is not None else (self._fetch(1), None)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='page-prefetch') if self.prefetch else None
+        pending = None
+        page = 1
+        try:
+            while True:
+                last = self._is_last(page, items)
+                if not last and executor is not None:
+                    pending = executor.submit(self._fetch, page + 1)
+                if items:
+                    yield items
+                if last:
+                    return
+                items = pending.result() if pending is not None else self._fetch(page + 1)
+                pending = None
+                page += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def __iter__(self):
+        pages = self.pages()
+        try:
+            for items in pages:
+                yield from items
+        finally:
+            pages.close()
+
+    def __len__(self):
+        if self._total is None:
+            self._first = self._fetch(1)
+        if self._total is None:
+            self._total = sum(len(items) for items in self.pages())
+        return self._total
+
+
+class AsyncLazyCollection:
+    """
+    Async counterpart of LazyCollection, iterated with ``async for``. The next page is requested
+    in a separate task while the caller processes the current one.
+
+    ``len()`` works once the first page has been fetched; ``await count()`` fetches it when needed.
+
+    Attributes:
+        page_size (int): Records requested per page.
+        params (dict): Filters sent with every page.
+        prefetch (bool): Request the next page in the background while the current one is consumed.
+        transform (callable): Applied to each page's items after download.
+        pages_fetched (int): Pages requested so far, across all iterations.
+    """
+
+    def __init__(self, fetch_page, page_size=None, params=None, prefetch=True, transform=None):
+        """
+        Initializes the AsyncLazyCollection. Nothing is requested until it is iterated or counted.
+
+        Args:
+            fetch_page (callable): Coroutine function taking the query params of a page and returning
+                the page items and the total count, like ``AsyncAPIClient.get_page``.
+            page_size (int): Records requested per page. Defaults to PAGE_SIZE from settings.
+            params (dict): Filters sent with every page; pagination params are replaced.
+            prefetch (bool): Request the next page in the background while the current one is consumed.
+            transform (callable): Applied to each page's items after download, e.g. to build models.
+        """
+        self._fetch_page = fetch_page
+        self.page_size = page_size or settings.PAGE_SIZE
+        self.params = {name: value for name, value in (params or {}).items() if name not in PAGINATION_PARAMS}
+        self.prefetch = prefetch
+        self.transform = transform
+        self.pages_fetched = 0
+        self._total = None
+        self._first = None
+
+    @property
+    def total(self):
+        """
+        int: The collection size reported by the server so far, or None before the first page.
+        """
+        return self._total
+
+    async def _fetch(self, page):
+        items, total = await self._fetch_page({**self.params, '_page': page, '_limit': self.page_size})
+        self.pages_fetched += 1
+        if total is not None:
+            self._total = total
+        return self.transform(items) if self.transform is not None else items
+
+    def _is_last(self, page, items):
+        return len(items) < self.page_size or (self._total is not None and page * self.page_size >= self._total)
+
+    async def pages(self):
+        """
+        Yields the collection one page at a time.
+
+        Yields:
+            list: The records of each page.
+        """
+        items, self._first = (self._first, None) if self._first is not None else (await self._fetch(1), None)
+        pending = None
+        page = 1
+        try:
+            while True:
+                last = self._is_last(page, items)
+                if not last and self.prefetch:
+                    pending = asyncio.ensure_future(self._fetch(page + 1))
+                if items:
+                    yield items
+                if last:
+                    return
+                items = await pending if pending is not None else await self._fetch(page + 1)
+                pending = None
+                page += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _iterate(self):
+        pages = self.pages()
+        try:
+            async for items in pages:
+                for item in items:
+                    yield item
+        finally:
+            await pages.aclose()
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def count(self):
+        """
+        Returns the collection size, fetching the first page when it is not known yet.
+
+        Returns:
+            int: The number of records.
+        """
+        if self._total is None:
+            self._first = await self._fetch(1)
+        if self._total is None:
+            total = 0
+            async for items in self.pages():
+                total += len(items)
+            self._total = total
+        return self._total
+
+    def __len__(self):
+        if self._total is None:
+            raise TypeError("The collection size is not known yet; await count() first")
+        return self._total
@@ -0,0 +1,267 @@
+import ipaddress
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from src.api.metrics import active_timing
+from src.config.settings import settings
+
+
+def _is_ip_address(host):
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+
+def _tracked_connection(base, tracker):
+    """
+    Builds a connection class that reports socket opens and reuse to the tracker.
+
+    Args:
+        base (type): The urllib3 connection class to extend.
+        tracker (ConnectionPool): The pool receiving the counters.
+
+    Returns:
+        type: A subclass of ``base``.
+    """
+
+    class TrackedConnection(base):
+        def _new_conn(self):
+            timing = active_timing()
+            if timing is None:
+                return super()._new_conn()
+            # Resolve up front so DNS and TCP connect are timed separately, then try every address in turn
+            # like urllib3 does; if resolution fails let urllib3 resolve and report it
+            dns_host = self._dns_host
+            started = time.perf_counter()
+            addresses = [dns_host]
+            if not _is_ip_address(dns_host):
+                try:
+                    addresses = list(dict.fromkeys(
+                        info[4][0] for info in socket.getaddrinfo(dns_host, self.port, allowed_gai_family(),
+                                                                  socket.SOCK_STREAM)))
+                except OSError:
+                    pass
+            resolved = time.perf_counter()
+            try:
+                for index, address in enumerate(addresses):
+                    self._dns_host = address
+                    try:
+                        sock = super()._new_conn()
+                        break
+                    except (ConnectTimeoutError, NewConnectionError):
+                        if index == len(addresses) - 1:
+                            raise
+            finally:
+                self._dns_host = dns_host
+            timing.dns = resolved - started
+            timing.connect = time.perf_counter() - resolved
+            return sock
+
+        def connect(self):
+            started = time.perf_counter()
+            super().connect()
+            timing = active_timing()
+            if timing is not None and base is HTTPSConnection and timing.connect is not None:
+                timing.tls = time.perf_counter() - started - timing.dns - timing.connect
+            self._requests_served = 0
+            tracker._record('opened')
+
+        def request(self, *args, **kwargs):
+            if self.sock is not None and getattr(self, '_requests_served', 0) > 0:
+                tracker._record('reused')
+            tracker._record('requests')
+            super().request(*args, **kwargs)
+            self._requests_served = getattr(self, '_requests_served', 0) + 1
+            timing = active_timing()
+            if timing is not None:
+                timing.sent = time.perf_counter()
+
+        def getresponse(self, *args, **kwargs):
+            response = super().getresponse(*args, **kwargs)
+            timing = active_timing()
+            if timing is not None and timing.sent is not None:
+                timing.ttfb = time.perf_counter() - timing.sent
+            return response
+
+    TrackedConnection.__name__ = f"Tracked{base.__name__}"
+    return TrackedConnection
+
+
+def _tracked_pool(base, connection_cls, tracker):
+    """
+    Builds a urllib3 host pool class that expires keep-alive connections left idle too long.
+
+    Args:
+        base (type): The urllib3 connection pool class to extend.
+        connection_cls (type): The connection class the pool should create.
+        tracker (ConnectionPool): The pool holding the idle timeout and counters.
+
+    Returns:
+        type: A subclass of ``base``.
+    """
+
+    class TrackedPool(base):
+        ConnectionCls = connection_cls
+
+        def _get_conn(self, timeout=None):
+            conn = super()._get_conn(timeout)
+            last_used = getattr(conn, '_last_used', None)
+            idle_timeout = tracker.idle_timeout
+            if (conn.sock is not None and last_used is not None and idle_timeout is not None
+                    and time.monotonic() - last_used > idle_timeout):
+                conn.close()
+                tracker._record('expired')
+            return conn
+
+        def _put_conn(self, conn):
+            if conn is not None:
+                conn._last_used = time.monotonic()
+            super()._put_conn(conn)
+
+    TrackedPool.__name__ = f"Tracked{base.__name__}"
+    return TrackedPool
+
+
+class _PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose pool manager builds tracked host pools.
+    """
+
+    def __init__(self, tracker, **kwargs):
+        self._tracker = tracker
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _tracked_pool(HTTPConnectionPool, _tracked_connection(HTTPConnection, self._tracker),
+                                  self._tracker),
+            'https': _tracked_pool(HTTPSConnectionPool, _tracked_connection(HTTPSConnection, self._tracker),
+                                   self._tracker),
+        }
+
+
+class ConnectionPool:
+    """
+    ConnectionPool owns a keep-alive ``requests.Session`` shared by API clients.
+    Connections to the same host are reused across calls and threads instead of
+    paying a new TCP/TLS handshake per request.
+
+    Attributes:
+        session (requests.Session): The pooled session used to send requests.
+        idle_timeout (float): Seconds a kept-alive connection may sit idle before it is closed on reuse.
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, pool_block=None, idle_timeout=None):
+        """
+        Initializes the ConnectionPool.
+
+        Args:
+            pool_connections (int): Number of per-host pools to keep. Defaults to POOL_CONNECTIONS from settings.
+            pool_maxsize (int): Maximum number of connections kept per host. Defaults to POOL_MAXSIZE from settings.
+            pool_block (bool): Block callers when a host has no free connection instead of opening an extra one.
+                Defaults to POOL_BLOCK from settings.
+            idle_timeout (float): Keep-alive idle timeout in seconds; ``float('inf')`` keeps connections until the
+                server drops them. Defaults to POOL_IDLE_TIMEOUT from settings.
+        """
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.POOL_IDLE_TIMEOUT
+        self._lock = threading.Lock()
+        self._counters = {'opened': 0, 'reused': 0, 'requests': 0, 'expired': 0}
+        self._adapter = _PooledAdapter(
+            self, pool_connections=pool_connections or settings.POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or settings.POOL_MAXSIZE,
+            pool_block=pool_block if pool_block is not None else settings.POOL_BLOCK)
+        self.session = requests.Session()
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+
+    def _record(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request through the pooled session.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The full request URL.
+            **kwargs: Additional keyword arguments passed to ``requests.Session.request``.
+
+        Returns:
+            requests.Response: The HTTP response.
+        """
+        return self.session.request(method, url, **kwargs)
+
+    def idle_connections(self):
+        """
+        Counts open connections currently parked in the pool.
+
+        Returns:
+            int: The number of idle keep-alive connections.
+        """
+        pools = self._adapter.poolmanager.pools
+        idle = 0
+        for key in list(pools.keys()):
+            host_pool = pools.get(key)
+            if host_pool is None or host_pool.pool is None:
+                continue
+            idle += sum(1 for conn in list(host_pool.pool.queue) if conn is not None and conn.sock is not None)
+        return idle
+
+    def stats(self):
+        """
+        Returns a snapshot of the pool counters.
+
+        Returns:
+            dict: ``opened``, ``reused``, ``requests`` and ``expired`` totals plus the current ``idle`` count.
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+        snapshot['idle'] = self.idle_connections()
+        return snapshot
+
+    def close(self):
+        """
+        Closes every pooled connection.
+        """
+        self.session.close()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool():
+    """
+    Returns the process-wide ConnectionPool shared by all API clients, creating it on first use.
+
+    Returns:
+        ConnectionPool: The shared pool.
+    """
+    global _default_pool
+    default = _default_pool
+    if default is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ConnectionPool()
+            default = _default_pool
+    return default
+
+
+@settings.on_reload
+def _reset_default_pool():
+    # The next get builds it from the reloaded settings; clients created before keep the old one
+    global _default_pool
+    with _default_pool_lock:
+        _default_pool = None
@@ -0,0 +1,263 @@
+import asyncio
+import contextlib
+import threading
+import time
+import weakref
+
+from src.api.cache import _path_of
+from src.api.retry import parse_retry_after
+from src.config.settings import settings
+
+# Fraction of the configured rate restored after each successful response
+RECOVERY_STEP = 0.05
+
+
+def _first_header(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket whose rate adapts to the server's rate-limit feedback.
+    Callers reserve a token and are told how long to wait for it, so the same bucket
+    serves threads (which sleep) and coroutines (which await).
+
+    Attributes:
+        max_rate (float): The configured requests per second; the adaptive rate never exceeds it.
+        burst (float): Maximum number of tokens that can accumulate.
+        rate (float): The current requests per second.
+    """
+
+    def __init__(self, rate, burst):
+        self.max_rate = float(rate)
+        self.burst = float(burst)
+        self.rate = float(rate)
+        self.min_rate = self.max_rate * 0.05
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes one token, borrowing against the future when the bucket is empty.
+
+        Returns:
+            float: Seconds the caller must wait before sending.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds):
+        """
+        Holds every caller back for ``seconds``, e.g. until the server's rate-limit window resets.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def throttle(self, rate):
+        """
+        Lowers the current rate, never below 5% of the configured rate.
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, min(self.rate, rate))
+
+    def recover(self):
+        """
+        Raises the current rate additively back towards the configured rate.
+        """
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_STEP)
+
+
+class EndpointLimit:
+    """
+    The rate limit and in-flight cap for one endpoint prefix.
+
+    Attributes:
+        prefix (str): The endpoint path prefix this limit applies to.
+        bucket (TokenBucket): The request rate limit, or None for no rate limit.
+        max_in_flight (int): Maximum concurrent requests, or 0 for no cap.
+    """
+
+    def __init__(self, prefix, rate=0, burst=None, max_in_flight=0):
+        self.prefix = prefix
+        self.bucket = TokenBucket(rate, burst or max(1.0, rate)) if rate else None
+        self.max_in_flight = max_in_flight
+        self._semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _async_semaphore(self):
+        """
+        Returns the asyncio semaphore of the running event loop; async in-flight caps apply per loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+            return semaphore
+
+    @contextlib.contextmanager
+    def slot(self):
+        """
+        Blocks until a token and an in-flight slot are available, and holds the slot for the request.
+        """
+        if self.bucket is not None:
+            wait = self.bucket.reserve()
+            if wait > 0:
+                time.sleep(wait)
+        if self._semaphore is None:
+            yield
+            return
+        with self._semaphore:
+            yield
+
+    @contextlib.asynccontextmanager
+    async def slot_async(self):
+        """
+        Async counterpart of ``slot`` that waits without blocking the event loop.
+        """
+        if self.bucket is not None:
+            wait = self.bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        if not self.max_in_flight:
+            yield
+            return
+        async with self._async_semaphore():
+            yield
+
+    def observe(self, status, headers):
+        """
+        Adapts the rate to a response: 429s and exhausted quotas slow the bucket down,
+        successes let it recover towards the configured rate.
+
+        Args:
+            status (int): The response status code.
+            headers (Mapping): The response headers.
+        """
+        if self.bucket is None:
+            return
+        remaining = _first_header(headers, 'RateLimit-Remaining', 'X-RateLimit-Remaining')
+        reset = _first_header(headers, 'RateLimit-Reset', 'X-RateLimit-Reset')
+        reset_after = parse_retry_after(reset)
+        # X-RateLimit-Reset is often an epoch timestamp rather than a delay
+        if reset_after is not None and reset_after > 10 ** 9:
+            reset_after = max(0.0, reset_after - time.time())
+        if status == 429:
+            self.bucket.throttle(self.bucket.rate / 2)
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after is None:
+                retry_after = reset_after
+            if retry_after:
+                self.bucket.pause(retry_after)
+            return
+        if remaining is not None and reset_after:
+            try:
+                remaining = float(remaining)
+            except ValueError:
+                return
+            if remaining <= 0:
+                self.bucket.pause(reset_after)
+            elif remaining / reset_after < self.bucket.rate:
+                self.bucket.throttle(remaining / reset_after)
+            else:
+                self.bucket.recover()
+            return
+        if status < 400:
+            self.bucket.recover()
+
+
+class RateLimiter:
+    """
+    RateLimiter applies token-bucket rate limits and in-flight caps per endpoint prefix
+    (e.g. 'photos' or 'comments'), adapting to rate-limit response headers.
+
+    Attributes:
+        default (EndpointLimit): The limit for endpoints no prefix matches.
+        limits (dict): Mapping of endpoint prefix to its EndpointLimit.
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None, limits=None):
+        """
+        Initializes the RateLimiter.
+
+        Args:
+            rate (float): Default requests per second; 0 disables rate limiting. Defaults to RATE_LIMIT from settings.
+            burst (float): Default bucket size. Defaults to RATE_LIMIT_BURST from settings, else one second of traffic.
+            max_in_flight (int): Default concurrent request cap; 0 disables it. Defaults to MAX_IN_FLIGHT from settings.
+            limits (dict): Per-prefix overrides, e.g. {'photos': {'rate': 50, 'burst': 10, 'max_in_flight': 8}}.
+                Defaults to RATE_LIMITS from settings.
+        """
+        self.default = EndpointLimit('', rate if rate is not None else settings.RATE_LIMIT,
+                                     burst if burst is not None else settings.RATE_LIMIT_BURST,
+                                     max_in_flight if max_in_flight is not None else settings.MAX_IN_FLIGHT)
+        self.limits = {prefix.strip('/'): EndpointLimit(prefix.strip('/'), **options)
+                       for prefix, options in (limits if limits is not None else settings.RATE_LIMITS).items()}
+
+    def limit_for(self, endpoint):
+        """
+        Resolves the limit of an endpoint from the longest matching prefix.
+
+        Args:
+            endpoint (str): The API endpoint.
+
+        Returns:
+            EndpointLimit: The matching limit.
+        """
+        path = _path_of(endpoint)
+        best = self.default
+        for prefix, limit in self.limits.items():
+            if (path == prefix or path.startswith(prefix + '/')) and len(prefix) > len(best.prefix):
+                best = limit
+        return best
+
+    def stats(self):
+        """
+        Returns the current adaptive rate of every configured limit.
+
+        Returns:
+            dict: Mapping of prefix ('' for the default) to its current requests per second, or None when unlimited.
+        """
+        limits = {'': self.default, **self.limits}
+        return {prefix: limit.bucket.rate if limit.bucket is not None else None for prefix, limit in limits.items()}
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter():
+    """
+    Returns the process-wide RateLimiter shared by API clients, creating it on first use.
+
+    Returns:
+        RateLimiter: The shared limiter.
+    """
+    global _default_limiter
+    default = _default_limiter
+    if default is None:
+        with _default_limiter_lock:
+            if _default_limiter is None:
+                _default_limiter = RateLimiter()
+            default = _default_limiter
+    return default
+
+
+@settings.on_reload
+def _reset_default_limiter():
+    # The next get builds it from the reloaded settings; clients created before keep the old one
+    global _default_limiter
+    with _default_limiter_lock:
+        _default_limiter = None
@@ -0,0 +1,254 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from src.config.settings import settings
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _status_of(response):
+    """
+    Returns the status code of a requests or aiohttp response.
+    """
+    return getattr(response, 'status_code', None) or getattr(response, 'status', None)
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header given either as delay seconds or as an HTTP date.
+
+    Args:
+        value (str): The header value.
+
+    Returns:
+        float: Seconds to wait, or None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """
+    RetryBudget caps retries to a fraction of the request volume, so a degraded backend
+    sees at most ``ratio`` extra traffic instead of ``RETRY_COUNT`` times the load.
+    Every request deposits ``ratio`` tokens and every retry withdraws one.
+
+    Attributes:
+        ratio (float): Retries allowed per request, e.g. 0.2 for 20%.
+        min_retries (float): Tokens always available, so low-traffic clients can still retry.
+    """
+
+    def __init__(self, ratio=None, min_retries=None):
+        self.ratio = ratio = ratio if ratio is not None else settings.RETRY_BUDGET_RATIO
+        self.min_retries = min_retries = min_retries if min_retries is not None else settings.RETRY_BUDGET_MIN
+        self._balance = float(min_retries)
+        self._cap = float(min_retries) + 100 * ratio
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """
+        Credits the budget for one request.
+        """
+        with self._lock:
+            self._balance = min(self._cap, self._balance + self.ratio)
+
+    def withdraw(self):
+        """
+        Takes one retry from the budget.
+
+        Returns:
+            bool: True when the retry is allowed.
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    RetryPolicy retries idempotent requests on connection errors, timeouts and 429/5xx responses.
+    Delays use decorrelated jitter, honor Retry-After, and every retry is charged to a shared RetryBudget.
+
+    Attributes:
+        max_retries (int): Maximum retries per request.
+        base_delay (float): Minimum delay between attempts in seconds.
+        max_delay (float): Maximum delay between attempts in seconds, Retry-After included.
+        budget (RetryBudget): The budget shared by every request using this policy.
+    """
+
+    def __init__(self, max_retries=None, base_delay=None, max_delay=None, budget=None, retry_statuses=RETRY_STATUSES,
+                 methods=IDEMPOTENT_METHODS):
+        """
+        Initializes the RetryPolicy.
+
+        Args:
+            max_retries (int): Maximum retries per request. Defaults to RETRY_COUNT from settings.
+            base_delay (float): Minimum delay between attempts in seconds. Defaults to RETRY_BACKOFF_BASE from settings.
+            max_delay (float): Maximum delay between attempts in seconds. Defaults to RETRY_BACKOFF_MAX from settings.
+            budget (RetryBudget): The retry budget to charge. Defaults to a new budget.
+            retry_statuses (set): Response status codes that trigger a retry.
+            methods (set): HTTP methods that are safe to retry.
+        """
+        self.max_retries = max_retries if max_retries is not None else settings.RETRY_COUNT
+        self.base_delay = base_delay if base_delay is not None else settings.RETRY_BACKOFF_BASE
+        self.max_delay = max_delay if max_delay is not None else settings.RETRY_BACKOFF_MAX
+        self.budget = budget if budget is not None else RetryBudget()
+        self.retry_statuses = frozenset(retry_statuses)
+        self.methods = frozenset(methods)
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'retries': 0, 'gave_up': 0, 'budget_exhausted': 0}
+        self._reasons = {}
+
+    def _record(self, counter, reason=None):
+        with self._lock:
+            self._counters[counter] += 1
+            if reason is not None:
+                self._reasons[reason] = self._reasons.get(reason, 0) + 1
+
+    def next_delay(self, previous):
+        """
+        Computes the next delay with decorrelated jitter: uniform(base, previous * 3), capped at max_delay.
+
+        Args:
+            previous (float): The previous delay in seconds.
+
+        Returns:
+            float: The next delay in seconds.
+        """
+        return min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    def _plan(self, method, attempt, previous, response=None, error=None):
+        """
+        Decides whether to retry after an attempt.
+
+        Returns:
+            float: Seconds to wait before retrying, or None to stop.
+        """
+        if error is None and _status_of(response) not in self.retry_statuses:
+            return None
+        if method not in self.methods:
+            return None
+        if attempt >= self.max_retries:
+            self._record('gave_up')
+            return None
+        if not self.budget.withdraw():
+            self._record('budget_exhausted')
+            return None
+        reason = type(error).__name__ if error is not None else str(_status_of(response))
+        self._record('retries', reason)
+        delay = self.next_delay(previous)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = min(self.max_delay, max(delay, retry_after))
+        return delay
+
+    def execute(self, method, send, retry_exceptions):
+        """
+        Runs ``send`` until it succeeds, fails permanently, or retries run out.
+
+        Args:
+            method (str): The HTTP method, used to decide whether retrying is safe.
+            send (callable): Sends the request and returns the response.
+            retry_exceptions (tuple): Exception types that count as transient failures.
+
+        Returns:
+            The last response.
+
+        Raises:
+            Exception: The last transient error once retries are exhausted.
+        """
+        self.budget.deposit()
+        self._record('requests')
+        attempt, delay = 0, self.base_delay
+        while True:
+            try:
+                response = send()
+            except retry_exceptions as error:
+                delay = self._plan(method, attempt, delay, error=error)
+                if delay is None:
+                    raise
+            else:
+                delay = self._plan(method, attempt, delay, response=response)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    async def execute_async(self, method, send, retry_exceptions):
+        """
+        Async counterpart of ``execute``; ``send`` is a coroutine function.
+        """
+        self.budget.deposit()
+        self._record('requests')
+        attempt, delay = 0, self.base_delay
+        while True:
+            try:
+                response = await send()
+            except retry_exceptions as error:
+                delay = self._plan(method, attempt, delay, error=error)
+                if delay is None:
+                    raise
+            else:
+                delay = self._plan(method, attempt, delay, response=response)
+                if delay is None:
+                    return response
+                response.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self):
+        """
+        Returns a snapshot of the retry counters.
+
+        Returns:
+            dict: ``requests``, ``retries``, ``gave_up`` and ``budget_exhausted`` totals, plus retries per reason under ``reasons``.
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+            snapshot['reasons'] = dict(self._reasons)
+        return snapshot
+
+
+_default_policy = None
+_default_policy_lock = threading.Lock()
+
+
+def get_default_retry_policy():
+    """
+    Returns the process-wide RetryPolicy, whose budget is shared by every API client, creating it on first use.
+
+    Returns:
+        RetryPolicy: The shared policy.
+    """
+    global _default_policy
+    default = _default_policy
+    if default is None:
+        with _default_policy_lock:
+            if _default_policy is None:
+                _default_policy = RetryPolicy()
+            default = _default_policy
+    return default
+
+
+@settings.on_reload
+def _reset_default_policy():
+    # The next get builds it from the reloaded settings; clients created before keep the old one
+    global _default_policy
+    with _default_policy_lock:
+        _default_policy = None
@@ -0,0 +1,97 @@
+import codecs
+import json
+from json.decoder import WHITESPACE
+
+
+class JSONArrayDecoder:
+    """
+    Incremental decoder for a top-level JSON array.
+    Bytes are fed in as they arrive from the socket and complete items are returned
+    as soon as they are parsed, so only the unparsed tail of the body is held in memory.
+    """
+
+    def __init__(self, encoding='utf-8'):
+        """
+        Initializes the decoder.
+
+        Args:
+            encoding (str): The character encoding of the byte stream.
+        """
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ''
+        self._state = 'start'
+
+    def feed(self, chunk):
+        """
+        Feeds the next chunk of the body.
+
+        Args:
+            chunk (bytes): The raw bytes received.
+
+        Returns:
+            list: The items completed by this chunk.
+
+        Raises:
+            ValueError: The body is not a well-formed JSON array.
+        """
+        self._buffer += self._text.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self):
+        """
+        Signals the end of the body.
+
+        Returns:
+            list: Any items still pending in the buffer.
+
+        Raises:
+            ValueError: The body ended before the array was closed.
+        """
+        self._buffer += self._text.decode(b'', final=True)
+        items = self._drain(final=True)
+        if self._state != 'done':
+            raise ValueError("Truncated JSON array in response body.")
+        return items
+
+    def _drain(self, final):
+        """
+        Parses as many complete items as the buffer holds and drops the consumed text.
+        """
+        buffer, items = self._buffer, []
+        pos, end = 0, len(self._buffer)
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos >= end:
+                break
+            char = buffer[pos]
+            if self._state == 'start':
+                if char != '[':
+                    raise ValueError("Expected a JSON array in response body.")
+                self._state = 'first'
+                pos += 1
+            elif self._state == 'done':
+                raise ValueError("Extra data after JSON array in response body.")
+            elif char == ']' and self._state in ('first', 'separator'):
+                self._state = 'done'
+                pos += 1
+            elif char == ',' and self._state == 'separator':
+                self._state = 'item'
+                pos += 1
+            elif self._state in ('first', 'item'):
+                try:
+                    item, item_end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise ValueError("Malformed JSON array in response body.")
+                    break
+                # A scalar ending exactly at the buffer edge may still be growing (e.g. a number)
+                if item_end == end and not final:
+                    break
+                items.append(item)
+                self._state = 'separator'
+                pos = item_end
+            else:
+                raise ValueError("Malformed JSON array in response body.")
+        self._buffer = buffer[pos:]
+        return items
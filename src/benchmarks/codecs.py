@@ -0,0 +1,62 @@
+import argparse
+import sys
+import time
+
+from src.api.clients import CODECS
+from src.mock_server.store import RESOURCE_SIZES, build_dataset
+
+
+def _best_of(function, argument, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark_codecs(resource='photos', repeat=20, codecs=None):
+    """
+    Times every installed JSON codec on one collection payload, encoded as the API sends it.
+
+    Args:
+        resource (str): The collection to encode and decode; 'photos' is the largest (~800 KB).
+        repeat (int): Runs per codec; the fastest is reported.
+        codecs (dict): Codecs to compare, by name. Defaults to every installed codec.
+
+    Returns:
+        dict: Mapping of codec name to ``loads_ms``, ``dumps_ms`` and ``loads_speedup`` over the stdlib codec.
+    """
+    codecs = codecs or CODECS
+    records = build_dataset()[resource]
+    content = CODECS['json'].dumps(records)
+    results = {}
+    for name, codec in codecs.items():
+        if codec.loads(content) != records:
+            raise AssertionError(f"{name} does not round-trip the {resource} payload")
+        results[name] = {'loads_ms': round(_best_of(codec.loads, content, repeat) * 1000, 3),
+                         'dumps_ms': round(_best_of(codec.dumps, records, repeat) * 1000, 3)}
+    stdlib = results.get('json', {}).get('loads_ms')
+    for result in results.values():
+        result['loads_speedup'] = round(stdlib / result['loads_ms'], 2) if stdlib else None
+    return results
+
+
+def main(argv=None):
+    """
+    Command-line entry point: ``python -m src.benchmarks.codecs``.
+    """
+    parser = argparse.ArgumentParser(description='Compare the parse time of the installed JSON codecs.')
+    parser.add_argument('--resource', default='photos', choices=list(RESOURCE_SIZES))
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per codec; the fastest is reported.')
+    args = parser.parse_args(argv)
+
+    results = benchmark_codecs(args.resource, args.repeat)
+    print(f"{'codec':<10} {'loads ms':>10} {'dumps ms':>10} {'speedup':>8}")
+    for name, result in results.items():
+        print(f"{name:<10} {result['loads_ms']:>10.3f} {result['dumps_ms']:>10.3f} {result['loads_speedup'] or 0:>7.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
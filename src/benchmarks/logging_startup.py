@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Imports every service module, then sets up logging the way the test modules' fixtures do
+IMPORT_SCRIPT = '''
+import gc, json, logging, time
+started = time.perf_counter()
+import src.services.album_service, src.services.comment_service, src.services.photo_service
+import src.services.post_service, src.services.todo_service, src.services.user_service
+imported = time.perf_counter()
+from src.utils.logging_utils import setup_logging
+for name in ('session', 'posts', 'comments', 'users', 'albums', 'photos', 'todos', 'posts'):
+    setup_logging(name)
+finished = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'setup_ms': (finished - imported) * 1000,
+                  'open_log_files': sum(isinstance(obj, logging.FileHandler) and obj.stream is not None
+                                        for obj in gc.get_objects())}))
+'''
+
+
+def _run(command, root, cwd):
+    # Nothing is requested, but settings need a base URL and the .env file is not found from a temporary directory
+    env = {'API_BASE_URL': 'http://127.0.0.1', **os.environ, 'PYTHONPATH': root}
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return completed.stdout, (time.perf_counter() - started) * 1000
+
+
+def benchmark_startup(root=ROOT, repeat=5):
+    """
+    Measures the cost of logging setup at startup, each run in a fresh interpreter and working directory.
+
+    Args:
+        root (str): The checkout to measure; pass an older checkout to compare before and after a change.
+        repeat (int): Runs per measurement; the fastest is reported.
+
+    Returns:
+        dict: ``import_ms`` (importing the six service modules), ``setup_ms`` (eight ``setup_logging`` calls),
+            ``open_log_files`` (log files still open afterwards), ``log_files`` (files created) and
+            ``collect_ms`` (wall time of ``pytest --collect-only``).
+    """
+    results = {}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as cwd:
+            output, _ = _run([sys.executable, '-c', IMPORT_SCRIPT], root, cwd)
+            measured = json.loads(output)
+            logs = os.path.join(cwd, 'logs')
+            measured['log_files'] = len(os.listdir(logs)) if os.path.isdir(logs) else 0
+            _, measured['collect_ms'] = _run(
+                [sys.executable, '-m', 'pytest', '--collect-only', '-q', '-p', 'no:cacheprovider', '--no-api-profile',
+                 '-c', os.path.join(root, 'pytest.ini'), '--rootdir', root, os.path.join(root, 'src', 'tests')],
+                root, cwd)
+        for name, value in measured.items():
+            results[name] = min(results.get(name, value), value)
+    return {name: round(value, 2) for name, value in results.items()}
+
+
+def main(argv=None):
+    """
+    Command-line entry point: ``python -m src.benchmarks.logging_startup``.
+    """
+    parser = argparse.ArgumentParser(description='Measure logging setup cost at import and test collection.')
+    parser.add_argument('--root', default=ROOT, help='Checkout to measure, e.g. a git worktree of an older commit.')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the fastest is reported.')
+    args = parser.parse_args(argv)
+
+    for name, value in benchmark_startup(os.path.abspath(args.root), args.repeat).items():
+        print(f"{name:<14} {value:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
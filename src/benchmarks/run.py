@@ -0,0 +1,303 @@
+import argparse
+import asyncio
+import http.client
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.api.metrics import MetricsRecorder
+from src.api.pool import ConnectionPool
+from src.api.rate_limit import RateLimiter
+from src.api.retry import RetryPolicy
+from src.tests.stub_server import StubServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+# Endpoint fetched for each payload size: one record (~100 B), 500 comments (~70 KB), 5000 photos (~800 KB)
+PAYLOADS = {'small': 'posts/1', 'medium': 'comments', 'large': 'photos'}
+
+MODES = ('sync', 'threaded', 'async')
+
+CONCURRENCY_LEVELS = (8, 32)
+
+# Result key of the calibration run, which measures the machine rather than the clients
+CALIBRATION = 'calibration'
+CALIBRATION_REQUESTS = 500
+
+
+class BenchmarkCase:
+    """
+    One benchmark configuration.
+
+    Attributes:
+        mode (str): 'sync' (one thread), 'threaded' (a thread pool sharing one APIClient) or 'async' (AsyncAPIClient).
+        payload (str): A key of PAYLOADS.
+        concurrency (int): Requests in flight at once; always 1 in sync mode.
+        requests (int): Number of timed requests.
+    """
+
+    def __init__(self, mode, payload, concurrency, requests):
+        self.mode = mode
+        self.payload = payload
+        self.concurrency = 1 if mode == 'sync' else concurrency
+        self.requests = requests
+
+    @property
+    def name(self):
+        return f'{self.mode}/{self.payload}/c{self.concurrency}'
+
+
+def build_cases(modes=MODES, payloads=tuple(PAYLOADS), concurrency_levels=CONCURRENCY_LEVELS, requests=200):
+    """
+    Expands the benchmark matrix; sync mode runs once per payload since it has no concurrency.
+
+    Returns:
+        list: The BenchmarkCase objects, in run order.
+    """
+    cases = {}
+    for mode in modes:
+        for payload in payloads:
+            for concurrency in concurrency_levels:
+                case = BenchmarkCase(mode, payload, concurrency, requests)
+                cases.setdefault(case.name, case)
+    return list(cases.values())
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _sync_client(base_url, concurrency, recorder):
+    # Caching, coalescing, retries and rate limits would skew the numbers, so the client under test runs without them
+    client = APIClient(base_url=base_url, pool=ConnectionPool(pool_maxsize=concurrency),
+                       retry=RetryPolicy(max_retries=0), rate_limiter=RateLimiter(0, None, 0, {}), metrics=recorder,
+                       coalescer=False)
+    client.cache = None
+    return client
+
+
+def _run_sync(case, base_url, recorder):
+    client = _sync_client(base_url, 1, recorder)
+    endpoint = PAYLOADS[case.payload]
+    client.get(endpoint)
+    recorder.reset()
+    started = time.perf_counter()
+    for _ in range(case.requests):
+        client.get(endpoint)
+    return time.perf_counter() - started
+
+
+def _run_threaded(case, base_url, recorder):
+    client = _sync_client(base_url, case.concurrency, recorder)
+    endpoint = PAYLOADS[case.payload]
+    with ThreadPoolExecutor(max_workers=case.concurrency) as executor:
+        list(executor.map(lambda _: client.get(endpoint), range(case.concurrency)))
+        recorder.reset()
+        started = time.perf_counter()
+        list(executor.map(lambda _: client.get(endpoint), range(case.requests)))
+        return time.perf_counter() - started
+
+
+async def _run_async(case, base_url, recorder):
+    endpoint = PAYLOADS[case.payload]
+    async with AsyncAPIClient(base_url=base_url, max_concurrency=case.concurrency, retry=RetryPolicy(max_retries=0),
+                              rate_limiter=RateLimiter(0, None, 0, {}), metrics=recorder, coalescer=False) as client:
+        await asyncio.gather(*(client.get(endpoint) for _ in range(case.concurrency)))
+        recorder.reset()
+        started = time.perf_counter()
+        await asyncio.gather(*(client.get(endpoint) for _ in range(case.requests)))
+        return time.perf_counter() - started
+
+
+def calibrate(base_url, requests=CALIBRATION_REQUESTS):
+    """
+    Measures the machine: plain ``http.client`` GETs of one post over a single keep-alive connection, and the
+    RSS of a process that has imported the clients but sent nothing through them. Neither depends on the
+    framework's code, so comparing them with the baseline's shows how much faster or bigger this machine is.
+
+    Args:
+        base_url (str): The base URL of the stub server.
+        requests (int): Number of timed requests.
+
+    Returns:
+        dict: ``rps`` and ``rss_mb``.
+    """
+    rss = _peak_rss_mb()
+    url = urlsplit(base_url)
+    path = f'/{PAYLOADS["small"]}'
+    conn = http.client.HTTPConnection(url.hostname, url.port)
+    try:
+        conn.request('GET', path)
+        conn.getresponse().read()
+        started = time.perf_counter()
+        for _ in range(requests):
+            conn.request('GET', path)
+            conn.getresponse().read()
+        elapsed = time.perf_counter() - started
+    finally:
+        conn.close()
+    return {'rps': round(requests / elapsed, 1), 'rss_mb': round(rss, 1)}
+
+
+def run_case(case, base_url):
+    """
+    Runs one case after a warm-up that opens the connections, and measures it.
+
+    Args:
+        case (BenchmarkCase): The case to run.
+        base_url (str): The base URL of the stub server.
+
+    Returns:
+        dict: ``rps``, ``p50_ms``, ``p90_ms``, ``p99_ms`` and ``peak_rss_mb`` of the case.
+    """
+    recorder = MetricsRecorder()
+    if case.mode == 'async':
+        elapsed = asyncio.run(_run_async(case, base_url, recorder))
+    elif case.mode == 'threaded':
+        elapsed = _run_threaded(case, base_url, recorder)
+    else:
+        elapsed = _run_sync(case, base_url, recorder)
+    total = recorder.summary()['methods']['GET']['timings']['total']
+    return {
+        'rps': round(case.requests / elapsed, 1),
+        'p50_ms': round(total['p50'] * 1000, 3),
+        'p90_ms': round(total['p90'] * 1000, 3),
+        'p99_ms': round(total['p99'] * 1000, 3),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+
+def run_benchmarks(cases, isolate=True, calibration=False):
+    """
+    Runs every case against a fresh in-process stub server.
+
+    Args:
+        cases (list): The BenchmarkCase objects to run.
+        isolate (bool): Run each case in its own spawned process, so peak RSS and warm state are per case.
+        calibration (bool): Also measure the machine with ``calibrate``, stored under CALIBRATION.
+
+    Returns:
+        dict: Mapping of case name to its result.
+    """
+    results = {}
+    with StubServer() as server:
+        if calibration:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                results[CALIBRATION] = executor.submit(calibrate, server.base_url).result()
+        for case in cases:
+            if isolate:
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                    results[case.name] = executor.submit(run_case, case, server.base_url).result()
+            else:
+                results[case.name] = run_case(case, server.base_url)
+    return results
+
+
+def compare(baseline, results, tolerance):
+    """
+    Finds cases that got slower or bigger than their baseline by more than ``tolerance``.
+
+    When both sides carry a CALIBRATION result, the baseline is first scaled to this machine: throughput
+    by the ratio of the calibration throughputs, p90 by its inverse, and peak RSS shifted by the difference
+    of the idle process sizes. A baseline recorded on another machine then only flags changes of the clients.
+
+    Args:
+        baseline (dict): Stored results, keyed by case name.
+        results (dict): Current results, keyed by case name.
+        tolerance (float): Allowed relative change, e.g. 0.25 for 25%.
+
+    Returns:
+        list: A human-readable line per regression.
+    """
+    speed, rss_offset = 1.0, 0.0
+    if CALIBRATION in baseline and CALIBRATION in results:
+        speed = results[CALIBRATION]['rps'] / baseline[CALIBRATION]['rps']
+        rss_offset = results[CALIBRATION]['rss_mb'] - baseline[CALIBRATION]['rss_mb']
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or name == CALIBRATION:
+            continue
+        expected = {'rps': base['rps'] * speed, 'p90_ms': base['p90_ms'] / speed,
+                    'peak_rss_mb': base['peak_rss_mb'] + rss_offset}
+        if result['rps'] < expected['rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {expected['rps']:.1f} -> {result['rps']} req/s")
+        for metric in ('p90_ms', 'peak_rss_mb'):
+            if result[metric] > expected[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {expected[metric]:.3f} -> {result[metric]}")
+    return regressions
+
+
+def _print_results(results):
+    print(f"{'case':<22} {'req/s':>10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak RSS MB':>12}")
+    for name, result in results.items():
+        if name == CALIBRATION:
+            print(f"{name:<22} {result['rps']:>10.1f} {'':>9} {'':>9} {'':>9} {result['rss_mb']:>12.1f}")
+            continue
+        print(f"{name:<22} {result['rps']:>10.1f} {result['p50_ms']:>9.2f} {result['p90_ms']:>9.2f} "
+              f"{result['p99_ms']:>9.2f} {result['peak_rss_mb']:>12.1f}")
+
+
+def main(argv=None):
+    """
+    Command-line entry point: ``python -m src.benchmarks.run``.
+
+    Returns:
+        int: 1 when a case regressed against the baseline, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark APIClient and AsyncAPIClient against a local stub.')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--payloads', nargs='+', choices=list(PAYLOADS), default=list(PAYLOADS))
+    parser.add_argument('--concurrency', nargs='+', type=int, default=list(CONCURRENCY_LEVELS))
+    parser.add_argument('--requests', type=int, default=200, help='Timed requests per case.')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline results to compare against.')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression.')
+    parser.add_argument('--output', help='Also write the results to this JSON file.')
+    args = parser.parse_args(argv)
+
+    cases = build_cases(args.modes, args.payloads, args.concurrency, args.requests)
+    results = run_benchmarks(cases, calibration=True)
+    _print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, results, args.tolerance)
+    if regressions:
+        # One noisy run on a shared machine should not fail the job: measure the flagged cases again
+        flagged = {regression.split(':')[0] for regression in regressions}
+        print(f"Re-running {len(flagged)} flagged case(s) to confirm")
+        retried = run_benchmarks([case for case in cases if case.name in flagged], calibration=True)
+        _print_results(retried)
+        regressions = compare(baseline, retried, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,37 @@
 import pytest
+from src.config.settings import settings
+from src.utils.api_profiler import APIProfiler
 from src.utils.logging_utils import setup_logging
 
 
+def pytest_addoption(parser):
+    """
+    Command-line options of the bundled API profiler plugin.
+    """
+    group = parser.getgroup('api-profile', 'API request profiling')
+    group.addoption('--no-api-profile', action='store_true', help='Disable API request profiling.')
+    group.addoption('--api-top', type=int, default=settings.API_PROFILE_TOP,
+                    help='Number of slowest endpoints and tests to print.')
+    group.addoption('--api-report', default=settings.API_PROFILE_REPORT,
+                    help='Path of the JSON API profile report; empty to skip writing it.')
+    group.addoption('--api-compare', default=None,
+                    help='Earlier API profile report to check for latency regressions.')
+    group.addoption('--api-regression-threshold', type=float, default=0.2,
+                    help='Relative p90 growth reported as a regression, e.g. 0.2 for 20%%.')
+
+
+def pytest_configure(config):
+    """
+    Registers the API profiler, which attributes every APIClient call to the running test.
+    """
+    if config.getoption('no_api_profile'):
+        return
+    profiler = APIProfiler(top=config.getoption('api_top'), report_path=config.getoption('api_report') or None,
+                           compare_path=config.getoption('api_compare'),
+                           threshold=config.getoption('api_regression_threshold'))
+    config.pluginmanager.register(profiler, 'api_profiler')
+
+
 @pytest.fixture(scope='session', autouse=True)
 def configure_logging_session():
     """
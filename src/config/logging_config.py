@@ -1,44 +1,385 @@
+import atexit
+import fnmatch
+import gzip
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import shutil
+import threading
 from datetime import datetime
 
+from src.config.settings import settings
 
-def configure_logging(log_file=None):
-    """Configure logging for the application."""
-    if log_file is None:
-        # Generate a unique log file name based on the current timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = f'logs/app_{timestamp}.log'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(funcName)s - %(levelname)s - %(message)s'
 
-    # Ensure the directory for log files exists
-    log_dir = os.path.dirname(log_file)
-    if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir)
 
+def get_worker_id():
+    """Return the pytest-xdist worker ID (e.g. 'gw0'), or None outside a parallel run."""
+    return os.getenv('PYTEST_XDIST_WORKER')
+
+
+def worker_log_file(name):
+    """Return the log file path for the given name, suffixed with the worker ID in parallel runs."""
+    worker_id = get_worker_id()
+    if worker_id:
+        return f'logs/{name}_{worker_id}.log'
+    return f'logs/{name}.log'
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line: ``ts`` (epoch seconds), ``level``, ``logger``, ``func``
+    and ``message``, plus ``exc`` with the traceback when there is one.
+    """
+
+    def format(self, record):
+        entry = {'ts': round(record.created, 3), 'level': record.levelname, 'logger': record.name,
+                 'func': record.funcName, 'message': record.getMessage()}
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a share of the INFO and DEBUG records of each logger; warnings and errors always pass.
+
+    Rates are keyed by logger name prefix, optionally followed by a pattern of the logging function,
+    e.g. ``{'src.services': 0.1, 'src.services:fetch_*': 0.01}``. The longest matching key wins and
+    loggers without one are not sampled.
+    """
+
+    def __init__(self, rates=None, seed=None):
+        super().__init__()
+        self.rates = dict(settings.LOG_SAMPLING if rates is None else rates)
+        self.kept = 0
+        self.skipped = 0
+        self._random = random.Random(seed)
+        self._resolved = {}
+
+    def rate_for(self, name, func):
+        """Return the share of records kept for a logger and function."""
+        key = (name, func)
+        rate = self._resolved.get(key)
+        if rate is None:
+            rate, best = 1.0, -1
+            for pattern, value in self.rates.items():
+                prefix, _, func_pattern = pattern.partition(':')
+                if ((not prefix or name == prefix or name.startswith(prefix + '.'))
+                        and (not func_pattern or fnmatch.fnmatchcase(func, func_pattern)) and len(pattern) > best):
+                    rate, best = float(value), len(pattern)
+            self._resolved[key] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        # The decision is kept on the record so every handler sharing this filter agrees
+        keep = record.__dict__.get('_sampled')
+        if keep is None:
+            rate = self.rate_for(record.name, record.funcName)
+            keep = record._sampled = rate >= 1 or self._random.random() < rate
+            if keep:
+                self.kept += 1
+            else:
+                self.skipped += 1
+        return keep
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that gzips each rotated file (``app.log.1.gz``, ``app.log.2.gz``, ...).
+
+    Rotation is checked against the size already written instead of formatting every record twice,
+    so a file may exceed ``maxBytes`` by one record.
+    """
+
+    def __init__(self, filename, max_bytes=None, backup_count=None, delay=True):
+        super().__init__(filename, maxBytes=settings.LOG_MAX_BYTES if max_bytes is None else max_bytes,
+                         backupCount=settings.LOG_BACKUP_COUNT if backup_count is None else backup_count, delay=delay)
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source, dest):
+        with open(source, 'rb') as plain, gzip.open(dest, 'wb') as compressed:
+            shutil.copyfileobj(plain, compressed)
+        os.remove(source)
+
+    def shouldRollover(self, record):
+        return self.stream is not None and self.maxBytes > 0 and self.stream.tell() >= self.maxBytes
+
+
+def build_formatter(output=None):
+    """Return the formatter for ``output`` ('text' or 'json'), defaulting to LOG_OUTPUT."""
+    output = output or settings.LOG_OUTPUT
+    if output == 'json':
+        return JSONFormatter()
+    if output != 'text':
+        raise ValueError(f"Unknown log output '{output}'; use 'text' or 'json'")
+    return logging.Formatter(LOG_FORMAT)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that hands records to a background writer without formatting them.
+
+    Messages are built from their ``%`` arguments on the writer thread, so the caller pays only for
+    the enqueue. With the 'drop' policy a full queue discards the record and counts it; with 'block'
+    the caller waits for room.
+    """
+
+    def __init__(self, log_queue, policy=None):
+        policy = policy or settings.LOG_QUEUE_POLICY
+        if policy not in ('drop', 'block'):
+            raise ValueError(f"Unknown log queue policy '{policy}'; use 'drop' or 'block'")
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Records stay in this process, so they are queued as they are instead of pre-formatted for pickling
+        return record
+
+    def enqueue(self, record):
+        if self.policy == 'block':
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener:
+    """
+    Background thread writing queued records to the target handlers in batches.
+
+    Every record waiting in the queue (up to ``batch_size``) is formatted and written in one call per
+    stream handler, followed by a single flush, instead of one write and flush per record.
+    """
+
+    _sentinel = None
+
+    def __init__(self, log_queue, handlers, batch_size=None):
+        self.queue = log_queue
+        self.handlers = list(handlers)
+        self.batch_size = batch_size or settings.LOG_BATCH_SIZE
+        self.written = 0
+        self.batches = 0
+        self._thread = None
+
+    def start(self):
+        """Start the writer thread."""
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write the records still queued, then stop the writer thread."""
+        if self._thread is None:
+            return
+        self.queue.put(self._sentinel)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = self._sentinel in batch
+            records = [record for record in batch if record is not self._sentinel]
+            if records:
+                self._write(records)
+            if stopping:
+                return
+
+    def _write(self, records):
+        for handler in self.handlers:
+            if not isinstance(handler, logging.StreamHandler):
+                for record in records:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                continue
+            lines = []
+            for record in records:
+                if record.levelno >= handler.level and handler.filter(record):
+                    try:
+                        lines.append(handler.format(record) + handler.terminator)
+                    except Exception:
+                        handler.handleError(record)
+            if not lines:
+                continue
+            handler.acquire()
+            try:
+                if handler.stream is None and isinstance(handler, logging.FileHandler):
+                    # Delayed file handlers open their file on the first write
+                    handler.stream = handler._open()
+                handler.stream.write(''.join(lines))
+                handler.flush()
+                if isinstance(handler, CompressingRotatingFileHandler) and handler.shouldRollover(None):
+                    handler.doRollover()
+            except Exception:
+                handler.handleError(records[-1])
+            finally:
+                handler.release()
+        self.written += len(records)
+        self.batches += 1
+
+
+# Process-wide logging state: the process that configured it, the mode, the root's current handlers
+# and the background writer of the queue mode
+_lock = threading.RLock()
+_configured_pid = None
+_mode = None
+_console_handler = None
+_file_handler = None
+_listener = None
+_sampler = None
+
+# File handlers by absolute path, opened once per process and reused by every configure_logging call
+_file_handlers = {}
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _shutdown():
+    _stop_listener()
+    with _lock:
+        for handler in _file_handlers.values():
+            handler.close()
+        _file_handlers.clear()
+
+
+atexit.register(_shutdown)
+
+
+def get_file_handler(log_file):
+    """Return the file handler writing to ``log_file``, creating it and its directory on first use."""
+    path = os.path.abspath(log_file)
+    with _lock:
+        handler = _file_handlers.get(path)
+        if handler is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # The file is opened by the first record written to it
+            if settings.LOG_MAX_BYTES > 0:
+                handler = CompressingRotatingFileHandler(path)
+            else:
+                handler = logging.FileHandler(path, delay=True)
+            handler.setLevel(settings.LOG_LEVEL)
+            handler.setFormatter(build_formatter())
+            _file_handlers[path] = handler
+        return handler
+
+
+def _initialize(mode):
+    """Install the console handler, and the queue in queue mode, on the root logger."""
+    global _listener, _configured_pid, _mode, _console_handler, _file_handler, _sampler
+    if _configured_pid == os.getpid():
+        _stop_listener()
+    else:
+        # A forked child inherits the parent's state but not its writer thread
+        _listener = None
     logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+    logger.setLevel(settings.LOG_LEVEL)
+    logger.handlers.clear()
+
+    _console_handler = logging.StreamHandler()
+    _console_handler.setLevel(settings.LOG_LEVEL)
+    _console_handler.setFormatter(build_formatter())
+    _file_handler = None
+    # Sampling runs before records are queued or formatted, so skipped records cost almost nothing
+    _sampler = SamplingFilter() if settings.LOG_SAMPLING else None
+    if mode == 'queue':
+        log_queue = queue.Queue(settings.LOG_QUEUE_SIZE)
+        _listener = BatchingQueueListener(log_queue, [_console_handler])
+        _listener.start()
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        if _sampler is not None:
+            queue_handler.addFilter(_sampler)
+        logger.addHandler(queue_handler)
+    else:
+        if _sampler is not None:
+            _console_handler.addFilter(_sampler)
+        logger.addHandler(_console_handler)
+    _configured_pid = os.getpid()
+    _mode = mode
+
+
+def _use_file_handler(handler):
+    """Make ``handler`` the one file the root logger writes to, replacing the previous one."""
+    global _file_handler
+    if handler is _file_handler:
+        return
+    # Registered handlers outlive reinitialization; drop the sampler of an earlier setup
+    for stale in [existing for existing in handler.filters if isinstance(existing, SamplingFilter)]:
+        handler.removeFilter(stale)
+    if _listener is not None:
+        _listener.handlers = [_console_handler, handler]
+    else:
+        if _sampler is not None:
+            handler.addFilter(_sampler)
+        logger = logging.getLogger()
+        if _file_handler is not None:
+            logger.removeHandler(_file_handler)
+        logger.addHandler(handler)
+    _file_handler = handler
+
+
+def configure_logging(log_file=None, mode=None):
+    """
+    Configure logging for the application; ``mode`` is 'sync' or 'queue' and defaults to LOG_MODE.
+
+    The level comes from LOG_LEVEL, read when the root logger is set up.
 
-    # Clear existing handlers
-    if logger.hasHandlers():
-        logger.handlers.clear()
+    The root logger is set up once per process (again after a fork, or when the mode changes); later calls
+    only switch the log file, reusing its handler when the file was used before. Without ``log_file`` a
+    timestamped app log is opened on the first call and kept afterwards.
+    """
+    mode = mode or settings.LOG_MODE
+    if mode not in ('sync', 'queue'):
+        raise ValueError(f"Unknown log mode '{mode}'; use 'sync' or 'queue'")
+    with _lock:
+        initialize = _configured_pid != os.getpid() or mode != _mode
+        if initialize:
+            _initialize(mode)
+        if log_file is None and _file_handler is not None:
+            return
+        if log_file is None:
+            # Generate a unique log file name based on the current timestamp
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            log_file = worker_log_file(f'app_{timestamp}')
+        _use_file_handler(get_file_handler(log_file))
+    if initialize:
+        logging.getLogger().info("Logging configuration completed successfully.")
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(funcName)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
 
-    # File handler
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(funcName)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
+def log_sampling_stats():
+    """Return the sampling counters: INFO and DEBUG records kept and skipped; empty when sampling is off."""
+    if _sampler is None:
+        return {}
+    return {'kept': _sampler.kept, 'skipped': _sampler.skipped}
 
-    # Add handlers to the logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
 
-    logger.info("Logging configuration completed successfully.")
+def log_queue_stats():
+    """Return the queue logging counters: records written, write batches, queued and dropped; empty in sync mode."""
+    if _listener is None:
+        return {}
+    dropped = sum(handler.dropped for handler in logging.getLogger().handlers
+                  if isinstance(handler, NonBlockingQueueHandler))
+    return {'written': _listener.written, 'batches': _listener.batches, 'queued': _listener.queue.qsize(),
+            'dropped': dropped}
 
 
 def get_logger(name):
@@ -1,18 +1,320 @@
+import json
 import os
-from dotenv import load_dotenv
+import threading
+from contextlib import contextmanager
 
-# Load environment variables from the .env file
-load_dotenv()
+from dotenv import dotenv_values
 
-# Retrieve the API base URL from environment variables
-API_BASE_URL = os.getenv('API_BASE_URL')
+# The .env file read on first use; ENV_FILE points elsewhere
+ENV_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env')
 
-# Check if the API_BASE_URL environment variable is set
-if not API_BASE_URL:
-    raise ValueError("API_BASE_URL environment variable is not set. Please check your .env file.")
+_MISSING = object()
 
-# Add additional environment variables as needed
-# Example:
-# API_TOKEN = os.getenv('API_TOKEN')
-# if not API_TOKEN:
-#     raise ValueError("API_TOKEN environment variable is not set. Please check your .env file.")
+
+def _bool(value):
+    return value.lower() == 'true'
+
+
+def _lower(value):
+    return value.lower()
+
+
+def _optional_float(value):
+    return float(value) or None
+
+
+class Field:
+    """
+    A typed setting: the raw string from the environment or the .env files is converted with ``parse``.
+
+    Attributes:
+        parse (callable): Converts the raw string, e.g. ``int`` or ``float``.
+        default (str or callable): Raw value used when the key is not set, or a function of the settings
+            computing the value, e.g. from another setting.
+        required (bool): Reading the setting fails when it is not set.
+    """
+
+    def __init__(self, parse=str, default=None, required=False):
+        self.parse = parse
+        self.default = default
+        self.required = required
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.get(self.name)
+
+
+class Settings:
+    """
+    The framework configuration, read lazily: nothing is parsed until the first setting is used, then the
+    sources are read once and every value is converted on first access and cached.
+
+    Sources, later ones winning:
+        1. the .env file (``ENV_FILE``);
+        2. the profile file ``.env.<profile>`` next to it, where the profile is ``ENV`` (e.g. ``.env.staging``);
+        3. the process environment;
+        4. worker overrides: in a pytest-xdist worker, ``<KEY>__<WORKER>`` replaces ``<KEY>``,
+           e.g. ``API_BASE_URL__GW1`` gives worker gw1 its own backend.
+
+    ``reload()`` reads the sources again, so clients and services created afterwards pick up the new values
+    without reimporting anything; process-wide defaults built from settings, such as the shared connection
+    pool, are rebuilt through their ``on_reload`` hooks. ``override()`` replaces values temporarily, e.g. in a test.
+    """
+
+    # Retrieve the API base URL from environment variables
+    API_BASE_URL = Field(required=True)
+
+    # Replicas of the API to balance requests over, comma-separated; when set, API_BASE_URL is not needed.
+    # LOAD_BALANCER is round_robin, least_outstanding or ewma. A replica failing BALANCER_MAX_FAILURES requests
+    # in a row is ejected for BALANCER_EJECTION_TIME seconds; BALANCER_EWMA_DECAY is the EWMA time constant
+    API_BASE_URLS = Field(default='')
+    LOAD_BALANCER = Field(_lower, 'ewma')
+    BALANCER_MAX_FAILURES = Field(int, '5')
+    BALANCER_EJECTION_TIME = Field(float, '30')
+    BALANCER_EWMA_DECAY = Field(float, '10')
+
+    # Deployment profile, also selecting the .env.<profile> overrides, and the root log level
+    ENV = Field(default='development')
+    LOG_LEVEL = Field(str.upper, 'INFO')
+
+    # Request timeouts in seconds: TIMEOUT bounds each socket read, CONNECT_TIMEOUT the connection setup
+    TIMEOUT = Field(float, '30')
+    CONNECT_TIMEOUT = Field(float, '5')
+
+    # Retry policy for idempotent requests and the share of extra traffic retries may add
+    RETRY_COUNT = Field(int, '3')
+    RETRY_BACKOFF_BASE = Field(float, '0.1')
+    RETRY_BACKOFF_MAX = Field(float, '10')
+    RETRY_BUDGET_RATIO = Field(float, '0.2')
+    RETRY_BUDGET_MIN = Field(float, '10')
+
+    # Client-side rate limiting: requests per second (0 = unlimited), bucket size and concurrent request cap.
+    # RATE_LIMITS holds per-endpoint-prefix overrides as JSON, e.g. {"photos": {"rate": 50, "max_in_flight": 8}}
+    RATE_LIMIT = Field(float, '0')
+    RATE_LIMIT_BURST = Field(_optional_float, '0')
+    MAX_IN_FLIGHT = Field(int, '0')
+    RATE_LIMITS = Field(json.loads, '{}')
+
+    # Request metrics: recording switch and optional file exports written at exit
+    METRICS_ENABLED = Field(_bool, 'true')
+    METRICS_JSON_PATH = Field()
+    METRICS_PROMETHEUS_PATH = Field()
+
+    # Test-run API profile: endpoints/tests listed in the terminal summary and the JSON report path
+    API_PROFILE_TOP = Field(int, '10')
+    API_PROFILE_REPORT = Field(default='.cache/api_profile.json')
+
+    # Connection pool settings shared by every APIClient
+    POOL_CONNECTIONS = Field(int, '10')
+    POOL_MAXSIZE = Field(int, '10')
+    POOL_BLOCK = Field(_bool, 'false')
+    POOL_IDLE_TIMEOUT = Field(float, '60')
+
+    # Maximum number of in-flight requests per AsyncAPIClient
+    ASYNC_MAX_CONCURRENCY = Field(int, '100')
+
+    # Number of bytes read per chunk when streaming collection responses
+    STREAM_CHUNK_SIZE = Field(int, '65536')
+
+    # JSON library used to encode request bodies and decode responses: auto (fastest installed), orjson, msgspec, ujson or json
+    JSON_CODEC = Field(_lower, 'auto')
+
+    # Response compression: auto (every coding the client can decode), identity, or a list such as 'gzip, br'
+    ACCEPT_ENCODING = Field(_lower, 'auto')
+    # POST/PUT bodies of at least this many bytes are sent gzipped; 0 turns request compression off
+    REQUEST_COMPRESSION_MIN_SIZE = Field(int, '0')
+
+    # Opt-in: concurrent identical GETs share one request and one decoded result
+    COALESCE_REQUESTS = Field(_bool, 'false')
+
+    # Opt-in GET response cache shared by API clients.
+    # CACHE_TTLS holds per-endpoint-prefix TTLs in seconds as JSON, e.g. {"users": 300, "posts/1/comments": 5}
+    RESPONSE_CACHE_ENABLED = Field(_bool, 'false')
+    CACHE_MAX_ENTRIES = Field(int, '1024')
+    CACHE_TTL = Field(float, '60')
+    CACHE_TTLS = Field(json.loads, '{}')
+
+    # Persistent response cache shared across runs and workers: off, cache, record or replay
+    DISK_CACHE_MODE = Field(_lower, 'off')
+    DISK_CACHE_PATH = Field(default='.cache/http/responses.sqlite3')
+    DISK_CACHE_MAX_BYTES = Field(int, str(256 * 1024 * 1024))
+    DISK_CACHE_TTL = Field(float, '86400')
+
+    # Maximum number of concurrent lookups per batch fetch
+    BATCH_MAX_WORKERS = Field(int, lambda settings: settings.POOL_MAXSIZE)
+
+    # Records requested per page by the paginated service iterators
+    PAGE_SIZE = Field(int, '100')
+
+    # Logging: 'sync' writes from the calling thread, 'queue' hands records to a background writer.
+    # In queue mode a full queue drops new records ('drop') or makes the caller wait ('block')
+    LOG_MODE = Field(_lower, 'sync')
+    LOG_QUEUE_SIZE = Field(int, '10000')
+    LOG_QUEUE_POLICY = Field(_lower, 'drop')
+    LOG_BATCH_SIZE = Field(int, '512')
+
+    # Log record layout: 'text' lines or 'json' lines
+    LOG_OUTPUT = Field(_lower, 'text')
+    # Share of INFO and DEBUG records kept per logger, as JSON; warnings and errors are always kept.
+    # Keys are logger name prefixes, optionally with a function pattern, e.g. {"src.services:fetch_*": 0.01}
+    LOG_SAMPLING = Field(json.loads, '{}')
+    # Log files are rotated past this size (0 = never) and the LOG_BACKUP_COUNT newest are kept gzipped
+    LOG_MAX_BYTES = Field(int, '0')
+    LOG_BACKUP_COUNT = Field(int, '5')
+
+    # Add additional settings as needed
+    # Example:
+    # API_TOKEN = Field(required=True)
+
+    def __init__(self, env_file=None, profile=None):
+        """
+        Initializes the Settings. Nothing is read until a setting is used.
+
+        Args:
+            env_file (str): The .env file. Defaults to ENV_FILE from the environment, then the project's .env.
+            profile (str): The profile whose .env.<profile> file overrides the .env file. Defaults to ENV.
+        """
+        self._env_file = env_file
+        self._profile = profile
+        self._raw = None
+        self._values = {}
+        self._generation = 0
+        self._overrides = []
+        self._reload_hooks = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fields(cls):
+        """
+        Returns every declared setting.
+
+        Returns:
+            dict: Mapping of setting name to Field.
+        """
+        return {name: value for name, value in vars(cls).items() if isinstance(value, Field)}
+
+    def _load(self):
+        env_file = self._env_file or os.environ.get('ENV_FILE') or ENV_FILE
+        raw = {key: value for key, value in dotenv_values(env_file).items() if value is not None} \
+            if os.path.exists(env_file) else {}
+        profile = self._profile or os.environ.get('ENV') or raw.get('ENV')
+        profile_file = f'{env_file}.{profile}'
+        if profile and os.path.exists(profile_file):
+            raw.update((key, value) for key, value in dotenv_values(profile_file).items() if value is not None)
+        raw.update(os.environ)
+        worker_id = os.environ.get('PYTEST_XDIST_WORKER')
+        if worker_id:
+            suffix = f'__{worker_id.upper()}'
+            raw.update({key[:-len(suffix)]: value for key, value in list(raw.items()) if key.endswith(suffix)})
+        if profile:
+            raw['ENV'] = profile
+        return raw
+
+    @property
+    def profile(self):
+        """
+        str: The active profile (ENV), reading the sources if needed.
+        """
+        return self.ENV
+
+    def get(self, name):
+        """
+        Returns the value of a setting, reading the sources on first use.
+
+        Args:
+            name (str): The setting name, e.g. 'TIMEOUT'.
+
+        Returns:
+            object: The converted value.
+
+        Raises:
+            ValueError: A required setting is not set, or a value cannot be converted.
+        """
+        for overrides in reversed(self._overrides):
+            if name in overrides:
+                return overrides[name]
+        value = self._values.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+        field = type(self).fields()[name]
+        with self._lock:
+            if self._raw is None:
+                self._raw = self._load()
+            raw, generation = self._raw.get(name), self._generation
+        if raw is None:
+            if field.required:
+                raise ValueError(f"{name} environment variable is not set. Please check your .env file.")
+            raw = field.default(self) if callable(field.default) else field.default
+        try:
+            value = field.parse(raw) if isinstance(raw, str) else raw
+        except ValueError as error:
+            raise ValueError(f"Invalid value for {name}: {raw!r} ({error})") from error
+        with self._lock:
+            # A reload since the value was read makes it stale; only cache values of the current sources
+            if self._generation == generation:
+                self._values[name] = value
+        return value
+
+    def reload(self, profile=None):
+        """
+        Reads the sources again on next use, e.g. after editing .env or switching profile.
+
+        Args:
+            profile (str): The profile to switch to. Defaults to the one given at construction, then ENV.
+        """
+        with self._lock:
+            if profile is not None:
+                self._profile = profile
+            self._raw = None
+            self._values = {}
+            self._generation += 1
+        for hook in self._reload_hooks:
+            hook()
+
+    def on_reload(self, hook):
+        """
+        Registers a function called after every ``reload()``, e.g. to drop a process-wide default built from
+        the old values. Usable as a decorator.
+
+        Args:
+            hook (callable): Called with no arguments.
+
+        Returns:
+            callable: ``hook``.
+        """
+        self._reload_hooks.append(hook)
+        return hook
+
+    @contextmanager
+    def override(self, **values):
+        """
+        Replaces settings for the duration of a ``with`` block.
+
+        Args:
+            **values: Setting names and their (already converted) values, e.g. ``TIMEOUT=1.0``.
+        """
+        unknown = set(values) - set(type(self).fields())
+        if unknown:
+            raise AttributeError(f"Unknown settings: {', '.join(sorted(unknown))}")
+        self._overrides.append(values)
+        try:
+            yield self
+        finally:
+            self._overrides.remove(values)
+
+
+# The process-wide settings
+settings = Settings()
+
+
+def __getattr__(name):
+    # Module-level names such as settings.TIMEOUT stay importable; each is read on first access.
+    # Names imported with 'from ... import' are fixed at that point: use the settings object to see reloads.
+    if name in Settings.fields():
+        return settings.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,47 @@
+import argparse
+import json
+
+from src.load.runner import LoadConfig, run_load
+
+
+def main(argv=None):
+    """
+    Command-line entry point: ``python -m src.load``.
+    """
+    parser = argparse.ArgumentParser(description='Load test the API with the service operations as scenarios.')
+    parser.add_argument('--mix', required=True,
+                        help="Operations and weights, e.g. 'fetch_post_by_id=70,create_comment=20,fetch_all_todos=10'.")
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run.')
+    parser.add_argument('--workers', type=int, help='Worker processes; defaults to one per core.')
+    parser.add_argument('--users', type=int, default=10, help='Closed model: concurrent virtual users.')
+    parser.add_argument('--rate', type=float, help='Open model: operations started per second.')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Closed model: pause between operations.')
+    parser.add_argument('--base-url', help='The API under test, or several replicas separated by commas; '
+                                           'defaults to API_BASE_URLS, then API_BASE_URL from settings.')
+    parser.add_argument('--scale', type=float, default=1, help='Record count multiplier, as given to the mock server.')
+    parser.add_argument('--report-interval', type=float, default=1.0)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--log-level', default='WARNING', help='Level of the service loggers in the workers.')
+    parser.add_argument('--output', help='Write the final summary to this JSON file.')
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(args.mix, duration=args.duration, workers=args.workers, users=args.users, rate=args.rate,
+                        think_time=args.think_time, base_url=args.base_url, scale=args.scale,
+                        report_interval=args.report_interval, seed=args.seed, log_level=args.log_level)
+    print(f"{config.model} model, {config.workers} workers, "
+          f"{f'{config.rate} ops/s' if config.rate else f'{config.users} users'} for {config.duration}s "
+          f"against {config.base_url}")
+    summary = run_load(config).summary()
+    print(f"{'operation':<24} {'count':>8} {'errors':>7} {'ops/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for name, stats in [*summary['operations'].items(), ('total', summary['total'])]:
+        print(f"{name:<24} {stats['count']:>8} {stats['errors']:>7} {stats['throughput']:>9.1f} "
+              f"{stats['p50_ms'] or 0:>9.2f} {stats['p90_ms'] or 0:>9.2f} {stats['p99_ms'] or 0:>9.2f}")
+    if summary['dropped']:
+        print(f"{summary['dropped']} arrivals dropped: too many operations in flight")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import time
+
+from src.api.async_client import AsyncAPIClient
+from src.api.metrics import Histogram
+from src.config.settings import settings
+from src.load.scenarios import ScenarioMix, parse_mix
+
+
+class LoadConfig:
+    """
+    Settings of a load run.
+
+    Attributes:
+        mix (str or dict): The scenario mix, e.g. 'fetch_post_by_id=70,create_comment=20,fetch_all_todos=10'.
+        duration (float): Seconds to generate load for.
+        workers (int): Worker processes, each running its own event loop and AsyncAPIClient.
+        users (int): Closed model: concurrent virtual users across all workers, each running one operation at a time.
+        rate (float): Open model: operations started per second across all workers; when set, ``users`` is ignored.
+        think_time (float): Closed model: pause of each user between operations, in seconds.
+        max_outstanding (int): Open model: operations in flight per worker before new arrivals are dropped;
+            defaults to ten times ASYNC_MAX_CONCURRENCY.
+        base_url (str or list): The API under test, or several replicas to balance over (comma-separated or a list);
+            defaults to API_BASE_URLS, then API_BASE_URL from settings.
+        scale (float): Multiplier of the record counts random IDs are drawn from.
+        report_interval (float): Seconds between live reports.
+        seed (int): Seed of the workers' random generators, for repeatable mixes.
+        log_level (str): Level of the service loggers in the workers; per-call INFO logs would dominate the run.
+    """
+
+    def __init__(self, mix, duration=10.0, workers=None, users=10, rate=None, think_time=0.0,
+                 max_outstanding=None, base_url=None, scale=1,
+                 report_interval=1.0, seed=None, log_level='WARNING'):
+        self.mix = mix
+        self.duration = duration
+        self.workers = workers or os.cpu_count() or 1
+        self.users = users
+        self.rate = rate
+        self.think_time = think_time
+        self.max_outstanding = max_outstanding or settings.ASYNC_MAX_CONCURRENCY * 10
+        self.base_url = base_url or settings.API_BASE_URLS or settings.API_BASE_URL
+        self.scale = scale
+        self.report_interval = report_interval
+        self.seed = seed
+        self.log_level = log_level
+
+    @property
+    def model(self):
+        return 'open' if self.rate else 'closed'
+
+
+class OperationStats:
+    """
+    Latency histogram and error count of one operation.
+    """
+
+    __slots__ = ('histogram', 'errors')
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.errors = 0
+
+    def to_dict(self):
+        return {'errors': self.errors, **self.histogram.to_dict()}
+
+    def merge(self, data):
+        self.histogram.merge(data)
+        self.errors += data['errors']
+
+
+class _WorkerStats:
+    """
+    Per-operation stats of a worker since its last report.
+    """
+
+    def __init__(self):
+        self.operations = {}
+        self.dropped = 0
+        self.elapsed = None
+
+    def record(self, name, latency, error):
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        stats.histogram.observe(latency)
+        if error:
+            stats.errors += 1
+
+    def drain(self):
+        snapshot = {'operations': {name: stats.to_dict() for name, stats in self.operations.items()},
+                    'dropped': self.dropped, 'elapsed': self.elapsed}
+        self.operations = {}
+        self.dropped = 0
+        return snapshot
+
+
+async def _run_operation(operation, services, rng, stats, started):
+    try:
+        await operation(services, rng)
+        error = False
+    except Exception:
+        error = True
+    stats.record(operation.name, time.perf_counter() - started, error)
+
+
+async def _closed_model(config, mix, services, stats, users, deadline):
+    async def user():
+        while time.perf_counter() < deadline:
+            await _run_operation(mix.pick(), services, mix.rng, stats, time.perf_counter())
+            if config.think_time:
+                await asyncio.sleep(config.think_time)
+
+    await asyncio.gather(*(user() for _ in range(users)))
+
+
+async def _open_model(config, mix, services, stats, rate, deadline):
+    """
+    Starts operations at a constant rate whether or not earlier ones finished. Latency is measured from
+    the scheduled start, so a slow backend shows up as latency instead of silently lowering the load.
+    """
+    interval = 1.0 / rate
+    in_flight = set()
+    scheduled = time.perf_counter()
+    while scheduled < deadline:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= config.max_outstanding:
+            stats.dropped += 1
+        else:
+            task = asyncio.create_task(_run_operation(mix.pick(), services, mix.rng, stats, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        scheduled += interval
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+async def _report(config, index, stats, reports):
+    while True:
+        await asyncio.sleep(config.report_interval)
+        reports.put(('interval', index, stats.drain()))
+
+
+async def _run_worker(config, index, users, rate, reports):
+    seed = None if config.seed is None else config.seed + index
+    mix = ScenarioMix(parse_mix(config.mix, config.scale), seed=seed)
+    stats = _WorkerStats()
+    max_concurrency = settings.ASYNC_MAX_CONCURRENCY if rate else max(1, users)
+    # Every operation must reach the server, so concurrent identical GETs are not coalesced
+    async with AsyncAPIClient(base_url=config.base_url, max_concurrency=max_concurrency, coalescer=False) as client:
+        services = mix.build_services(client)
+        reporter = asyncio.create_task(_report(config, index, stats, reports))
+        started = time.perf_counter()
+        deadline = started + config.duration
+        try:
+            if rate:
+                await _open_model(config, mix, services, stats, rate, deadline)
+            elif users:
+                await _closed_model(config, mix, services, stats, users, deadline)
+        finally:
+            reporter.cancel()
+            stats.elapsed = time.perf_counter() - started
+    reports.put(('done', index, stats.drain()))
+
+
+def _worker(config, index, users, rate, reports):
+    logging.getLogger('src.services').setLevel(config.log_level)
+    asyncio.run(_run_worker(config, index, users, rate, reports))
+
+
+class LoadReport:
+    """
+    Aggregated results of a load run.
+
+    Attributes:
+        operations (dict): Mapping of operation name to its OperationStats.
+        dropped (int): Open-model arrivals dropped because too many operations were in flight.
+        elapsed (float): Seconds the workers generated load for, excluding process startup.
+    """
+
+    def __init__(self):
+        self.operations = {}
+        self.dropped = 0
+        self.elapsed = 0.0
+
+    def merge(self, snapshot):
+        for name, data in snapshot['operations'].items():
+            self.operations.setdefault(name, OperationStats()).merge(data)
+        self.dropped += snapshot['dropped']
+        if snapshot['elapsed'] is not None:
+            self.elapsed = max(self.elapsed, snapshot['elapsed'])
+
+    def total(self):
+        total = OperationStats()
+        for stats in self.operations.values():
+            total.merge(stats.to_dict())
+        return total
+
+    def summary(self):
+        """
+        Returns the results per operation and overall.
+
+        Returns:
+            dict: ``operations`` and ``total`` with count, errors, throughput and latency percentiles in ms,
+            plus ``dropped`` and ``elapsed``.
+        """
+        def describe(stats):
+            histogram = stats.histogram
+            entry = {'count': histogram.count, 'errors': stats.errors,
+                     'throughput': round(histogram.count / self.elapsed, 1) if self.elapsed else 0.0}
+            for key, value in histogram.summary().items():
+                if key.startswith('p') or key in ('mean', 'max'):
+                    entry[f'{key}_ms'] = round(value * 1000, 2) if value is not None else None
+            return entry
+
+        return {'operations': {name: describe(stats) for name, stats in sorted(self.operations.items())},
+                'total': describe(self.total()), 'dropped': self.dropped, 'elapsed': round(self.elapsed, 2)}
+
+
+def _print_interval(elapsed, window, interval):
+    total = interval.total()
+    histogram = total.histogram
+    if not histogram.count:
+        print(f"[{elapsed:6.1f}s] no operations completed")
+        return
+    print(f"[{elapsed:6.1f}s] {histogram.count / window:8.1f} ops/s  p50 {histogram.percentile(50) * 1000:7.1f} ms  "
+          f"p90 {histogram.percentile(90) * 1000:7.1f} ms  p99 {histogram.percentile(99) * 1000:7.1f} ms  "
+          f"errors {total.errors}  dropped {interval.dropped}")
+
+
+def run_load(config, live=True):
+    """
+    Runs a load test: the users or the arrival rate are split across worker processes, each
+    driving the async services over its own AsyncAPIClient, and the parent merges their reports.
+
+    Args:
+        config (LoadConfig): The run settings.
+        live (bool): Print throughput and latency percentiles every ``report_interval``.
+
+    Returns:
+        LoadReport: The aggregated results.
+    """
+    parse_mix(config.mix, config.scale)
+    context = multiprocessing.get_context('spawn')
+    reports = context.Queue()
+    workers = []
+    for index in range(config.workers):
+        users = config.users // config.workers + (1 if index < config.users % config.workers else 0)
+        rate = config.rate / config.workers if config.rate else None
+        workers.append(context.Process(target=_worker, args=(config, index, users, rate, reports), daemon=True))
+    report = LoadReport()
+    interval = LoadReport()
+    started = last_print = time.perf_counter()
+    for process in workers:
+        process.start()
+    running = len(workers)
+    while running:
+        try:
+            kind, index, snapshot = reports.get(timeout=config.report_interval)
+        except queue.Empty:
+            if not any(process.is_alive() for process in workers):
+                break
+            kind, snapshot = None, None
+        if snapshot is not None:
+            report.merge(snapshot)
+            interval.merge(snapshot)
+        if kind == 'done':
+            running -= 1
+        now = time.perf_counter()
+        if live and now - last_print >= config.report_interval:
+            _print_interval(now - started, now - last_print, interval)
+            interval, last_print = LoadReport(), now
+    for process in workers:
+        process.join()
+    return report
@@ -0,0 +1,141 @@
+import random
+
+from src.mock_server.store import RESOURCE_SIZES
+from src.services.album_service import AsyncAlbumService
+from src.services.comment_service import AsyncCommentService
+from src.services.photo_service import AsyncPhotoService
+from src.services.post_service import AsyncPostService
+from src.services.todo_service import AsyncTodoService
+from src.services.user_service import AsyncUserService
+from src.utils.helpers import load_test_data
+
+# resource: (singular name used in service method names, async service class)
+SERVICES = {
+    'posts': ('post', AsyncPostService),
+    'comments': ('comment', AsyncCommentService),
+    'albums': ('album', AsyncAlbumService),
+    'photos': ('photo', AsyncPhotoService),
+    'todos': ('todo', AsyncTodoService),
+    'users': ('user', AsyncUserService),
+}
+
+# IDs requested at once by the fetch_<resource>s_by_ids operations
+BATCH_SIZE = 10
+
+
+class Operation:
+    """
+    One weighted entry of a scenario mix: a method of an async service plus the arguments to call it with.
+    Arguments come from the resource's test data in src/data, with random record IDs for lookups.
+
+    Attributes:
+        name (str): The service method name, e.g. 'fetch_post_by_id'.
+        resource (str): The resource the method belongs to, e.g. 'posts'.
+        weight (float): The relative share of this operation in the mix.
+    """
+
+    def __init__(self, name, resource, weight, scale=1):
+        self.name = name
+        self.resource = resource
+        self.weight = weight
+        singular = SERVICES[resource][0]
+        # Lookups pick IDs among the JSONPlaceholder record counts, multiplied like the mock server's --scale
+        self._max_id = max(1, int(RESOURCE_SIZES[resource] * scale))
+        data = load_test_data(resource)
+        if name == f'create_{singular}':
+            payload = data[f'create_{singular}'][f'new_{singular}']
+            self._arguments = lambda rng: (payload,)
+        elif name == f'update_{singular}':
+            payload = data[f'update_{singular}'][f'updated_{singular}']
+            self._arguments = lambda rng: (self._random_id(rng), payload)
+        elif name == f'fetch_{singular}s_by_ids':
+            self._arguments = lambda rng: ([self._random_id(rng) for _ in range(BATCH_SIZE)],)
+        elif name.startswith('fetch_all_'):
+            self._arguments = lambda rng: ()
+        else:
+            self._arguments = lambda rng: (self._random_id(rng),)
+
+    def _random_id(self, rng):
+        return rng.randint(1, self._max_id)
+
+    async def __call__(self, services, rng):
+        """
+        Runs the operation once.
+
+        Args:
+            services (dict): Mapping of resource name to its async service instance.
+            rng (random.Random): The worker's random generator.
+        """
+        await getattr(services[self.resource], self.name)(*self._arguments(rng))
+
+
+def available_operations():
+    """
+    Lists the service methods usable in a scenario mix.
+
+    Returns:
+        dict: Mapping of method name to its resource.
+    """
+    operations = {}
+    for resource, (singular, service_class) in SERVICES.items():
+        for name in dir(service_class):
+            if name.startswith(('fetch_', 'create_', 'update_', 'delete_')):
+                operations[name] = resource
+    return operations
+
+
+def parse_mix(spec, scale=1):
+    """
+    Parses a scenario mix such as 'fetch_post_by_id=70,create_comment=20,fetch_all_todos=10'.
+
+    Args:
+        spec (str or dict): The mix as 'name=weight' pairs separated by commas, or a mapping of name to weight.
+        scale (float): Multiplier of the record counts random IDs are drawn from.
+
+    Returns:
+        list: The Operation objects of the mix.
+
+    Raises:
+        ValueError: When an operation is unknown or a weight is not positive.
+    """
+    if isinstance(spec, str):
+        pairs = [item.split('=', 1) for item in spec.split(',') if item.strip()]
+        spec = {name.strip(): float(weight) for name, weight in pairs}
+    operations = available_operations()
+    mix = []
+    for name, weight in spec.items():
+        if name not in operations:
+            raise ValueError(f"Unknown operation '{name}'; choose from {', '.join(sorted(operations))}")
+        if weight <= 0:
+            raise ValueError(f"Weight of '{name}' must be positive")
+        mix.append(Operation(name, operations[name], weight, scale))
+    if not mix:
+        raise ValueError("The scenario mix is empty")
+    return mix
+
+
+class ScenarioMix:
+    """
+    Picks operations at random in proportion to their weights.
+
+    Attributes:
+        operations (list): The Operation objects of the mix.
+    """
+
+    def __init__(self, operations, seed=None):
+        self.operations = operations
+        self.rng = random.Random(seed)
+        self._cumulative = []
+        total = 0.0
+        for operation in operations:
+            total += operation.weight
+            self._cumulative.append(total)
+
+    def pick(self):
+        return self.rng.choices(self.operations, cum_weights=self._cumulative)[0]
+
+    def build_services(self, client):
+        """
+        Creates one async service per resource of the mix, all sharing ``client``.
+        """
+        return {resource: SERVICES[resource][1](client) for resource in {op.resource for op in self.operations}}
@@ -0,0 +1,32 @@
+import argparse
+
+from src.mock_server.app import MockServer, create_app
+from src.mock_server.store import DataStore
+
+
+def main(argv=None):
+    """
+    Command-line entry point: ``python -m src.mock_server``.
+    """
+    parser = argparse.ArgumentParser(description='Serve a local JSONPlaceholder-compatible mock API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--scale', type=float, default=1, help='Multiplier of the JSONPlaceholder record counts.')
+    parser.add_argument('--seed-dir', help="Directory of '<resource>.json' record lists to serve.")
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every request.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency of up to this many seconds.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail.')
+    parser.add_argument('--error-status', type=int, default=500, help='Status code of injected failures.')
+    parser.add_argument('--no-compression', dest='compression', action='store_false',
+                        help='Never gzip responses, even when the client accepts it.')
+    args = parser.parse_args(argv)
+
+    app = create_app(DataStore(scale=args.scale, seed_dir=args.seed_dir), latency=args.latency, jitter=args.jitter,
+                     error_rate=args.error_rate, error_status=args.error_status, compression=args.compression)
+    server = MockServer(app, args.host, args.port)
+    print(f"Mock API serving on {server.base_url} (API_BASE_URL={server.base_url})")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
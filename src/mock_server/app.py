@@ -0,0 +1,274 @@
+import gzip
+import io
+import itertools
+import json
+import random
+import threading
+import time
+import zlib
+
+from flask import Flask, Response, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from src.mock_server.store import DataStore
+
+# Records encoded per chunk when a whole collection is streamed
+STREAM_BATCH = 1000
+
+# Page size when _page is given without _limit, as in json-server
+DEFAULT_PAGE_LIMIT = 10
+
+# Smallest response body gzipped when the client accepts it; smaller bodies gain nothing
+COMPRESS_MIN_SIZE = 1024
+
+
+def _json_response(payload, status=200, headers=None):
+    return Response(json.dumps(payload, separators=(',', ':')), status=status, headers=headers,
+                    mimetype='application/json')
+
+
+def _stream_records(store, ids):
+    """
+    Encodes records in batches so collections of millions of records never sit in memory at once.
+    """
+    yield '['
+    first = True
+    while True:
+        batch = list(itertools.islice(ids, STREAM_BATCH))
+        if not batch:
+            break
+        records = (store.get(record_id) for record_id in batch)
+        chunk = ','.join(json.dumps(record, separators=(',', ':')) for record in records if record is not None)
+        if chunk:
+            yield chunk if first else ',' + chunk
+            first = False
+    yield ']'
+
+
+def _gzip_stream(chunks):
+    """
+    Gzips a streamed response chunk by chunk.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _GunzipRequests:
+    """
+    WSGI middleware decoding request bodies sent with ``Content-Encoding: gzip``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        if environ.get('HTTP_CONTENT_ENCODING', '').lower() == 'gzip':
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+            body = gzip.decompress(environ['wsgi.input'].read(length))
+            environ['wsgi.input'] = io.BytesIO(body)
+            environ['CONTENT_LENGTH'] = str(len(body))
+            del environ['HTTP_CONTENT_ENCODING']
+        return self.app(environ, start_response)
+
+
+def _int_arg(name):
+    value = request.args.get(name)
+    return int(value) if value is not None and value.lstrip('-').isdigit() else None
+
+
+def _list(store, parent_id=None):
+    """
+    Serves a collection with json-server query semantics: field filters, _page/_limit and _start/_end/_limit.
+    Filters on the foreign key use the store's index; other fields are compared on every record.
+    """
+    filters = {name: values for name, values in request.args.lists() if not name.startswith('_')}
+    if store.foreign_key in filters and parent_id is None:
+        values = filters.pop(store.foreign_key)
+        if len(values) != 1 or not values[0].isdigit():
+            return _json_response([])
+        parent_id = int(values[0])
+    ids = store.ids(parent_id)
+    if filters:
+        ids = (record_id for record_id in ids
+               if all(str(store.get(record_id).get(name)).lower() in [value.lower() for value in values]
+                      for name, values in filters.items()))
+
+    page, limit = _int_arg('_page'), _int_arg('_limit')
+    start, end = _int_arg('_start'), _int_arg('_end')
+    if page is None and limit is None and start is None and end is None:
+        return Response(_stream_records(store, iter(ids)), mimetype='application/json')
+
+    if page is not None:
+        limit = limit if limit is not None else DEFAULT_PAGE_LIMIT
+        start, end = (max(page, 1) - 1) * limit, max(page, 1) * limit
+    else:
+        start = start or 0
+        end = end if end is not None else (start + limit if limit is not None else None)
+    ids = list(ids) if filters or parent_id is not None else None
+    total = len(ids) if ids is not None else len(store)
+    selected = itertools.islice(ids, start, end) if ids is not None else store.page_ids(start, end)
+    records = [store.get(record_id) for record_id in selected]
+    headers = {'X-Total-Count': str(total), 'Access-Control-Expose-Headers': 'X-Total-Count, Link'}
+    if page is not None:
+        last = max(1, -(-total // limit)) if limit else 1
+        links = [f'<{request.base_url}?_page=1&_limit={limit}>; rel="first"']
+        if page > 1:
+            links.append(f'<{request.base_url}?_page={page - 1}&_limit={limit}>; rel="prev"')
+        if page < last:
+            links.append(f'<{request.base_url}?_page={page + 1}&_limit={limit}>; rel="next"')
+        links.append(f'<{request.base_url}?_page={last}&_limit={limit}>; rel="last"')
+        headers['Link'] = ', '.join(links)
+    return _json_response([record for record in records if record is not None], headers=headers)
+
+
+def create_app(store=None, latency=0.0, jitter=0.0, error_rate=0.0, error_status=500, compression=True):
+    """
+    Builds the mock JSONPlaceholder API.
+
+    Args:
+        store (DataStore): The records to serve. Defaults to a DataStore of JSONPlaceholder size.
+        latency (float): Seconds added to every request.
+        jitter (float): Extra random latency of up to this many seconds.
+        error_rate (float): Fraction of requests answered with ``error_status``.
+        error_status (int): The status code of injected errors.
+        compression (bool): Gzip responses for clients that accept it, and accept gzipped request bodies.
+
+    Returns:
+        flask.Flask: The application. Faults can be changed at runtime with PUT /__admin/faults.
+    """
+    app = Flask(__name__)
+    app.config['STORE'] = store if store is not None else DataStore()
+    app.config['FAULTS'] = {'latency': latency, 'jitter': jitter, 'error_rate': error_rate,
+                            'error_status': error_status}
+
+    if compression:
+        app.wsgi_app = _GunzipRequests(app.wsgi_app)
+
+        @app.after_request
+        def compress(response):
+            if 'gzip' not in request.accept_encodings or 'Content-Encoding' in response.headers:
+                return response
+            if response.is_streamed:
+                response.response = _gzip_stream(response.response)
+                response.headers.pop('Content-Length', None)
+            elif response.content_length is not None and response.content_length >= COMPRESS_MIN_SIZE:
+                response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+            else:
+                return response
+            response.headers['Content-Encoding'] = 'gzip'
+            response.vary.add('Accept-Encoding')
+            return response
+
+    def resource_store(resource):
+        return app.config['STORE'].resources.get(resource)
+
+    @app.before_request
+    def inject_faults():
+        if request.path.startswith('/__admin'):
+            return None
+        faults = app.config['FAULTS']
+        delay = faults['latency'] + (random.uniform(0, faults['jitter']) if faults['jitter'] else 0)
+        if delay:
+            time.sleep(delay)
+        if faults['error_rate'] and random.random() < faults['error_rate']:
+            return _json_response({'error': 'injected fault'}, faults['error_status'])
+        return None
+
+    @app.route('/__admin/faults', methods=['GET', 'PUT'])
+    def faults():
+        if request.method == 'PUT':
+            updates = request.get_json(force=True) or {}
+            app.config['FAULTS'].update({key: value for key, value in updates.items()
+                                         if key in app.config['FAULTS']})
+        return _json_response(app.config['FAULTS'])
+
+    @app.route('/<resource>', methods=['GET', 'POST'])
+    def collection(resource):
+        store = resource_store(resource)
+        if store is None:
+            return _json_response({}, 404)
+        if request.method == 'POST':
+            return _json_response(store.create(request.get_json(force=True, silent=True) or {}), 201)
+        return _list(store)
+
+    @app.route('/<resource>/<int:record_id>', methods=['GET', 'PUT', 'PATCH', 'DELETE'])
+    def item(resource, record_id):
+        store = resource_store(resource)
+        if store is None:
+            return _json_response({}, 404)
+        if request.method == 'GET':
+            record = store.get(record_id)
+        elif request.method == 'PUT':
+            record = store.replace(record_id, request.get_json(force=True, silent=True) or {})
+        elif request.method == 'PATCH':
+            record = store.update(record_id, request.get_json(force=True, silent=True) or {})
+        else:
+            record = {} if store.delete(record_id) else None
+        if record is None:
+            return _json_response({}, 404)
+        return _json_response(record)
+
+    @app.route('/<parent>/<int:parent_id>/<resource>', methods=['GET'])
+    def nested(parent, parent_id, resource):
+        store = resource_store(resource)
+        parent_store = resource_store(parent)
+        if store is None or parent_store is None or store.parent != parent or parent_store.get(parent_id) is None:
+            return _json_response({}, 404)
+        return _list(store, parent_id)
+
+    return app
+
+
+class _RequestHandler(WSGIRequestHandler):
+    # Headers and body go out in separate writes; without TCP_NODELAY delayed ACKs stall each response
+    disable_nagle_algorithm = True
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class MockServer:
+    """
+    Runs the mock API on a background thread with the werkzeug server, e.g. from a test fixture.
+    werkzeug closes the connection after every response; serve ``create_app()`` with a
+    production WSGI server when keep-alive matters.
+
+    Attributes:
+        app (flask.Flask): The application being served.
+        base_url (str): The base URL to point API_BASE_URL or an APIClient at.
+    """
+
+    def __init__(self, app=None, host='127.0.0.1', port=0):
+        self.app = app if app is not None else create_app()
+        self._server = make_server(host, port, self.app, threaded=True, request_handler=_RequestHandler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.base_url = f"http://{host}:{self._server.server_port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """
+        Serves on the calling thread until interrupted.
+        """
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,330 @@
+import bisect
+import json
+import os
+import threading
+
+# Record counts of the public JSONPlaceholder API; ``scale`` multiplies them. The stub server, the load
+# scenarios and the benchmarks use these sizes and the record factories below as well
+RESOURCE_SIZES = {
+    'posts': 100,
+    'comments': 500,
+    'albums': 100,
+    'photos': 5000,
+    'todos': 200,
+    'users': 10,
+}
+
+
+def _post(i, user_id):
+    return {'userId': user_id, 'id': i, 'title': f'post {i}', 'body': f'body of post {i}'}
+
+
+def _comment(i, post_id):
+    return {'postId': post_id, 'id': i, 'name': f'comment {i}', 'email': f'user{i}@example.com',
+            'body': f'body of comment {i}'}
+
+
+def _album(i, user_id):
+    return {'userId': user_id, 'id': i, 'title': f'album {i}'}
+
+
+def _photo(i, album_id):
+    return {'albumId': album_id, 'id': i, 'title': f'photo {i}', 'url': f'https://via.placeholder.com/600/{i:06x}',
+            'thumbnailUrl': f'https://via.placeholder.com/150/{i:06x}'}
+
+
+def _todo(i, user_id):
+    return {'userId': user_id, 'id': i, 'title': f'todo {i}', 'completed': i % 2 == 0}
+
+
+def _user(i, parent_id):
+    return {'id': i, 'name': f'User {i}', 'username': f'user{i}', 'email': f'user{i}@example.com',
+            'address': {'street': f'{i} Main Street', 'suite': f'Apt. {i}', 'city': f'City {i}',
+                        'zipcode': f'{i % 100000:05d}',
+                        'geo': {'lat': f'{i * 7 % 180 - 90:.4f}', 'lng': f'{i * 13 % 360 - 180:.4f}'}},
+            'phone': f'1-770-736-{i % 10000:04d}', 'website': f'user{i}.example.com',
+            'company': {'name': f'Company {i}', 'catchPhrase': f'catch phrase {i}', 'bs': f'business {i}'}}
+
+
+# resource: (parent resource, foreign key field, children per parent, record factory)
+SCHEMA = {
+    'posts': ('users', 'userId', 10, _post),
+    'comments': ('posts', 'postId', 5, _comment),
+    'albums': ('users', 'userId', 10, _album),
+    'photos': ('albums', 'albumId', 50, _photo),
+    'todos': ('users', 'userId', 20, _todo),
+    'users': (None, None, None, _user),
+}
+
+
+def generate_record(name, record_id):
+    """
+    Builds a generated record, the same one every store and stub serves for that id.
+
+    Args:
+        name (str): The resource name; must be a key of SCHEMA.
+        record_id (int): The record id, from 1.
+
+    Returns:
+        dict: The JSONPlaceholder-shaped record.
+    """
+    parent, foreign_key, per_parent, factory = SCHEMA[name]
+    return factory(record_id, (record_id - 1) // per_parent + 1 if per_parent else None)
+
+
+def build_dataset(sizes=None):
+    """
+    Generates JSONPlaceholder-shaped records for every resource.
+
+    Args:
+        sizes (dict): Optional overrides of the number of records per resource.
+
+    Returns:
+        dict: Mapping of resource name to a list of records.
+    """
+    sizes = {**RESOURCE_SIZES, **(sizes or {})}
+    return {name: [generate_record(name, record_id) for record_id in range(1, sizes[name] + 1)] for name in SCHEMA}
+
+
+class ResourceStore:
+    """
+    Records of one resource. Generated records are computed from their id on demand, so a
+    store of millions of records costs no memory until records are written; seeded, created
+    and updated records are kept in an overlay with a foreign-key index. Sorted indexes of the
+    deleted generated ids and of the ids beyond the generated range let a page be located by
+    position without walking the records before it.
+
+    Attributes:
+        name (str): The resource name, e.g. 'photos'.
+        foreign_key (str): The field referencing the parent resource, e.g. 'albumId', or None.
+        generated (int): Number of generated records, with ids 1..generated.
+    """
+
+    def __init__(self, name, generated, seed=None):
+        """
+        Initializes the ResourceStore.
+
+        Args:
+            name (str): The resource name; must be a key of SCHEMA.
+            generated (int): Number of records to generate.
+            seed (list): Optional records that replace or extend the generated ones.
+        """
+        self.name = name
+        self.parent, self.foreign_key, self._per_parent, _ = SCHEMA[name]
+        self.generated = generated
+        self._overlay = {}
+        self._deleted = set()
+        self._deleted_ids = []
+        self._extra_ids = []
+        self._children = {}
+        self._lock = threading.Lock()
+        self._next_id = generated + 1
+        for record in seed or []:
+            self._put(record['id'], record)
+
+    def _put(self, record_id, record):
+        previous = self._overlay.get(record_id)
+        if previous is not None and self.foreign_key:
+            self._children.get(previous.get(self.foreign_key), set()).discard(record_id)
+        if previous is None and record_id > self.generated:
+            bisect.insort(self._extra_ids, record_id)
+        self._overlay[record_id] = record
+        if record_id in self._deleted:
+            self._deleted.discard(record_id)
+            self._deleted_ids.remove(record_id)
+        if self.foreign_key and record.get(self.foreign_key) is not None:
+            self._children.setdefault(record[self.foreign_key], set()).add(record_id)
+        self._next_id = max(self._next_id, record_id + 1)
+
+    def __len__(self):
+        with self._lock:
+            return self.generated + len(self._extra_ids) - len(self._deleted)
+
+    def get(self, record_id):
+        """
+        Looks up a record by id.
+
+        Returns:
+            dict: The record, or None when it does not exist.
+        """
+        with self._lock:
+            if record_id in self._deleted:
+                return None
+            record = self._overlay.get(record_id)
+        if record is not None:
+            return record
+        if 1 <= record_id <= self.generated:
+            return generate_record(self.name, record_id)
+        return None
+
+    def ids(self, parent_id=None):
+        """
+        Iterates over the ids of live records in ascending order, optionally only the children of one parent.
+
+        Args:
+            parent_id (int): Only yield records whose foreign key equals this id.
+
+        Yields:
+            int: Record ids.
+        """
+        with self._lock:
+            deleted = set(self._deleted)
+            extra = list(self._extra_ids)
+            if parent_id is not None:
+                overlay_id_set = set(self._overlay)
+                overlay_children = set(self._children.get(parent_id, ()))
+        if parent_id is None:
+            candidates = range(1, self.generated + 1)
+        else:
+            if not self.foreign_key:
+                return
+            start = (parent_id - 1) * self._per_parent + 1
+            generated = range(max(1, start), min(self.generated, start + self._per_parent - 1) + 1)
+            # Updated records may have moved to another parent, so the overlay index is authoritative for them
+            candidates = sorted({record_id for record_id in generated if record_id not in overlay_id_set}
+                                | overlay_children)
+            extra = []
+        for record_id in candidates:
+            if record_id not in deleted:
+                yield record_id
+        for record_id in extra:
+            if record_id not in deleted:
+                yield record_id
+
+    def _nth_generated(self, position):
+        # The live generated id at a 0-based position: the smallest id with position + 1 live ids up to it
+        low, high = position + 1, position + 1 + len(self._deleted_ids)
+        while low < high:
+            middle = (low + high) // 2
+            if middle - bisect.bisect_right(self._deleted_ids, middle) >= position + 1:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def page_ids(self, start, end=None):
+        """
+        Returns the ids of the live records at positions ``start`` to ``end`` in ascending id order, as
+        ``list(self.ids())[start:end]`` would, locating the first one by position instead of walking to it.
+
+        Args:
+            start (int): The first position, from 0.
+            end (int): The position after the last one, or None for the rest of the collection.
+
+        Returns:
+            list: Record ids.
+        """
+        start = max(0, start)
+        with self._lock:
+            live_generated = self.generated - len(self._deleted)
+            end = live_generated + len(self._extra_ids) if end is None else end
+            ids = []
+            if start < live_generated:
+                record_id = self._nth_generated(start)
+                while len(ids) < min(end, live_generated) - start:
+                    if record_id not in self._deleted:
+                        ids.append(record_id)
+                    record_id += 1
+            ids.extend(self._extra_ids[max(0, start - live_generated):max(0, end - live_generated)])
+            return ids
+
+    def create(self, payload):
+        """
+        Stores a new record with the next free id.
+
+        Returns:
+            dict: The created record.
+        """
+        with self._lock:
+            record = {**payload, 'id': self._next_id}
+            self._put(record['id'], record)
+            return record
+
+    def replace(self, record_id, payload):
+        """
+        Replaces an existing record (PUT).
+
+        Returns:
+            dict: The stored record, or None when it does not exist.
+        """
+        if self.get(record_id) is None:
+            return None
+        with self._lock:
+            record = {**payload, 'id': record_id}
+            self._put(record_id, record)
+            return record
+
+    def update(self, record_id, payload):
+        """
+        Merges fields into an existing record (PATCH).
+
+        Returns:
+            dict: The stored record, or None when it does not exist.
+        """
+        current = self.get(record_id)
+        if current is None:
+            return None
+        with self._lock:
+            record = {**current, **payload, 'id': record_id}
+            self._put(record_id, record)
+            return record
+
+    def delete(self, record_id):
+        """
+        Deletes a record.
+
+        Returns:
+            bool: True when the record existed.
+        """
+        if self.get(record_id) is None:
+            return False
+        with self._lock:
+            record = self._overlay.pop(record_id, None)
+            if record is not None and self.foreign_key:
+                self._children.get(record.get(self.foreign_key), set()).discard(record_id)
+            # Records beyond the generated range live only in the overlay, so dropping their index entry is enough
+            if record_id <= self.generated:
+                self._deleted.add(record_id)
+                bisect.insort(self._deleted_ids, record_id)
+            else:
+                self._extra_ids.remove(record_id)
+            return True
+
+
+class DataStore:
+    """
+    The six JSONPlaceholder resources.
+
+    Attributes:
+        resources (dict): Mapping of resource name to its ResourceStore.
+    """
+
+    def __init__(self, scale=1, sizes=None, seed_dir=None):
+        """
+        Initializes the DataStore.
+
+        Args:
+            scale (float): Multiplier applied to RESOURCE_SIZES, e.g. 1000 for five million photos.
+            sizes (dict): Explicit record counts per resource, overriding the scaled sizes.
+            seed_dir (str): Optional directory of '<resource>.json' files holding lists of records to serve.
+        """
+        counts = {name: int(size * scale) for name, size in RESOURCE_SIZES.items()}
+        counts.update(sizes or {})
+        self.resources = {name: ResourceStore(name, counts[name], self._load_seed(seed_dir, name))
+                          for name in SCHEMA}
+
+    @staticmethod
+    def _load_seed(seed_dir, name):
+        if not seed_dir:
+            return None
+        path = os.path.join(seed_dir, f'{name}.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def __getitem__(self, name):
+        return self.resources[name]
+
+    def __contains__(self, name):
+        return name in self.resources
@@ -0,0 +1,317 @@
+from operator import itemgetter
+
+
+class Model:
+    """
+    Base class of the resource models. Subclasses declare their attributes in ``__slots__`` and
+    the matching JSON keys in ``_keys``, in the same order as their ``__init__`` arguments,
+    so instances carry no per-object dict.
+
+    Nested objects listed in ``_nested`` (attribute name to model class) are converted as well.
+    """
+
+    __slots__ = ()
+    _keys = ()
+    _nested = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(zip(cls.__slots__, cls._keys))
+        # Pulls every field out of a complete JSON object in one C-level call
+        cls._getter = itemgetter(*cls._keys)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a model from a decoded JSON object. Missing keys become None.
+
+        Args:
+            data (dict): The JSON object.
+
+        Returns:
+            Model: The model instance.
+        """
+        instance = cls.__new__(cls)
+        for attribute, key in cls._fields:
+            value = data.get(key)
+            nested = cls._nested.get(attribute)
+            if nested is not None and value is not None:
+                value = nested.from_dict(value)
+            setattr(instance, attribute, value)
+        return instance
+
+    @classmethod
+    def from_list(cls, items):
+        """
+        Builds models from a decoded JSON array. Complete objects take a fast path that reads every key
+        at once; objects with missing keys fall back to ``from_dict``.
+
+        Args:
+            items (list): The JSON objects.
+
+        Returns:
+            list: The model instances.
+        """
+        if cls._nested:
+            return [cls.from_dict(item) for item in items]
+        getter = cls._getter
+        models = []
+        append = models.append
+        for item in items:
+            try:
+                append(cls(*getter(item)))
+            except KeyError:
+                append(cls.from_dict(item))
+        return models
+
+    def to_dict(self):
+        """
+        Converts the model back to its JSON object, omitting unset fields.
+
+        Returns:
+            dict: The JSON object with the API's camelCase keys.
+        """
+        data = {}
+        for attribute, key in self._fields:
+            value = getattr(self, attribute)
+            if value is not None:
+                data[key] = value.to_dict() if isinstance(value, Model) else value
+        return data
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute) for attribute in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f'{attribute}={getattr(self, attribute)!r}' for attribute in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class Post(Model):
+    """
+    A post.
+
+    Attributes:
+        user_id (int): The author's user ID.
+        id (int): The post ID.
+        title (str): The title.
+        body (str): The text.
+    """
+
+    __slots__ = ('user_id', 'id', 'title', 'body')
+    _keys = ('userId', 'id', 'title', 'body')
+
+    def __init__(self, user_id=None, id=None, title=None, body=None):
+        self.user_id = user_id
+        self.id = id
+        self.title = title
+        self.body = body
+
+
+class Comment(Model):
+    """
+    A comment on a post.
+
+    Attributes:
+        post_id (int): The post commented on.
+        id (int): The comment ID.
+        name (str): The subject line.
+        email (str): The commenter's email address.
+        body (str): The text.
+    """
+
+    __slots__ = ('post_id', 'id', 'name', 'email', 'body')
+    _keys = ('postId', 'id', 'name', 'email', 'body')
+
+    def __init__(self, post_id=None, id=None, name=None, email=None, body=None):
+        self.post_id = post_id
+        self.id = id
+        self.name = name
+        self.email = email
+        self.body = body
+
+
+class Album(Model):
+    """
+    A photo album.
+
+    Attributes:
+        user_id (int): The owner's user ID.
+        id (int): The album ID.
+        title (str): The title.
+    """
+
+    __slots__ = ('user_id', 'id', 'title')
+    _keys = ('userId', 'id', 'title')
+
+    def __init__(self, user_id=None, id=None, title=None):
+        self.user_id = user_id
+        self.id = id
+        self.title = title
+
+
+class Photo(Model):
+    """
+    A photo in an album.
+
+    Attributes:
+        album_id (int): The album the photo belongs to.
+        id (int): The photo ID.
+        title (str): The title.
+        url (str): The full-size image URL.
+        thumbnail_url (str): The thumbnail URL.
+    """
+
+    __slots__ = ('album_id', 'id', 'title', 'url', 'thumbnail_url')
+    _keys = ('albumId', 'id', 'title', 'url', 'thumbnailUrl')
+
+    def __init__(self, album_id=None, id=None, title=None, url=None, thumbnail_url=None):
+        self.album_id = album_id
+        self.id = id
+        self.title = title
+        self.url = url
+        self.thumbnail_url = thumbnail_url
+
+
+class Todo(Model):
+    """
+    A todo item.
+
+    Attributes:
+        user_id (int): The owner's user ID.
+        id (int): The todo ID.
+        title (str): The title.
+        completed (bool): Whether the todo is done.
+    """
+
+    __slots__ = ('user_id', 'id', 'title', 'completed')
+    _keys = ('userId', 'id', 'title', 'completed')
+
+    def __init__(self, user_id=None, id=None, title=None, completed=None):
+        self.user_id = user_id
+        self.id = id
+        self.title = title
+        self.completed = completed
+
+
+class Geo(Model):
+    """
+    Coordinates of an address.
+
+    Attributes:
+        lat (str): The latitude.
+        lng (str): The longitude.
+    """
+
+    __slots__ = ('lat', 'lng')
+    _keys = ('lat', 'lng')
+
+    def __init__(self, lat=None, lng=None):
+        self.lat = lat
+        self.lng = lng
+
+
+class Address(Model):
+    """
+    A user's address.
+
+    Attributes:
+        street (str): The street.
+        suite (str): The suite or apartment.
+        city (str): The city.
+        zipcode (str): The postal code.
+        geo (Geo): The coordinates.
+    """
+
+    __slots__ = ('street', 'suite', 'city', 'zipcode', 'geo')
+    _keys = ('street', 'suite', 'city', 'zipcode', 'geo')
+    _nested = {'geo': Geo}
+
+    def __init__(self, street=None, suite=None, city=None, zipcode=None, geo=None):
+        self.street = street
+        self.suite = suite
+        self.city = city
+        self.zipcode = zipcode
+        self.geo = geo
+
+
+class Company(Model):
+    """
+    A user's employer.
+
+    Attributes:
+        name (str): The company name.
+        catch_phrase (str): The slogan.
+        bs (str): The business description.
+    """
+
+    __slots__ = ('name', 'catch_phrase', 'bs')
+    _keys = ('name', 'catchPhrase', 'bs')
+
+    def __init__(self, name=None, catch_phrase=None, bs=None):
+        self.name = name
+        self.catch_phrase = catch_phrase
+        self.bs = bs
+
+
+class User(Model):
+    """
+    A user.
+
+    Attributes:
+        id (int): The user ID.
+        name (str): The full name.
+        username (str): The login name.
+        email (str): The email address.
+        address (Address): The postal address.
+        phone (str): The phone number.
+        website (str): The website.
+        company (Company): The employer.
+    """
+
+    __slots__ = ('id', 'name', 'username', 'email', 'address', 'phone', 'website', 'company')
+    _keys = ('id', 'name', 'username', 'email', 'address', 'phone', 'website', 'company')
+    _nested = {'address': Address, 'company': Company}
+
+    def __init__(self, id=None, name=None, username=None, email=None, address=None, phone=None, website=None,
+                 company=None):
+        self.id = id
+        self.name = name
+        self.username = username
+        self.email = email
+        self.address = address
+        self.phone = phone
+        self.website = website
+        self.company = company
+
+
+def decode(model, data):
+    """
+    Converts decoded JSON into models: an object into one model, an array into a list of models.
+    The decoded dicts are still alive while the models are built, so peak memory includes both; stream the
+    array instead when that peak matters.
+
+    Args:
+        model (type): The Model subclass to build.
+        data (dict or list): The decoded JSON.
+
+    Returns:
+        Model or list: The model instance or instances.
+    """
+    if isinstance(data, list):
+        return model.from_list(data)
+    return model.from_dict(data)
+
+
+def encode(data):
+    """
+    Converts a model into its JSON object for a request body; other payloads pass through unchanged.
+
+    Args:
+        data (Model or dict): The payload.
+
+    Returns:
+        dict: The JSON object.
+    """
+    return data.to_dict() if isinstance(data, Model) else data
@@ -1,5 +1,10 @@
+from src.api.async_client import AsyncAPIClient
 from src.api.clients import APIClient
+from src.api.pagination import AsyncLazyCollection, LazyCollection
 from src.config.logging_config import configure_logging, get_logger
+from src.models.resources import Album, Photo, decode, encode
+from src.utils.helpers import (fetch_many, fetch_many_async, iter_pages, iter_pages_async, logged_page_fetch,
+                               logged_page_fetch_async)
 
 # Configure logging with a unique log file for this service
 configure_logging()
@@ -10,26 +15,101 @@ class AlbumService:
     """
     Service class for Albums API.
     Provides high-level operations using the APIClient.
+    With ``models=True`` records are returned as Album models instead of dicts.
     """
 
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else APIClient()
+        self.models = models
 
-    def fetch_all_albums(self):
+    def _decode(self, model, data):
         """
-        Fetch all albums.
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
 
-        :return: List of albums
-        :rtype: list
+    def fetch_all_albums(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all albums, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'userId': 1}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return a LazyCollection that fetches ``page_size`` albums at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of albums per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of albums, or a LazyCollection when ``lazy`` is set
+        :rtype: list or LazyCollection
         """
+        if lazy:
+            fetch_page = logged_page_fetch(lambda page: self.client.get_page('albums', page),
+                                           lambda items: self._decode(Album, items), 'albums', logger)
+            return LazyCollection(fetch_page, page_size, params)
         try:
-            response = self.client.get('albums')
+            response = self._decode(Album, self.client.get('albums', params=params))
             logger.info("Fetched all albums successfully.")
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch all albums: {e}")
+            logger.error("Failed to fetch all albums: %s", e)
             raise Exception(f"Failed to fetch all albums: {e}")
 
+    def iter_all_albums(self, params=None):
+        """
+        Stream all albums one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_albums``
+        :type params: dict
+        :return: Iterator over albums
+        :rtype: iterator
+        """
+        try:
+            for item in self.client.stream('albums', params=params):
+                yield self._decode(Album, item)
+            logger.info("Streamed all albums successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all albums: %s", e)
+            raise Exception(f"Failed to stream all albums: {e}")
+
+    def iter_album_pages(self, page_size=None, params=None):
+        """
+        Fetch albums one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of albums per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Iterator over pages of albums
+        :rtype: iterator
+        """
+        try:
+            yield from iter_pages(lambda page: self.client.get('albums', params={**(params or {}), **page}), page_size,
+                                  lambda items: self._decode(Album, items))
+            logger.info("Fetched all pages of albums successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of albums: %s", e)
+            raise Exception(f"Failed to fetch pages of albums: {e}")
+
+    def fetch_album_photos(self, album_id, params=None):
+        """
+        Fetch the photos of a album through the nested ``albums/<id>/photos`` route.
+
+        :param album_id: ID of the album
+        :type album_id: int
+        :param params: Query parameters, as for ``fetch_all_albums``
+        :type params: dict
+        :return: List of photos
+        :rtype: list
+        """
+        try:
+            response = self._decode(Photo, self.client.get(f'albums/{album_id}/photos', params=params))
+            logger.info("Fetched photos of album %s successfully.", album_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch photos of album %s: %s", album_id, e)
+            raise Exception(f"Failed to fetch photos of album {album_id}: {e}")
+
     def fetch_album_by_id(self, album_id):
         """
         Fetch a single album by ID.
@@ -40,28 +120,43 @@ class AlbumService:
         :rtype: dict
         """
         try:
-            response = self.client.get(f'albums/{album_id}')
-            logger.info(f"Fetched album by ID {album_id} successfully.")
+            response = self._decode(Album, self.client.get(f'albums/{album_id}'))
+            logger.info("Fetched album by ID %s successfully.", album_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch album by ID {album_id}: {e}")
+            logger.error("Failed to fetch album by ID %s: %s", album_id, e)
             raise Exception(f"Failed to fetch album by ID {album_id}: {e}")
 
+    def fetch_albums_by_ids(self, album_ids, max_workers=None):
+        """
+        Fetch several albums by ID concurrently.
+
+        :param album_ids: IDs of the albums; repeated IDs are fetched once
+        :type album_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Album data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = fetch_many(self.fetch_album_by_id, album_ids, max_workers)
+        logger.info("Fetched %s albums by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
     def create_album(self, new_album):
         """
         Create a new album.
 
         :param new_album: Data for the new album
-        :type new_album: dict
+        :type new_album: dict or Album
         :return: Created album data
         :rtype: dict
         """
         try:
-            response = self.client.post('albums', new_album)
-            logger.info(f"Created new album successfully: {new_album}")
+            response = self._decode(Album, self.client.post('albums', encode(new_album)))
+            logger.info("Created new album successfully: %s", new_album)
             return response
         except Exception as e:
-            logger.error(f"Failed to create album: {e}")
+            logger.error("Failed to create album: %s", e)
             raise Exception(f"Failed to create album: {e}")
 
     def update_album(self, album_id, updated_album):
@@ -71,16 +166,16 @@ class AlbumService:
         :param album_id: ID of the album to update
         :type album_id: int
         :param updated_album: Updated data for the album
-        :type updated_album: dict
+        :type updated_album: dict or Album
         :return: Updated album data
         :rtype: dict
         """
         try:
-            response = self.client.put(f'albums/{album_id}', updated_album)
-            logger.info(f"Updated album with ID {album_id} successfully: {updated_album}")
+            response = self._decode(Album, self.client.put(f'albums/{album_id}', encode(updated_album)))
+            logger.info("Updated album with ID %s successfully: %s", album_id, updated_album)
             return response
         except Exception as e:
-            logger.error(f"Failed to update album with ID {album_id}: {e}")
+            logger.error("Failed to update album with ID %s: %s", album_id, e)
             raise Exception(f"Failed to update album with ID {album_id}: {e}")
 
     def delete_album(self, album_id):
@@ -94,8 +189,200 @@ class AlbumService:
         """
         try:
             response = self.client.delete(f'albums/{album_id}')
-            logger.info(f"Deleted album with ID {album_id} successfully.")
+            logger.info("Deleted album with ID %s successfully.", album_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete album with ID %s: %s", album_id, e)
+            raise Exception(f"Failed to delete album with ID {album_id}: {e}")
+
+
+class AsyncAlbumService:
+    """
+    Async service class for Albums API.
+    Provides the same operations as AlbumService using the AsyncAPIClient.
+    With ``models=True`` records are returned as Album models instead of dicts.
+    """
+
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else AsyncAPIClient()
+        self.models = models
+
+    def _decode(self, model, data):
+        """
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    async def fetch_all_albums(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all albums, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'userId': 1}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return an AsyncLazyCollection that fetches ``page_size`` albums at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of albums per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of albums, or an AsyncLazyCollection when ``lazy`` is set
+        :rtype: list or AsyncLazyCollection
+        """
+        if lazy:
+            fetch_page = logged_page_fetch_async(lambda page: self.client.get_page('albums', page),
+                                                 lambda items: self._decode(Album, items), 'albums', logger)
+            return AsyncLazyCollection(fetch_page, page_size, params)
+        try:
+            response = self._decode(Album, await self.client.get('albums', params=params))
+            logger.info("Fetched all albums successfully.")
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch all albums: %s", e)
+            raise Exception(f"Failed to fetch all albums: {e}")
+
+    async def iter_all_albums(self, params=None):
+        """
+        Stream all albums one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_albums``
+        :type params: dict
+        :return: Async iterator over albums
+        :rtype: async iterator
+        """
+        try:
+            async for item in self.client.stream('albums', params=params):
+                yield self._decode(Album, item)
+            logger.info("Streamed all albums successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all albums: %s", e)
+            raise Exception(f"Failed to stream all albums: {e}")
+
+    async def iter_album_pages(self, page_size=None, params=None):
+        """
+        Fetch albums one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of albums per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Async iterator over pages of albums
+        :rtype: async iterator
+        """
+        try:
+            async for page in iter_pages_async(lambda page: self.client.get('albums', params={**(params or {}), **page}),
+                                         page_size, lambda items: self._decode(Album, items)):
+                yield page
+            logger.info("Fetched all pages of albums successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of albums: %s", e)
+            raise Exception(f"Failed to fetch pages of albums: {e}")
+
+    async def fetch_album_photos(self, album_id, params=None):
+        """
+        Fetch the photos of a album through the nested ``albums/<id>/photos`` route.
+
+        :param album_id: ID of the album
+        :type album_id: int
+        :param params: Query parameters, as for ``fetch_all_albums``
+        :type params: dict
+        :return: List of photos
+        :rtype: list
+        """
+        try:
+            response = self._decode(Photo, await self.client.get(f'albums/{album_id}/photos', params=params))
+            logger.info("Fetched photos of album %s successfully.", album_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch photos of album %s: %s", album_id, e)
+            raise Exception(f"Failed to fetch photos of album {album_id}: {e}")
+
+    async def fetch_album_by_id(self, album_id):
+        """
+        Fetch a single album by ID.
+
+        :param album_id: ID of the album
+        :type album_id: int
+        :return: Album data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Album, await self.client.get(f'albums/{album_id}'))
+            logger.info("Fetched album by ID %s successfully.", album_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch album by ID %s: %s", album_id, e)
+            raise Exception(f"Failed to fetch album by ID {album_id}: {e}")
+
+    async def fetch_albums_by_ids(self, album_ids, max_workers=None):
+        """
+        Fetch several albums by ID concurrently.
+
+        :param album_ids: IDs of the albums; repeated IDs are fetched once
+        :type album_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Album data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = await fetch_many_async(self.fetch_album_by_id, album_ids, max_workers)
+        logger.info("Fetched %s albums by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
+    async def create_album(self, new_album):
+        """
+        Create a new album.
+
+        :param new_album: Data for the new album
+        :type new_album: dict or Album
+        :return: Created album data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Album, await self.client.post('albums', encode(new_album)))
+            logger.info("Created new album successfully: %s", new_album)
+            return response
+        except Exception as e:
+            logger.error("Failed to create album: %s", e)
+            raise Exception(f"Failed to create album: {e}")
+
+    async def update_album(self, album_id, updated_album):
+        """
+        Update an existing album.
+
+        :param album_id: ID of the album to update
+        :type album_id: int
+        :param updated_album: Updated data for the album
+        :type updated_album: dict or Album
+        :return: Updated album data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Album, await self.client.put(f'albums/{album_id}', encode(updated_album)))
+            logger.info("Updated album with ID %s successfully: %s", album_id, updated_album)
             return response
         except Exception as e:
-            logger.error(f"Failed to delete album with ID {album_id}: {e}")
+            logger.error("Failed to update album with ID %s: %s", album_id, e)
+            raise Exception(f"Failed to update album with ID {album_id}: {e}")
+
+    async def delete_album(self, album_id):
+        """
+        Delete an album by ID.
+
+        :param album_id: ID of the album to delete
+        :type album_id: int
+        :return: HTTP status code
+        :rtype: int
+        """
+        try:
+            response = await self.client.delete(f'albums/{album_id}')
+            logger.info("Deleted album with ID %s successfully.", album_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete album with ID %s: %s", album_id, e)
             raise Exception(f"Failed to delete album with ID {album_id}: {e}")
+
+    async def close(self):
+        """
+        Close the underlying async client.
+        """
+        await self.client.close()
@@ -1,5 +1,10 @@
+from src.api.async_client import AsyncAPIClient
 from src.api.clients import APIClient
+from src.api.pagination import AsyncLazyCollection, LazyCollection
 from src.config.logging_config import configure_logging, get_logger
+from src.models.resources import Comment, decode, encode
+from src.utils.helpers import (fetch_many, fetch_many_async, iter_pages, iter_pages_async, logged_page_fetch,
+                               logged_page_fetch_async)
 
 # Configure logging with a unique log file for this service
 configure_logging()
@@ -10,26 +15,82 @@ class CommentService:
     """
     Service class for Comments API.
     Provides high-level operations using the APIClient.
+    With ``models=True`` records are returned as Comment models instead of dicts.
     """
 
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else APIClient()
+        self.models = models
 
-    def fetch_all_comments(self):
+    def _decode(self, model, data):
         """
-        Fetch all comments.
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    def fetch_all_comments(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all comments, or the subset selected by ``params``.
 
-        :return: List of comments
-        :rtype: list
+        :param params: Query parameters: field filters such as {'postId': 1}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return a LazyCollection that fetches ``page_size`` comments at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of comments per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of comments, or a LazyCollection when ``lazy`` is set
+        :rtype: list or LazyCollection
         """
+        if lazy:
+            fetch_page = logged_page_fetch(lambda page: self.client.get_page('comments', page),
+                                           lambda items: self._decode(Comment, items), 'comments', logger)
+            return LazyCollection(fetch_page, page_size, params)
         try:
-            response = self.client.get('comments')
+            response = self._decode(Comment, self.client.get('comments', params=params))
             logger.info("Fetched all comments successfully.")
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch all comments: {e}")
+            logger.error("Failed to fetch all comments: %s", e)
             raise Exception(f"Failed to fetch all comments: {e}")
 
+    def iter_all_comments(self, params=None):
+        """
+        Stream all comments one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_comments``
+        :type params: dict
+        :return: Iterator over comments
+        :rtype: iterator
+        """
+        try:
+            for item in self.client.stream('comments', params=params):
+                yield self._decode(Comment, item)
+            logger.info("Streamed all comments successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all comments: %s", e)
+            raise Exception(f"Failed to stream all comments: {e}")
+
+    def iter_comment_pages(self, page_size=None, params=None):
+        """
+        Fetch comments one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of comments per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Iterator over pages of comments
+        :rtype: iterator
+        """
+        try:
+            yield from iter_pages(lambda page: self.client.get('comments', params={**(params or {}), **page}), page_size,
+                                  lambda items: self._decode(Comment, items))
+            logger.info("Fetched all pages of comments successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of comments: %s", e)
+            raise Exception(f"Failed to fetch pages of comments: {e}")
+
     def fetch_comment_by_id(self, comment_id):
         """
         Fetch a single comment by ID.
@@ -40,28 +101,43 @@ class CommentService:
         :rtype: dict
         """
         try:
-            response = self.client.get(f'comments/{comment_id}')
-            logger.info(f"Fetched comment by ID {comment_id} successfully.")
+            response = self._decode(Comment, self.client.get(f'comments/{comment_id}'))
+            logger.info("Fetched comment by ID %s successfully.", comment_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch comment by ID {comment_id}: {e}")
+            logger.error("Failed to fetch comment by ID %s: %s", comment_id, e)
             raise Exception(f"Failed to fetch comment by ID {comment_id}: {e}")
 
+    def fetch_comments_by_ids(self, comment_ids, max_workers=None):
+        """
+        Fetch several comments by ID concurrently.
+
+        :param comment_ids: IDs of the comments; repeated IDs are fetched once
+        :type comment_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Comment data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = fetch_many(self.fetch_comment_by_id, comment_ids, max_workers)
+        logger.info("Fetched %s comments by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
     def create_comment(self, new_comment):
         """
         Create a new comment.
 
         :param new_comment: Data for the new comment
-        :type new_comment: dict
+        :type new_comment: dict or Comment
         :return: Created comment data
         :rtype: dict
         """
         try:
-            response = self.client.post('comments', new_comment)
-            logger.info(f"Created new comment successfully: {new_comment}")
+            response = self._decode(Comment, self.client.post('comments', encode(new_comment)))
+            logger.info("Created new comment successfully: %s", new_comment)
             return response
         except Exception as e:
-            logger.error(f"Failed to create comment: {e}")
+            logger.error("Failed to create comment: %s", e)
             raise Exception(f"Failed to create comment: {e}")
 
     def update_comment(self, comment_id, updated_comment):
@@ -71,16 +147,16 @@ class CommentService:
         :param comment_id: ID of the comment to update
         :type comment_id: int
         :param updated_comment: Updated data for the comment
-        :type updated_comment: dict
+        :type updated_comment: dict or Comment
         :return: Updated comment data
         :rtype: dict
         """
         try:
-            response = self.client.put(f'comments/{comment_id}', updated_comment)
-            logger.info(f"Updated comment with ID {comment_id} successfully: {updated_comment}")
+            response = self._decode(Comment, self.client.put(f'comments/{comment_id}', encode(updated_comment)))
+            logger.info("Updated comment with ID %s successfully: %s", comment_id, updated_comment)
             return response
         except Exception as e:
-            logger.error(f"Failed to update comment with ID {comment_id}: {e}")
+            logger.error("Failed to update comment with ID %s: %s", comment_id, e)
             raise Exception(f"Failed to update comment with ID {comment_id}: {e}")
 
     def delete_comment(self, comment_id):
@@ -94,8 +170,181 @@ class CommentService:
         """
         try:
             response = self.client.delete(f'comments/{comment_id}')
-            logger.info(f"Deleted comment with ID {comment_id} successfully.")
+            logger.info("Deleted comment with ID %s successfully.", comment_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to delete comment with ID {comment_id}: {e}")
+            logger.error("Failed to delete comment with ID %s: %s", comment_id, e)
             raise Exception(f"Failed to delete comment with ID {comment_id}: {e}")
+
+
+class AsyncCommentService:
+    """
+    Async service class for Comments API.
+    Provides the same operations as CommentService using the AsyncAPIClient.
+    With ``models=True`` records are returned as Comment models instead of dicts.
+    """
+
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else AsyncAPIClient()
+        self.models = models
+
+    def _decode(self, model, data):
+        """
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    async def fetch_all_comments(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all comments, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'postId': 1}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return an AsyncLazyCollection that fetches ``page_size`` comments at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of comments per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of comments, or an AsyncLazyCollection when ``lazy`` is set
+        :rtype: list or AsyncLazyCollection
+        """
+        if lazy:
+            fetch_page = logged_page_fetch_async(lambda page: self.client.get_page('comments', page),
+                                                 lambda items: self._decode(Comment, items), 'comments', logger)
+            return AsyncLazyCollection(fetch_page, page_size, params)
+        try:
+            response = self._decode(Comment, await self.client.get('comments', params=params))
+            logger.info("Fetched all comments successfully.")
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch all comments: %s", e)
+            raise Exception(f"Failed to fetch all comments: {e}")
+
+    async def iter_all_comments(self, params=None):
+        """
+        Stream all comments one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_comments``
+        :type params: dict
+        :return: Async iterator over comments
+        :rtype: async iterator
+        """
+        try:
+            async for item in self.client.stream('comments', params=params):
+                yield self._decode(Comment, item)
+            logger.info("Streamed all comments successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all comments: %s", e)
+            raise Exception(f"Failed to stream all comments: {e}")
+
+    async def iter_comment_pages(self, page_size=None, params=None):
+        """
+        Fetch comments one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of comments per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Async iterator over pages of comments
+        :rtype: async iterator
+        """
+        try:
+            async for page in iter_pages_async(lambda page: self.client.get('comments', params={**(params or {}), **page}),
+                                         page_size, lambda items: self._decode(Comment, items)):
+                yield page
+            logger.info("Fetched all pages of comments successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of comments: %s", e)
+            raise Exception(f"Failed to fetch pages of comments: {e}")
+
+    async def fetch_comment_by_id(self, comment_id):
+        """
+        Fetch a single comment by ID.
+
+        :param comment_id: ID of the comment
+        :type comment_id: int
+        :return: Comment data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Comment, await self.client.get(f'comments/{comment_id}'))
+            logger.info("Fetched comment by ID %s successfully.", comment_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch comment by ID %s: %s", comment_id, e)
+            raise Exception(f"Failed to fetch comment by ID {comment_id}: {e}")
+
+    async def fetch_comments_by_ids(self, comment_ids, max_workers=None):
+        """
+        Fetch several comments by ID concurrently.
+
+        :param comment_ids: IDs of the comments; repeated IDs are fetched once
+        :type comment_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Comment data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = await fetch_many_async(self.fetch_comment_by_id, comment_ids, max_workers)
+        logger.info("Fetched %s comments by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
+    async def create_comment(self, new_comment):
+        """
+        Create a new comment.
+
+        :param new_comment: Data for the new comment
+        :type new_comment: dict or Comment
+        :return: Created comment data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Comment, await self.client.post('comments', encode(new_comment)))
+            logger.info("Created new comment successfully: %s", new_comment)
+            return response
+        except Exception as e:
+            logger.error("Failed to create comment: %s", e)
+            raise Exception(f"Failed to create comment: {e}")
+
+    async def update_comment(self, comment_id, updated_comment):
+        """
+        Update an existing comment.
+
+        :param comment_id: ID of the comment to update
+        :type comment_id: int
+        :param updated_comment: Updated data for the comment
+        :type updated_comment: dict or Comment
+        :return: Updated comment data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Comment, await self.client.put(f'comments/{comment_id}', encode(updated_comment)))
+            logger.info("Updated comment with ID %s successfully: %s", comment_id, updated_comment)
+            return response
+        except Exception as e:
+            logger.error("Failed to update comment with ID %s: %s", comment_id, e)
+            raise Exception(f"Failed to update comment with ID {comment_id}: {e}")
+
+    async def delete_comment(self, comment_id):
+        """
+        Delete a comment by ID.
+
+        :param comment_id: ID of the comment to delete
+        :type comment_id: int
+        :return: HTTP status code
+        :rtype: int
+        """
+        try:
+            response = await self.client.delete(f'comments/{comment_id}')
+            logger.info("Deleted comment with ID %s successfully.", comment_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete comment with ID %s: %s", comment_id, e)
+            raise Exception(f"Failed to delete comment with ID {comment_id}: {e}")
+
+    async def close(self):
+        """
+        Close the underlying async client.
+        """
+        await self.client.close()
@@ -1,5 +1,10 @@
+from src.api.async_client import AsyncAPIClient
 from src.api.clients import APIClient
+from src.api.pagination import AsyncLazyCollection, LazyCollection
 from src.config.logging_config import configure_logging, get_logger
+from src.models.resources import Photo, decode, encode
+from src.utils.helpers import (fetch_many, fetch_many_async, iter_pages, iter_pages_async, logged_page_fetch,
+                               logged_page_fetch_async)
 
 # Configure logging with a unique log file for this service
 configure_logging()
@@ -10,26 +15,82 @@ class PhotoService:
     """
     Service class for Photos API.
     Provides high-level operations using the APIClient.
+    With ``models=True`` records are returned as Photo models instead of dicts.
     """
 
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else APIClient()
+        self.models = models
 
-    def fetch_all_photos(self):
+    def _decode(self, model, data):
         """
-        Fetch all photos.
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    def fetch_all_photos(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all photos, or the subset selected by ``params``.
 
-        :return: List of photos
-        :rtype: list
+        :param params: Query parameters: field filters such as {'albumId': 1}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return a LazyCollection that fetches ``page_size`` photos at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of photos per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of photos, or a LazyCollection when ``lazy`` is set
+        :rtype: list or LazyCollection
         """
+        if lazy:
+            fetch_page = logged_page_fetch(lambda page: self.client.get_page('photos', page),
+                                           lambda items: self._decode(Photo, items), 'photos', logger)
+            return LazyCollection(fetch_page, page_size, params)
         try:
-            response = self.client.get('photos')
+            response = self._decode(Photo, self.client.get('photos', params=params))
             logger.info("Fetched all photos successfully.")
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch all photos: {e}")
+            logger.error("Failed to fetch all photos: %s", e)
             raise Exception(f"Failed to fetch all photos: {e}")
 
+    def iter_all_photos(self, params=None):
+        """
+        Stream all photos one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_photos``
+        :type params: dict
+        :return: Iterator over photos
+        :rtype: iterator
+        """
+        try:
+            for item in self.client.stream('photos', params=params):
+                yield self._decode(Photo, item)
+            logger.info("Streamed all photos successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all photos: %s", e)
+            raise Exception(f"Failed to stream all photos: {e}")
+
+    def iter_photo_pages(self, page_size=None, params=None):
+        """
+        Fetch photos one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of photos per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Iterator over pages of photos
+        :rtype: iterator
+        """
+        try:
+            yield from iter_pages(lambda page: self.client.get('photos', params={**(params or {}), **page}), page_size,
+                                  lambda items: self._decode(Photo, items))
+            logger.info("Fetched all pages of photos successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of photos: %s", e)
+            raise Exception(f"Failed to fetch pages of photos: {e}")
+
     def fetch_photo_by_id(self, photo_id):
         """
         Fetch a single photo by ID.
@@ -40,28 +101,43 @@ class PhotoService:
         :rtype: dict
         """
         try:
-            response = self.client.get(f'photos/{photo_id}')
-            logger.info(f"Fetched photo by ID {photo_id} successfully.")
+            response = self._decode(Photo, self.client.get(f'photos/{photo_id}'))
+            logger.info("Fetched photo by ID %s successfully.", photo_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch photo by ID {photo_id}: {e}")
+            logger.error("Failed to fetch photo by ID %s: %s", photo_id, e)
             raise Exception(f"Failed to fetch photo by ID {photo_id}: {e}")
 
+    def fetch_photos_by_ids(self, photo_ids, max_workers=None):
+        """
+        Fetch several photos by ID concurrently.
+
+        :param photo_ids: IDs of the photos; repeated IDs are fetched once
+        :type photo_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Photo data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = fetch_many(self.fetch_photo_by_id, photo_ids, max_workers)
+        logger.info("Fetched %s photos by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
     def create_photo(self, new_photo):
         """
         Create a new photo.
 
         :param new_photo: Data for the new photo
-        :type new_photo: dict
+        :type new_photo: dict or Photo
         :return: Created photo data
         :rtype: dict
         """
         try:
-            response = self.client.post('photos', new_photo)
-            logger.info(f"Created new photo successfully: {new_photo}")
+            response = self._decode(Photo, self.client.post('photos', encode(new_photo)))
+            logger.info("Created new photo successfully: %s", new_photo)
             return response
         except Exception as e:
-            logger.error(f"Failed to create photo: {e}")
+            logger.error("Failed to create photo: %s", e)
             raise Exception(f"Failed to create photo: {e}")
 
     def update_photo(self, photo_id, updated_photo):
@@ -71,16 +147,16 @@ class PhotoService:
         :param photo_id: ID of the photo to update
         :type photo_id: int
         :param updated_photo: Updated data for the photo
-        :type updated_photo: dict
+        :type updated_photo: dict or Photo
         :return: Updated photo data
         :rtype: dict
         """
         try:
-            response = self.client.put(f'photos/{photo_id}', updated_photo)
-            logger.info(f"Updated photo with ID {photo_id} successfully: {updated_photo}")
+            response = self._decode(Photo, self.client.put(f'photos/{photo_id}', encode(updated_photo)))
+            logger.info("Updated photo with ID %s successfully: %s", photo_id, updated_photo)
             return response
         except Exception as e:
-            logger.error(f"Failed to update photo with ID {photo_id}: {e}")
+            logger.error("Failed to update photo with ID %s: %s", photo_id, e)
             raise Exception(f"Failed to update photo with ID {photo_id}: {e}")
 
     def delete_photo(self, photo_id):
@@ -94,8 +170,181 @@ class PhotoService:
         """
         try:
             response = self.client.delete(f'photos/{photo_id}')
-            logger.info(f"Deleted photo with ID {photo_id} successfully.")
+            logger.info("Deleted photo with ID %s successfully.", photo_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to delete photo with ID {photo_id}: {e}")
+            logger.error("Failed to delete photo with ID %s: %s", photo_id, e)
             raise Exception(f"Failed to delete photo with ID {photo_id}: {e}")
+
+
+class AsyncPhotoService:
+    """
+    Async service class for Photos API.
+    Provides the same operations as PhotoService using the AsyncAPIClient.
+    With ``models=True`` records are returned as Photo models instead of dicts.
+    """
+
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else AsyncAPIClient()
+        self.models = models
+
+    def _decode(self, model, data):
+        """
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    async def fetch_all_photos(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all photos, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'albumId': 1}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return an AsyncLazyCollection that fetches ``page_size`` photos at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of photos per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of photos, or an AsyncLazyCollection when ``lazy`` is set
+        :rtype: list or AsyncLazyCollection
+        """
+        if lazy:
+            fetch_page = logged_page_fetch_async(lambda page: self.client.get_page('photos', page),
+                                                 lambda items: self._decode(Photo, items), 'photos', logger)
+            return AsyncLazyCollection(fetch_page, page_size, params)
+        try:
+            response = self._decode(Photo, await self.client.get('photos', params=params))
+            logger.info("Fetched all photos successfully.")
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch all photos: %s", e)
+            raise Exception(f"Failed to fetch all photos: {e}")
+
+    async def iter_all_photos(self, params=None):
+        """
+        Stream all photos one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_photos``
+        :type params: dict
+        :return: Async iterator over photos
+        :rtype: async iterator
+        """
+        try:
+            async for item in self.client.stream('photos', params=params):
+                yield self._decode(Photo, item)
+            logger.info("Streamed all photos successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all photos: %s", e)
+            raise Exception(f"Failed to stream all photos: {e}")
+
+    async def iter_photo_pages(self, page_size=None, params=None):
+        """
+        Fetch photos one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of photos per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Async iterator over pages of photos
+        :rtype: async iterator
+        """
+        try:
+            async for page in iter_pages_async(lambda page: self.client.get('photos', params={**(params or {}), **page}),
+                                         page_size, lambda items: self._decode(Photo, items)):
+                yield page
+            logger.info("Fetched all pages of photos successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of photos: %s", e)
+            raise Exception(f"Failed to fetch pages of photos: {e}")
+
+    async def fetch_photo_by_id(self, photo_id):
+        """
+        Fetch a single photo by ID.
+
+        :param photo_id: ID of the photo
+        :type photo_id: int
+        :return: Photo data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Photo, await self.client.get(f'photos/{photo_id}'))
+            logger.info("Fetched photo by ID %s successfully.", photo_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch photo by ID %s: %s", photo_id, e)
+            raise Exception(f"Failed to fetch photo by ID {photo_id}: {e}")
+
+    async def fetch_photos_by_ids(self, photo_ids, max_workers=None):
+        """
+        Fetch several photos by ID concurrently.
+
+        :param photo_ids: IDs of the photos; repeated IDs are fetched once
+        :type photo_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Photo data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = await fetch_many_async(self.fetch_photo_by_id, photo_ids, max_workers)
+        logger.info("Fetched %s photos by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
+    async def create_photo(self, new_photo):
+        """
+        Create a new photo.
+
+        :param new_photo: Data for the new photo
+        :type new_photo: dict or Photo
+        :return: Created photo data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Photo, await self.client.post('photos', encode(new_photo)))
+            logger.info("Created new photo successfully: %s", new_photo)
+            return response
+        except Exception as e:
+            logger.error("Failed to create photo: %s", e)
+            raise Exception(f"Failed to create photo: {e}")
+
+    async def update_photo(self, photo_id, updated_photo):
+        """
+        Update an existing photo.
+
+        :param photo_id: ID of the photo to update
+        :type photo_id: int
+        :param updated_photo: Updated data for the photo
+        :type updated_photo: dict or Photo
+        :return: Updated photo data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Photo, await self.client.put(f'photos/{photo_id}', encode(updated_photo)))
+            logger.info("Updated photo with ID %s successfully: %s", photo_id, updated_photo)
+            return response
+        except Exception as e:
+            logger.error("Failed to update photo with ID %s: %s", photo_id, e)
+            raise Exception(f"Failed to update photo with ID {photo_id}: {e}")
+
+    async def delete_photo(self, photo_id):
+        """
+        Delete a photo by ID.
+
+        :param photo_id: ID of the photo to delete
+        :type photo_id: int
+        :return: HTTP status code
+        :rtype: int
+        """
+        try:
+            response = await self.client.delete(f'photos/{photo_id}')
+            logger.info("Deleted photo with ID %s successfully.", photo_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete photo with ID %s: %s", photo_id, e)
+            raise Exception(f"Failed to delete photo with ID {photo_id}: {e}")
+
+    async def close(self):
+        """
+        Close the underlying async client.
+        """
+        await self.client.close()
@@ -1,5 +1,10 @@
+from src.api.async_client import AsyncAPIClient
 from src.api.clients import APIClient
+from src.api.pagination import AsyncLazyCollection, LazyCollection
 from src.config.logging_config import configure_logging, get_logger
+from src.models.resources import Comment, Post, decode, encode
+from src.utils.helpers import (fetch_many, fetch_many_async, iter_pages, iter_pages_async, logged_page_fetch,
+                               logged_page_fetch_async)
 
 # Configure logging
 configure_logging()
@@ -10,26 +15,101 @@ class PostService:
     """
     Service class for Posts API.
     Provides high-level operations using the APIClient.
+    With ``models=True`` records are returned as Post models instead of dicts.
     """
 
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else APIClient()
+        self.models = models
 
-    def fetch_all_posts(self):
+    def _decode(self, model, data):
         """
-        Fetch all posts.
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
 
-        :return: List of posts
-        :rtype: list
+    def fetch_all_posts(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all posts, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'userId': 1}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return a LazyCollection that fetches ``page_size`` posts at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of posts per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of posts, or a LazyCollection when ``lazy`` is set
+        :rtype: list or LazyCollection
         """
+        if lazy:
+            fetch_page = logged_page_fetch(lambda page: self.client.get_page('posts', page),
+                                           lambda items: self._decode(Post, items), 'posts', logger)
+            return LazyCollection(fetch_page, page_size, params)
         try:
-            response = self.client.get('posts')
+            response = self._decode(Post, self.client.get('posts', params=params))
             logger.info("Fetched all posts successfully.")
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch all posts: {e}")
+            logger.error("Failed to fetch all posts: %s", e)
             raise Exception(f"Failed to fetch all posts: {e}")
 
+    def iter_all_posts(self, params=None):
+        """
+        Stream all posts one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_posts``
+        :type params: dict
+        :return: Iterator over posts
+        :rtype: iterator
+        """
+        try:
+            for item in self.client.stream('posts', params=params):
+                yield self._decode(Post, item)
+            logger.info("Streamed all posts successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all posts: %s", e)
+            raise Exception(f"Failed to stream all posts: {e}")
+
+    def iter_post_pages(self, page_size=None, params=None):
+        """
+        Fetch posts one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of posts per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Iterator over pages of posts
+        :rtype: iterator
+        """
+        try:
+            yield from iter_pages(lambda page: self.client.get('posts', params={**(params or {}), **page}), page_size,
+                                  lambda items: self._decode(Post, items))
+            logger.info("Fetched all pages of posts successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of posts: %s", e)
+            raise Exception(f"Failed to fetch pages of posts: {e}")
+
+    def fetch_post_comments(self, post_id, params=None):
+        """
+        Fetch the comments of a post through the nested ``posts/<id>/comments`` route.
+
+        :param post_id: ID of the post
+        :type post_id: int
+        :param params: Query parameters, as for ``fetch_all_posts``
+        :type params: dict
+        :return: List of comments
+        :rtype: list
+        """
+        try:
+            response = self._decode(Comment, self.client.get(f'posts/{post_id}/comments', params=params))
+            logger.info("Fetched comments of post %s successfully.", post_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch comments of post %s: %s", post_id, e)
+            raise Exception(f"Failed to fetch comments of post {post_id}: {e}")
+
     def fetch_post_by_id(self, post_id):
         """
         Fetch a single post by ID.
@@ -40,28 +120,43 @@ class PostService:
         :rtype: dict
         """
         try:
-            response = self.client.get(f'posts/{post_id}')
-            logger.info(f"Fetched post by ID {post_id} successfully.")
+            response = self._decode(Post, self.client.get(f'posts/{post_id}'))
+            logger.info("Fetched post by ID %s successfully.", post_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch post by ID {post_id}: {e}")
+            logger.error("Failed to fetch post by ID %s: %s", post_id, e)
             raise Exception(f"Failed to fetch post by ID {post_id}: {e}")
 
+    def fetch_posts_by_ids(self, post_ids, max_workers=None):
+        """
+        Fetch several posts by ID concurrently.
+
+        :param post_ids: IDs of the posts; repeated IDs are fetched once
+        :type post_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Post data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = fetch_many(self.fetch_post_by_id, post_ids, max_workers)
+        logger.info("Fetched %s posts by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
     def create_post(self, new_post):
         """
         Create a new post.
 
         :param new_post: Data for the new post
-        :type new_post: dict
+        :type new_post: dict or Post
         :return: Created post data
         :rtype: dict
         """
         try:
-            response = self.client.post('posts', new_post)
-            logger.info(f"Created new post successfully: {new_post}")
+            response = self._decode(Post, self.client.post('posts', encode(new_post)))
+            logger.info("Created new post successfully: %s", new_post)
             return response
         except Exception as e:
-            logger.error(f"Failed to create post: {e}")
+            logger.error("Failed to create post: %s", e)
             raise Exception(f"Failed to create post: {e}")
 
     def update_post(self, post_id, updated_post):
@@ -71,16 +166,16 @@ class PostService:
         :param post_id: ID of the post to update
         :type post_id: int
         :param updated_post: Updated data for the post
-        :type updated_post: dict
+        :type updated_post: dict or Post
         :return: Updated post data
         :rtype: dict
         """
         try:
-            response = self.client.put(f'posts/{post_id}', updated_post)
-            logger.info(f"Updated post with ID {post_id} successfully: {updated_post}")
+            response = self._decode(Post, self.client.put(f'posts/{post_id}', encode(updated_post)))
+            logger.info("Updated post with ID %s successfully: %s", post_id, updated_post)
             return response
         except Exception as e:
-            logger.error(f"Failed to update post with ID {post_id}: {e}")
+            logger.error("Failed to update post with ID %s: %s", post_id, e)
             raise Exception(f"Failed to update post with ID {post_id}: {e}")
 
     def delete_post(self, post_id):
@@ -94,8 +189,200 @@ class PostService:
         """
         try:
             response = self.client.delete(f'posts/{post_id}')
-            logger.info(f"Deleted post with ID {post_id} successfully.")
+            logger.info("Deleted post with ID %s successfully.", post_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete post with ID %s: %s", post_id, e)
+            raise Exception(f"Failed to delete post with ID {post_id}: {e}")
+
+
+class AsyncPostService:
+    """
+    Async service class for Posts API.
+    Provides the same operations as PostService using the AsyncAPIClient.
+    With ``models=True`` records are returned as Post models instead of dicts.
+    """
+
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else AsyncAPIClient()
+        self.models = models
+
+    def _decode(self, model, data):
+        """
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    async def fetch_all_posts(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all posts, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'userId': 1}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return an AsyncLazyCollection that fetches ``page_size`` posts at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of posts per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of posts, or an AsyncLazyCollection when ``lazy`` is set
+        :rtype: list or AsyncLazyCollection
+        """
+        if lazy:
+            fetch_page = logged_page_fetch_async(lambda page: self.client.get_page('posts', page),
+                                                 lambda items: self._decode(Post, items), 'posts', logger)
+            return AsyncLazyCollection(fetch_page, page_size, params)
+        try:
+            response = self._decode(Post, await self.client.get('posts', params=params))
+            logger.info("Fetched all posts successfully.")
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch all posts: %s", e)
+            raise Exception(f"Failed to fetch all posts: {e}")
+
+    async def iter_all_posts(self, params=None):
+        """
+        Stream all posts one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_posts``
+        :type params: dict
+        :return: Async iterator over posts
+        :rtype: async iterator
+        """
+        try:
+            async for item in self.client.stream('posts', params=params):
+                yield self._decode(Post, item)
+            logger.info("Streamed all posts successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all posts: %s", e)
+            raise Exception(f"Failed to stream all posts: {e}")
+
+    async def iter_post_pages(self, page_size=None, params=None):
+        """
+        Fetch posts one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of posts per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Async iterator over pages of posts
+        :rtype: async iterator
+        """
+        try:
+            async for page in iter_pages_async(lambda page: self.client.get('posts', params={**(params or {}), **page}),
+                                         page_size, lambda items: self._decode(Post, items)):
+                yield page
+            logger.info("Fetched all pages of posts successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of posts: %s", e)
+            raise Exception(f"Failed to fetch pages of posts: {e}")
+
+    async def fetch_post_comments(self, post_id, params=None):
+        """
+        Fetch the comments of a post through the nested ``posts/<id>/comments`` route.
+
+        :param post_id: ID of the post
+        :type post_id: int
+        :param params: Query parameters, as for ``fetch_all_posts``
+        :type params: dict
+        :return: List of comments
+        :rtype: list
+        """
+        try:
+            response = self._decode(Comment, await self.client.get(f'posts/{post_id}/comments', params=params))
+            logger.info("Fetched comments of post %s successfully.", post_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch comments of post %s: %s", post_id, e)
+            raise Exception(f"Failed to fetch comments of post {post_id}: {e}")
+
+    async def fetch_post_by_id(self, post_id):
+        """
+        Fetch a single post by ID.
+
+        :param post_id: ID of the post
+        :type post_id: int
+        :return: Post data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Post, await self.client.get(f'posts/{post_id}'))
+            logger.info("Fetched post by ID %s successfully.", post_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch post by ID %s: %s", post_id, e)
+            raise Exception(f"Failed to fetch post by ID {post_id}: {e}")
+
+    async def fetch_posts_by_ids(self, post_ids, max_workers=None):
+        """
+        Fetch several posts by ID concurrently.
+
+        :param post_ids: IDs of the posts; repeated IDs are fetched once
+        :type post_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Post data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = await fetch_many_async(self.fetch_post_by_id, post_ids, max_workers)
+        logger.info("Fetched %s posts by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
+    async def create_post(self, new_post):
+        """
+        Create a new post.
+
+        :param new_post: Data for the new post
+        :type new_post: dict or Post
+        :return: Created post data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Post, await self.client.post('posts', encode(new_post)))
+            logger.info("Created new post successfully: %s", new_post)
+            return response
+        except Exception as e:
+            logger.error("Failed to create post: %s", e)
+            raise Exception(f"Failed to create post: {e}")
+
+    async def update_post(self, post_id, updated_post):
+        """
+        Update an existing post.
+
+        :param post_id: ID of the post to update
+        :type post_id: int
+        :param updated_post: Updated data for the post
+        :type updated_post: dict or Post
+        :return: Updated post data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Post, await self.client.put(f'posts/{post_id}', encode(updated_post)))
+            logger.info("Updated post with ID %s successfully: %s", post_id, updated_post)
             return response
         except Exception as e:
-            logger.error(f"Failed to delete post with ID {post_id}: {e}")
+            logger.error("Failed to update post with ID %s: %s", post_id, e)
+            raise Exception(f"Failed to update post with ID {post_id}: {e}")
+
+    async def delete_post(self, post_id):
+        """
+        Delete a post by ID.
+
+        :param post_id: ID of the post to delete
+        :type post_id: int
+        :return: HTTP status code
+        :rtype: int
+        """
+        try:
+            response = await self.client.delete(f'posts/{post_id}')
+            logger.info("Deleted post with ID %s successfully.", post_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete post with ID %s: %s", post_id, e)
             raise Exception(f"Failed to delete post with ID {post_id}: {e}")
+
+    async def close(self):
+        """
+        Close the underlying async client.
+        """
+        await self.client.close()
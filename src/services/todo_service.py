@@ -1,5 +1,10 @@
+from src.api.async_client import AsyncAPIClient
 from src.api.clients import APIClient
+from src.api.pagination import AsyncLazyCollection, LazyCollection
 from src.config.logging_config import configure_logging, get_logger
+from src.models.resources import Todo, decode, encode
+from src.utils.helpers import (fetch_many, fetch_many_async, iter_pages, iter_pages_async, logged_page_fetch,
+                               logged_page_fetch_async)
 
 # Configure logging with a unique log file for this service
 configure_logging()
@@ -10,26 +15,82 @@ class TodoService:
     """
     Service class for Todos API.
     Provides high-level operations using the APIClient.
+    With ``models=True`` records are returned as Todo models instead of dicts.
     """
 
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else APIClient()
+        self.models = models
 
-    def fetch_all_todos(self):
+    def _decode(self, model, data):
         """
-        Fetch all todos.
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    def fetch_all_todos(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all todos, or the subset selected by ``params``.
 
-        :return: List of todos
-        :rtype: list
+        :param params: Query parameters: field filters such as {'userId': 1, 'completed': 'true'}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return a LazyCollection that fetches ``page_size`` todos at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of todos per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of todos, or a LazyCollection when ``lazy`` is set
+        :rtype: list or LazyCollection
         """
+        if lazy:
+            fetch_page = logged_page_fetch(lambda page: self.client.get_page('todos', page),
+                                           lambda items: self._decode(Todo, items), 'todos', logger)
+            return LazyCollection(fetch_page, page_size, params)
         try:
-            response = self.client.get('todos')
+            response = self._decode(Todo, self.client.get('todos', params=params))
             logger.info("Fetched all todos successfully.")
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch all todos: {e}")
+            logger.error("Failed to fetch all todos: %s", e)
             raise Exception(f"Failed to fetch all todos: {e}")
 
+    def iter_all_todos(self, params=None):
+        """
+        Stream all todos one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_todos``
+        :type params: dict
+        :return: Iterator over todos
+        :rtype: iterator
+        """
+        try:
+            for item in self.client.stream('todos', params=params):
+                yield self._decode(Todo, item)
+            logger.info("Streamed all todos successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all todos: %s", e)
+            raise Exception(f"Failed to stream all todos: {e}")
+
+    def iter_todo_pages(self, page_size=None, params=None):
+        """
+        Fetch todos one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of todos per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Iterator over pages of todos
+        :rtype: iterator
+        """
+        try:
+            yield from iter_pages(lambda page: self.client.get('todos', params={**(params or {}), **page}), page_size,
+                                  lambda items: self._decode(Todo, items))
+            logger.info("Fetched all pages of todos successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of todos: %s", e)
+            raise Exception(f"Failed to fetch pages of todos: {e}")
+
     def fetch_todo_by_id(self, todo_id):
         """
         Fetch a single todo by ID.
@@ -40,28 +101,43 @@ class TodoService:
         :rtype: dict
         """
         try:
-            response = self.client.get(f'todos/{todo_id}')
-            logger.info(f"Fetched todo by ID {todo_id} successfully.")
+            response = self._decode(Todo, self.client.get(f'todos/{todo_id}'))
+            logger.info("Fetched todo by ID %s successfully.", todo_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch todo by ID {todo_id}: {e}")
+            logger.error("Failed to fetch todo by ID %s: %s", todo_id, e)
             raise Exception(f"Failed to fetch todo by ID {todo_id}: {e}")
 
+    def fetch_todos_by_ids(self, todo_ids, max_workers=None):
+        """
+        Fetch several todos by ID concurrently.
+
+        :param todo_ids: IDs of the todos; repeated IDs are fetched once
+        :type todo_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Todo data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = fetch_many(self.fetch_todo_by_id, todo_ids, max_workers)
+        logger.info("Fetched %s todos by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
     def create_todo(self, new_todo):
         """
         Create a new todo.
 
         :param new_todo: Data for the new todo
-        :type new_todo: dict
+        :type new_todo: dict or Todo
         :return: Created todo data
         :rtype: dict
         """
         try:
-            response = self.client.post('todos', new_todo)
-            logger.info(f"Created new todo successfully: {new_todo}")
+            response = self._decode(Todo, self.client.post('todos', encode(new_todo)))
+            logger.info("Created new todo successfully: %s", new_todo)
             return response
         except Exception as e:
-            logger.error(f"Failed to create todo: {e}")
+            logger.error("Failed to create todo: %s", e)
             raise Exception(f"Failed to create todo: {e}")
 
     def update_todo(self, todo_id, updated_todo):
@@ -71,16 +147,16 @@ class TodoService:
         :param todo_id: ID of the todo to update
         :type todo_id: int
         :param updated_todo: Updated data for the todo
-        :type updated_todo: dict
+        :type updated_todo: dict or Todo
         :return: Updated todo data
         :rtype: dict
         """
         try:
-            response = self.client.put(f'todos/{todo_id}', updated_todo)
-            logger.info(f"Updated todo with ID {todo_id} successfully: {updated_todo}")
+            response = self._decode(Todo, self.client.put(f'todos/{todo_id}', encode(updated_todo)))
+            logger.info("Updated todo with ID %s successfully: %s", todo_id, updated_todo)
             return response
         except Exception as e:
-            logger.error(f"Failed to update todo with ID {todo_id}: {e}")
+            logger.error("Failed to update todo with ID %s: %s", todo_id, e)
             raise Exception(f"Failed to update todo with ID {todo_id}: {e}")
 
     def delete_todo(self, todo_id):
@@ -94,8 +170,181 @@ class TodoService:
         """
         try:
             response = self.client.delete(f'todos/{todo_id}')
-            logger.info(f"Deleted todo with ID {todo_id} successfully.")
+            logger.info("Deleted todo with ID %s successfully.", todo_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to delete todo with ID {todo_id}: {e}")
+            logger.error("Failed to delete todo with ID %s: %s", todo_id, e)
             raise Exception(f"Failed to delete todo with ID {todo_id}: {e}")
+
+
+class AsyncTodoService:
+    """
+    Async service class for Todos API.
+    Provides the same operations as TodoService using the AsyncAPIClient.
+    With ``models=True`` records are returned as Todo models instead of dicts.
+    """
+
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else AsyncAPIClient()
+        self.models = models
+
+    def _decode(self, model, data):
+        """
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    async def fetch_all_todos(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all todos, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'userId': 1, 'completed': 'true'}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return an AsyncLazyCollection that fetches ``page_size`` todos at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of todos per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of todos, or an AsyncLazyCollection when ``lazy`` is set
+        :rtype: list or AsyncLazyCollection
+        """
+        if lazy:
+            fetch_page = logged_page_fetch_async(lambda page: self.client.get_page('todos', page),
+                                                 lambda items: self._decode(Todo, items), 'todos', logger)
+            return AsyncLazyCollection(fetch_page, page_size, params)
+        try:
+            response = self._decode(Todo, await self.client.get('todos', params=params))
+            logger.info("Fetched all todos successfully.")
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch all todos: %s", e)
+            raise Exception(f"Failed to fetch all todos: {e}")
+
+    async def iter_all_todos(self, params=None):
+        """
+        Stream all todos one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_todos``
+        :type params: dict
+        :return: Async iterator over todos
+        :rtype: async iterator
+        """
+        try:
+            async for item in self.client.stream('todos', params=params):
+                yield self._decode(Todo, item)
+            logger.info("Streamed all todos successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all todos: %s", e)
+            raise Exception(f"Failed to stream all todos: {e}")
+
+    async def iter_todo_pages(self, page_size=None, params=None):
+        """
+        Fetch todos one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of todos per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Async iterator over pages of todos
+        :rtype: async iterator
+        """
+        try:
+            async for page in iter_pages_async(lambda page: self.client.get('todos', params={**(params or {}), **page}),
+                                         page_size, lambda items: self._decode(Todo, items)):
+                yield page
+            logger.info("Fetched all pages of todos successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of todos: %s", e)
+            raise Exception(f"Failed to fetch pages of todos: {e}")
+
+    async def fetch_todo_by_id(self, todo_id):
+        """
+        Fetch a single todo by ID.
+
+        :param todo_id: ID of the todo
+        :type todo_id: int
+        :return: Todo data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Todo, await self.client.get(f'todos/{todo_id}'))
+            logger.info("Fetched todo by ID %s successfully.", todo_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch todo by ID %s: %s", todo_id, e)
+            raise Exception(f"Failed to fetch todo by ID {todo_id}: {e}")
+
+    async def fetch_todos_by_ids(self, todo_ids, max_workers=None):
+        """
+        Fetch several todos by ID concurrently.
+
+        :param todo_ids: IDs of the todos; repeated IDs are fetched once
+        :type todo_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: Todo data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = await fetch_many_async(self.fetch_todo_by_id, todo_ids, max_workers)
+        logger.info("Fetched %s todos by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
+    async def create_todo(self, new_todo):
+        """
+        Create a new todo.
+
+        :param new_todo: Data for the new todo
+        :type new_todo: dict or Todo
+        :return: Created todo data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Todo, await self.client.post('todos', encode(new_todo)))
+            logger.info("Created new todo successfully: %s", new_todo)
+            return response
+        except Exception as e:
+            logger.error("Failed to create todo: %s", e)
+            raise Exception(f"Failed to create todo: {e}")
+
+    async def update_todo(self, todo_id, updated_todo):
+        """
+        Update an existing todo.
+
+        :param todo_id: ID of the todo to update
+        :type todo_id: int
+        :param updated_todo: Updated data for the todo
+        :type updated_todo: dict or Todo
+        :return: Updated todo data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(Todo, await self.client.put(f'todos/{todo_id}', encode(updated_todo)))
+            logger.info("Updated todo with ID %s successfully: %s", todo_id, updated_todo)
+            return response
+        except Exception as e:
+            logger.error("Failed to update todo with ID %s: %s", todo_id, e)
+            raise Exception(f"Failed to update todo with ID {todo_id}: {e}")
+
+    async def delete_todo(self, todo_id):
+        """
+        Delete a todo by ID.
+
+        :param todo_id: ID of the todo to delete
+        :type todo_id: int
+        :return: HTTP status code
+        :rtype: int
+        """
+        try:
+            response = await self.client.delete(f'todos/{todo_id}')
+            logger.info("Deleted todo with ID %s successfully.", todo_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete todo with ID %s: %s", todo_id, e)
+            raise Exception(f"Failed to delete todo with ID {todo_id}: {e}")
+
+    async def close(self):
+        """
+        Close the underlying async client.
+        """
+        await self.client.close()
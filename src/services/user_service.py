@@ -1,5 +1,10 @@
+from src.api.async_client import AsyncAPIClient
 from src.api.clients import APIClient
+from src.api.pagination import AsyncLazyCollection, LazyCollection
 from src.config.logging_config import configure_logging, get_logger
+from src.models.resources import Album, Post, Todo, User, decode, encode
+from src.utils.helpers import (fetch_many, fetch_many_async, iter_pages, iter_pages_async, logged_page_fetch,
+                               logged_page_fetch_async)
 
 # Configure logging with a unique log file for this service
 configure_logging()
@@ -10,26 +15,139 @@ class UserService:
     """
     Service class for Users API.
     Provides high-level operations using the APIClient.
+    With ``models=True`` records are returned as User models instead of dicts.
     """
 
-    def __init__(self):
-        self.client = APIClient()
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else APIClient()
+        self.models = models
 
-    def fetch_all_users(self):
+    def _decode(self, model, data):
         """
-        Fetch all users.
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
 
-        :return: List of users
-        :rtype: list
+    def fetch_all_users(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all users, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'username': 'Bret'}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return a LazyCollection that fetches ``page_size`` users at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of users per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of users, or a LazyCollection when ``lazy`` is set
+        :rtype: list or LazyCollection
         """
+        if lazy:
+            fetch_page = logged_page_fetch(lambda page: self.client.get_page('users', page),
+                                           lambda items: self._decode(User, items), 'users', logger)
+            return LazyCollection(fetch_page, page_size, params)
         try:
-            response = self.client.get('users')
+            response = self._decode(User, self.client.get('users', params=params))
             logger.info("Fetched all users successfully.")
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch all users: {e}")
+            logger.error("Failed to fetch all users: %s", e)
             raise Exception(f"Failed to fetch all users: {e}")
 
+    def iter_all_users(self, params=None):
+        """
+        Stream all users one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_users``
+        :type params: dict
+        :return: Iterator over users
+        :rtype: iterator
+        """
+        try:
+            for item in self.client.stream('users', params=params):
+                yield self._decode(User, item)
+            logger.info("Streamed all users successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all users: %s", e)
+            raise Exception(f"Failed to stream all users: {e}")
+
+    def iter_user_pages(self, page_size=None, params=None):
+        """
+        Fetch users one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of users per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Iterator over pages of users
+        :rtype: iterator
+        """
+        try:
+            yield from iter_pages(lambda page: self.client.get('users', params={**(params or {}), **page}), page_size,
+                                  lambda items: self._decode(User, items))
+            logger.info("Fetched all pages of users successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of users: %s", e)
+            raise Exception(f"Failed to fetch pages of users: {e}")
+
+    def fetch_user_posts(self, user_id, params=None):
+        """
+        Fetch the posts of a user through the nested ``users/<id>/posts`` route.
+
+        :param user_id: ID of the user
+        :type user_id: int
+        :param params: Query parameters, as for ``fetch_all_users``
+        :type params: dict
+        :return: List of posts
+        :rtype: list
+        """
+        try:
+            response = self._decode(Post, self.client.get(f'users/{user_id}/posts', params=params))
+            logger.info("Fetched posts of user %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch posts of user %s: %s", user_id, e)
+            raise Exception(f"Failed to fetch posts of user {user_id}: {e}")
+
+    def fetch_user_albums(self, user_id, params=None):
+        """
+        Fetch the albums of a user through the nested ``users/<id>/albums`` route.
+
+        :param user_id: ID of the user
+        :type user_id: int
+        :param params: Query parameters, as for ``fetch_all_users``
+        :type params: dict
+        :return: List of albums
+        :rtype: list
+        """
+        try:
+            response = self._decode(Album, self.client.get(f'users/{user_id}/albums', params=params))
+            logger.info("Fetched albums of user %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch albums of user %s: %s", user_id, e)
+            raise Exception(f"Failed to fetch albums of user {user_id}: {e}")
+
+    def fetch_user_todos(self, user_id, params=None):
+        """
+        Fetch the todos of a user through the nested ``users/<id>/todos`` route.
+
+        :param user_id: ID of the user
+        :type user_id: int
+        :param params: Query parameters, as for ``fetch_all_users``
+        :type params: dict
+        :return: List of todos
+        :rtype: list
+        """
+        try:
+            response = self._decode(Todo, self.client.get(f'users/{user_id}/todos', params=params))
+            logger.info("Fetched todos of user %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch todos of user %s: %s", user_id, e)
+            raise Exception(f"Failed to fetch todos of user {user_id}: {e}")
+
     def fetch_user_by_id(self, user_id):
         """
         Fetch a single user by ID.
@@ -40,28 +158,43 @@ class UserService:
         :rtype: dict
         """
         try:
-            response = self.client.get(f'users/{user_id}')
-            logger.info(f"Fetched user by ID {user_id} successfully.")
+            response = self._decode(User, self.client.get(f'users/{user_id}'))
+            logger.info("Fetched user by ID %s successfully.", user_id)
             return response
         except Exception as e:
-            logger.error(f"Failed to fetch user by ID {user_id}: {e}")
+            logger.error("Failed to fetch user by ID %s: %s", user_id, e)
             raise Exception(f"Failed to fetch user by ID {user_id}: {e}")
 
+    def fetch_users_by_ids(self, user_ids, max_workers=None):
+        """
+        Fetch several users by ID concurrently.
+
+        :param user_ids: IDs of the users; repeated IDs are fetched once
+        :type user_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: User data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = fetch_many(self.fetch_user_by_id, user_ids, max_workers)
+        logger.info("Fetched %s users by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
     def create_user(self, new_user):
         """
         Create a new user.
 
         :param new_user: Data for the new user
-        :type new_user: dict
+        :type new_user: dict or User
         :return: Created user data
         :rtype: dict
         """
         try:
-            response = self.client.post('users', new_user)
-            logger.info(f"Created new user successfully: {new_user}")
+            response = self._decode(User, self.client.post('users', encode(new_user)))
+            logger.info("Created new user successfully: %s", new_user)
             return response
         except Exception as e:
-            logger.error(f"Failed to create user: {e}")
+            logger.error("Failed to create user: %s", e)
             raise Exception(f"Failed to create user: {e}")
 
     def update_user(self, user_id, updated_user):
@@ -71,16 +204,16 @@ class UserService:
         :param user_id: ID of the user to update
         :type user_id: int
         :param updated_user: Updated data for the user
-        :type updated_user: dict
+        :type updated_user: dict or User
         :return: Updated user data
         :rtype: dict
         """
         try:
-            response = self.client.put(f'users/{user_id}', updated_user)
-            logger.info(f"Updated user with ID {user_id} successfully: {updated_user}")
+            response = self._decode(User, self.client.put(f'users/{user_id}', encode(updated_user)))
+            logger.info("Updated user with ID %s successfully: %s", user_id, updated_user)
             return response
         except Exception as e:
-            logger.error(f"Failed to update user with ID {user_id}: {e}")
+            logger.error("Failed to update user with ID %s: %s", user_id, e)
             raise Exception(f"Failed to update user with ID {user_id}: {e}")
 
     def delete_user(self, user_id):
@@ -94,8 +227,238 @@ class UserService:
         """
         try:
             response = self.client.delete(f'users/{user_id}')
-            logger.info(f"Deleted user with ID {user_id} successfully.")
+            logger.info("Deleted user with ID %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete user with ID %s: %s", user_id, e)
+            raise Exception(f"Failed to delete user with ID {user_id}: {e}")
+
+
+class AsyncUserService:
+    """
+    Async service class for Users API.
+    Provides the same operations as UserService using the AsyncAPIClient.
+    With ``models=True`` records are returned as User models instead of dicts.
+    """
+
+    def __init__(self, client=None, models=False):
+        self.client = client if client is not None else AsyncAPIClient()
+        self.models = models
+
+    def _decode(self, model, data):
+        """
+        Converts decoded JSON into ``model`` instances when the service returns models.
+        """
+        return decode(model, data) if self.models else data
+
+    async def fetch_all_users(self, params=None, lazy=False, page_size=None):
+        """
+        Fetch all users, or the subset selected by ``params``.
+
+        :param params: Query parameters: field filters such as {'username': 'Bret'}, ``_page``/``_limit``
+            or ``_start``/``_end`` slices
+        :type params: dict
+        :param lazy: Return an AsyncLazyCollection that fetches ``page_size`` users at a time as it is iterated,
+            prefetching the next page in the background, instead of a list
+        :type lazy: bool
+        :param page_size: Number of users per page when ``lazy`` is set, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :return: List of users, or an AsyncLazyCollection when ``lazy`` is set
+        :rtype: list or AsyncLazyCollection
+        """
+        if lazy:
+            fetch_page = logged_page_fetch_async(lambda page: self.client.get_page('users', page),
+                                                 lambda items: self._decode(User, items), 'users', logger)
+            return AsyncLazyCollection(fetch_page, page_size, params)
+        try:
+            response = self._decode(User, await self.client.get('users', params=params))
+            logger.info("Fetched all users successfully.")
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch all users: %s", e)
+            raise Exception(f"Failed to fetch all users: {e}")
+
+    async def iter_all_users(self, params=None):
+        """
+        Stream all users one at a time without loading the whole collection.
+
+        :param params: Query parameters, as for ``fetch_all_users``
+        :type params: dict
+        :return: Async iterator over users
+        :rtype: async iterator
+        """
+        try:
+            async for item in self.client.stream('users', params=params):
+                yield self._decode(User, item)
+            logger.info("Streamed all users successfully.")
+        except Exception as e:
+            logger.error("Failed to stream all users: %s", e)
+            raise Exception(f"Failed to stream all users: {e}")
+
+    async def iter_user_pages(self, page_size=None, params=None):
+        """
+        Fetch users one page at a time, requesting the next page only when the previous one is consumed.
+
+        :param page_size: Number of users per page, defaults to PAGE_SIZE from settings
+        :type page_size: int
+        :param params: Field filters applied to every page
+        :type params: dict
+        :return: Async iterator over pages of users
+        :rtype: async iterator
+        """
+        try:
+            async for page in iter_pages_async(lambda page: self.client.get('users', params={**(params or {}), **page}),
+                                         page_size, lambda items: self._decode(User, items)):
+                yield page
+            logger.info("Fetched all pages of users successfully.")
+        except Exception as e:
+            logger.error("Failed to fetch pages of users: %s", e)
+            raise Exception(f"Failed to fetch pages of users: {e}")
+
+    async def fetch_user_posts(self, user_id, params=None):
+        """
+        Fetch the posts of a user through the nested ``users/<id>/posts`` route.
+
+        :param user_id: ID of the user
+        :type user_id: int
+        :param params: Query parameters, as for ``fetch_all_users``
+        :type params: dict
+        :return: List of posts
+        :rtype: list
+        """
+        try:
+            response = self._decode(Post, await self.client.get(f'users/{user_id}/posts', params=params))
+            logger.info("Fetched posts of user %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch posts of user %s: %s", user_id, e)
+            raise Exception(f"Failed to fetch posts of user {user_id}: {e}")
+
+    async def fetch_user_albums(self, user_id, params=None):
+        """
+        Fetch the albums of a user through the nested ``users/<id>/albums`` route.
+
+        :param user_id: ID of the user
+        :type user_id: int
+        :param params: Query parameters, as for ``fetch_all_users``
+        :type params: dict
+        :return: List of albums
+        :rtype: list
+        """
+        try:
+            response = self._decode(Album, await self.client.get(f'users/{user_id}/albums', params=params))
+            logger.info("Fetched albums of user %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch albums of user %s: %s", user_id, e)
+            raise Exception(f"Failed to fetch albums of user {user_id}: {e}")
+
+    async def fetch_user_todos(self, user_id, params=None):
+        """
+        Fetch the todos of a user through the nested ``users/<id>/todos`` route.
+
+        :param user_id: ID of the user
+        :type user_id: int
+        :param params: Query parameters, as for ``fetch_all_users``
+        :type params: dict
+        :return: List of todos
+        :rtype: list
+        """
+        try:
+            response = self._decode(Todo, await self.client.get(f'users/{user_id}/todos', params=params))
+            logger.info("Fetched todos of user %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch todos of user %s: %s", user_id, e)
+            raise Exception(f"Failed to fetch todos of user {user_id}: {e}")
+
+    async def fetch_user_by_id(self, user_id):
+        """
+        Fetch a single user by ID.
+
+        :param user_id: ID of the user
+        :type user_id: int
+        :return: User data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(User, await self.client.get(f'users/{user_id}'))
+            logger.info("Fetched user by ID %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to fetch user by ID %s: %s", user_id, e)
+            raise Exception(f"Failed to fetch user by ID {user_id}: {e}")
+
+    async def fetch_users_by_ids(self, user_ids, max_workers=None):
+        """
+        Fetch several users by ID concurrently.
+
+        :param user_ids: IDs of the users; repeated IDs are fetched once
+        :type user_ids: list
+        :param max_workers: Maximum number of lookups running at once, defaults to BATCH_MAX_WORKERS from settings
+        :type max_workers: int
+        :return: User data in input order, with per-ID failures in ``errors``
+        :rtype: BatchResult
+        """
+        result = await fetch_many_async(self.fetch_user_by_id, user_ids, max_workers)
+        logger.info("Fetched %s users by ID with %s failures.", len(result.ids), len(result.errors))
+        return result
+
+    async def create_user(self, new_user):
+        """
+        Create a new user.
+
+        :param new_user: Data for the new user
+        :type new_user: dict or User
+        :return: Created user data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(User, await self.client.post('users', encode(new_user)))
+            logger.info("Created new user successfully: %s", new_user)
+            return response
+        except Exception as e:
+            logger.error("Failed to create user: %s", e)
+            raise Exception(f"Failed to create user: {e}")
+
+    async def update_user(self, user_id, updated_user):
+        """
+        Update an existing user.
+
+        :param user_id: ID of the user to update
+        :type user_id: int
+        :param updated_user: Updated data for the user
+        :type updated_user: dict or User
+        :return: Updated user data
+        :rtype: dict
+        """
+        try:
+            response = self._decode(User, await self.client.put(f'users/{user_id}', encode(updated_user)))
+            logger.info("Updated user with ID %s successfully: %s", user_id, updated_user)
             return response
         except Exception as e:
-            logger.error(f"Failed to delete user with ID {user_id}: {e}")
+            logger.error("Failed to update user with ID %s: %s", user_id, e)
+            raise Exception(f"Failed to update user with ID {user_id}: {e}")
+
+    async def delete_user(self, user_id):
+        """
+        Delete a user by ID.
+
+        :param user_id: ID of the user to delete
+        :type user_id: int
+        :return: HTTP status code
+        :rtype: int
+        """
+        try:
+            response = await self.client.delete(f'users/{user_id}')
+            logger.info("Deleted user with ID %s successfully.", user_id)
+            return response
+        except Exception as e:
+            logger.error("Failed to delete user with ID %s: %s", user_id, e)
             raise Exception(f"Failed to delete user with ID {user_id}: {e}")
+
+    async def close(self):
+        """
+        Close the underlying async client.
+        """
+        await self.client.close()
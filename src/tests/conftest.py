@@ -0,0 +1,21 @@
+import pytest
+from src.api.clients import APIClient
+from src.tests.stub_server import StubServer
+
+
+@pytest.fixture(scope='session')
+def api_client():
+    """
+    One APIClient per test process, shared by every service fixture.
+    Under pytest-xdist each worker gets its own client and connection pool.
+    """
+    return APIClient()
+
+
+@pytest.fixture(scope='session')
+def stub_server():
+    """
+    Local JSONPlaceholder stub for tests that must not depend on the public API.
+    """
+    with StubServer() as server:
+        yield server
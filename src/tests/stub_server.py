@@ -0,0 +1,183 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.mock_server.store import build_dataset
+
+ROUTE = re.compile(r'^/(?P<resource>[a-z]+)(?:/(?P<item_id>\d+))?/?$')
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the dataset of the owning StubServer over keep-alive HTTP/1.1.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY delayed ACKs stall every response by ~40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, body=None, etag=None):
+        if body is None:
+            body = json.dumps(payload).encode('utf-8')
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.command == 'GET' and status == 200 and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if self.command == 'GET':
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _injected_fault(self):
+        """
+        Serves the next queued fault, if any, and reports whether the request was handled.
+        """
+        fault = self.server.next_fault()
+        if fault is None:
+            return False
+        status, headers, delay = fault
+        if delay:
+            time.sleep(delay)
+        if status is None:
+            return False
+        body = b'{}'
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _route(self):
+        match = ROUTE.match(self.path.split('?', 1)[0])
+        if not match or match.group('resource') not in self.server.dataset:
+            return None, None
+        item_id = match.group('item_id')
+        return match.group('resource'), int(item_id) if item_id else None
+
+    def do_GET(self):
+        if self._injected_fault():
+            return
+        resource, item_id = self._route()
+        if resource is None:
+            return self._send_json(404, {})
+        records = self.server.dataset[resource]
+        if item_id is not None and not 1 <= item_id <= len(records):
+            return self._send_json(404, {})
+        body, etag = self.server.encoded(resource, item_id)
+        return self._send_json(200, None, body, etag)
+
+    def do_POST(self):
+        if self._injected_fault():
+            return
+        resource, item_id = self._route()
+        if resource is None or item_id is not None:
+            return self._send_json(404, {})
+        payload = self._read_json()
+        self._send_json(201, {**payload, 'id': len(self.server.dataset[resource]) + 1})
+
+    def do_PUT(self):
+        if self._injected_fault():
+            return
+        resource, item_id = self._route()
+        if resource is None or item_id is None:
+            return self._send_json(404, {})
+        payload = self._read_json()
+        self._send_json(200, {**payload, 'id': item_id})
+
+    def do_DELETE(self):
+        if self._injected_fault():
+            return
+        resource, item_id = self._route()
+        if resource is None or item_id is None:
+            return self._send_json(404, {})
+        self._send_json(200, {})
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    # Concurrent clients open many connections at once; the default backlog of 5 drops SYNs
+    request_queue_size = 128
+
+
+class StubServer:
+    """
+    In-process JSONPlaceholder stand-in running on a background thread.
+
+    Attributes:
+        base_url (str): The base URL to point an APIClient at.
+    """
+
+    def __init__(self, sizes=None, host='127.0.0.1', port=0):
+        self._server = _StubHTTPServer((host, port), StubRequestHandler)
+        self._server.daemon_threads = True
+        self._server.dataset = build_dataset(sizes)
+        self._server.encoded = self._encoded
+        self._bodies = {}
+        self._bodies_lock = threading.Lock()
+        self._server.faults = []
+        self._server.faults_lock = threading.Lock()
+        self._server.next_fault = self._next_fault
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+
+    def _encoded(self, resource, item_id):
+        """
+        Returns the JSON body and ETag of a record or collection, encoding each once; writes never change the dataset.
+        """
+        key = (resource, item_id)
+        with self._bodies_lock:
+            cached = self._bodies.get(key)
+        if cached is None:
+            records = self._server.dataset[resource]
+            body = json.dumps(records if item_id is None else records[item_id - 1]).encode('utf-8')
+            cached = (body, f'"{hashlib.md5(body).hexdigest()}"')
+            with self._bodies_lock:
+                self._bodies[key] = cached
+        return cached
+
+    def _next_fault(self):
+        with self._server.faults_lock:
+            return self._server.faults.pop(0) if self._server.faults else None
+
+    def inject(self, status=None, count=1, headers=None, delay=0):
+        """
+        Makes the next ``count`` requests fail with ``status`` and/or stall for ``delay`` seconds.
+        A fault with only a delay still serves the normal response afterwards.
+        """
+        with self._server.faults_lock:
+            self._server.faults.extend([(status, headers, delay)] * count)
+
+    def reset_faults(self):
+        with self._server.faults_lock:
+            self._server.faults.clear()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
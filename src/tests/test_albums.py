@@ -1,19 +1,15 @@
 import pytest
-import json
-import os
 from src.services.album_service import AlbumService
+from src.utils.helpers import load_test_data
 from src.utils.logging_utils import setup_logging
 
 
-@pytest.fixture(scope='class')
-def album_service():
-    service = AlbumService()
+@pytest.fixture(scope='session')
+def album_service(api_client):
+    service = AlbumService(api_client)
     logger = setup_logging('albums')
-    logger.info("Initialized AlbumService for test class.")
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_file = os.path.join(base_dir, '../data/albums_test_data.json')
-    with open(data_file) as f:
-        test_data = json.load(f)
+    logger.info("Initialized AlbumService for test session.")
+    test_data = load_test_data('albums')
     return service, logger, test_data
 
 
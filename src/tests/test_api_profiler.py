@@ -0,0 +1,79 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from src.api import metrics
+from src.api.clients import APIClient
+from src.api.metrics import MetricsRecorder
+from src.api.pool import ConnectionPool
+from src.utils.api_profiler import PROFILE_PROPERTY, APIProfiler, _network_time, compare_reports
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = APIProfiler(top=5, report_path=str(tmp_path / 'profile.json'))
+    metrics.add_listener(profiler._on_request)
+    profiler._recording = True
+    yield profiler
+    metrics.remove_listener(profiler._on_request)
+
+
+def _report(nodeid, duration, user_properties=()):
+    return SimpleNamespace(nodeid=nodeid, duration=duration, user_properties=list(user_properties))
+
+
+class TestAPIProfiler:
+    """
+    Test class for the pytest plugin attributing API calls to tests.
+    """
+
+    def test_network_time_merges_overlapping_calls(self):
+        """
+        Test that concurrent requests are counted once towards network time.
+        """
+        assert _network_time([]) == 0.0
+        assert _network_time([(0.0, 1.0), (0.5, 1.5), (3.0, 4.0)]) == pytest.approx(2.5)
+
+    def test_calls_are_attributed_to_the_running_test(self, stub_server, profiler):
+        """
+        Test that requests made during a test end up in its report and in the endpoint totals.
+        """
+        client = APIClient(base_url=stub_server.base_url, pool=ConnectionPool(), metrics=MetricsRecorder())
+        for post_id in range(1, 4):
+            client.get(f'posts/{post_id}')
+        client.get('users')
+        profile = profiler._drain()
+        assert profile['calls'] == 4
+        assert 0 < profile['network']
+        profiler.pytest_runtest_logreport(_report('test_a.py::test_a', 0.1))
+        profiler.pytest_runtest_logreport(_report('test_a.py::test_a', 0.2, [(PROFILE_PROPERTY, profile)]))
+        report = profiler.report()
+        assert report['endpoints']['GET posts/{id}']['calls'] == 3
+        assert report['endpoints']['GET users']['calls'] == 1
+        test = report['tests']['test_a.py::test_a']
+        assert test['calls'] == 4
+        assert test['duration'] == pytest.approx(0.3)
+        assert test['local'] == pytest.approx(0.3 - profile['network'], abs=1e-3)
+
+    def test_requests_outside_tests_are_ignored(self, stub_server, profiler):
+        """
+        Test that calls made while no test is running are not attributed.
+        """
+        profiler._recording = False
+        APIClient(base_url=stub_server.base_url, pool=ConnectionPool(), metrics=MetricsRecorder()).get('todos/1')
+        assert profiler._drain()['calls'] == 0
+
+    def test_report_is_diffable(self, profiler):
+        """
+        Test that the written report has sorted keys and regressions are found against a baseline.
+        """
+        baseline = {'endpoints': {'GET posts/{id}': {'p90': 0.010}, 'GET users': {'p90': 0.010}}}
+        current = {'endpoints': {'GET posts/{id}': {'p90': 0.011}, 'GET users': {'p90': 0.050}}}
+        assert compare_reports(baseline, current, threshold=0.2) == [('GET users', 0.010, 0.050)]
+        profiler.pytest_runtest_logreport(_report('test_b.py::test_b', 0.1))
+        terminal = SimpleNamespace(write_line=lambda line: None, write_sep=lambda sep, title: None)
+        profiler.pytest_terminal_summary(terminal, 0, SimpleNamespace())
+        with open(profiler.report_path) as f:
+            text = f.read()
+        assert json.loads(text)['tests']['test_b.py::test_b']['duration'] == 0.1
+        assert text == json.dumps(json.loads(text), indent=2, sort_keys=True)
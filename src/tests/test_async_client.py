@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from requests.exceptions import HTTPError, RequestException
+from src.api.async_client import AsyncAPIClient
+from src.services.photo_service import AsyncPhotoService
+from src.services.post_service import AsyncPostService
+
+
+class TestAsyncAPIClient:
+    """
+    Test class for AsyncAPIClient and the async service layer.
+    """
+
+    def test_crud_round_trip(self, stub_server):
+        """
+        Test that every verb works through one async client.
+        """
+        async def scenario():
+            async with AsyncAPIClient(base_url=stub_server.base_url) as client:
+                service = AsyncPostService(client)
+                fetched = await service.fetch_post_by_id(1)
+                created = await service.create_post({'title': 'foo', 'body': 'bar', 'userId': 1})
+                updated = await service.update_post(1, {'title': 'updated title'})
+                deleted = await service.delete_post(1)
+                return fetched, created, updated, deleted
+
+        fetched, created, updated, deleted = asyncio.run(scenario())
+        assert fetched['id'] == 1
+        assert created['title'] == 'foo'
+        assert updated['title'] == 'updated title'
+        assert deleted == 200
+
+    def test_fan_out_respects_concurrency_limit(self, stub_server):
+        """
+        Test that hundreds of concurrent calls complete while in-flight requests stay bounded.
+        """
+        async def scenario():
+            async with AsyncAPIClient(base_url=stub_server.base_url, max_concurrency=8) as client:
+                service = AsyncPhotoService(client)
+                photos = await asyncio.gather(*(service.fetch_photo_by_id(i) for i in range(1, 301)))
+                return photos, client._session.connector.limit
+
+        photos, limit = asyncio.run(scenario())
+        assert [photo['id'] for photo in photos] == list(range(1, 301))
+        assert limit == 8
+
+    def test_errors_keep_sync_exception_types(self, stub_server):
+        """
+        Test that HTTP and network failures surface as the same exceptions as APIClient.
+        """
+        async def fetch(base_url, endpoint):
+            async with AsyncAPIClient(base_url=base_url) as client:
+                return await client.get(endpoint)
+
+        with pytest.raises(HTTPError):
+            asyncio.run(fetch(stub_server.base_url, 'posts/100000'))
+        with pytest.raises(RequestException):
+            asyncio.run(fetch('http://127.0.0.1:9', 'posts/1'))
+
+    def test_service_wraps_client_errors(self, stub_server):
+        """
+        Test that async services wrap failures like their sync counterparts.
+        """
+        async def scenario():
+            service = AsyncPostService(AsyncAPIClient(base_url=stub_server.base_url))
+            try:
+                await service.fetch_post_by_id(100000)
+            finally:
+                await service.close()
+
+        with pytest.raises(Exception, match='Failed to fetch post by ID 100000'):
+            asyncio.run(scenario())
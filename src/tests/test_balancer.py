@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.balancer import LeastOutstanding, LoadBalancer, resolve_base_url
+from src.api.clients import APIClient
+from src.api.metrics import MetricsRecorder
+from src.api.pool import ConnectionPool
+from src.api.retry import RetryBudget, RetryPolicy
+from src.config.settings import settings
+from src.mock_server.app import MockServer, create_app
+
+# Nothing listens on port 1, so connections are refused at once
+DEAD_URL = 'http://127.0.0.1:1'
+
+
+@pytest.fixture(scope='module')
+def replicas():
+    failing_app = create_app(error_rate=1.0, error_status=503)
+    with MockServer(create_app()) as first, MockServer(create_app()) as second, \
+            MockServer(create_app(latency=0.2)) as slow, MockServer(failing_app) as failing:
+        yield {'fast': [first.base_url, second.base_url], 'slow': slow.base_url, 'failing': failing.base_url}
+
+
+def make_client(base_urls, strategy, **balancer_kwargs):
+    policy = RetryPolicy(max_retries=3, base_delay=0.001, max_delay=0.01, budget=RetryBudget(min_retries=1000))
+    return APIClient(pool=ConnectionPool(), retry=policy, metrics=MetricsRecorder(), coalescer=False,
+                     balancer=LoadBalancer(base_urls, strategy, **balancer_kwargs))
+
+
+class TestLoadBalancing:
+    """
+    Test class for balancing requests over several base URLs, with passive health checks.
+    """
+
+    def test_round_robin_spreads_requests_evenly(self, replicas):
+        """
+        Test that round-robin sends the same number of requests to every replica.
+        """
+        client = make_client(replicas['fast'] + [replicas['slow']], 'round_robin')
+        for user_id in range(1, 10):
+            assert client.get(f'users/{user_id}')['id'] == user_id
+        client.pool.close()
+        assert [stats['requests'] for stats in client.balancer_stats().values()] == [3, 3, 3]
+
+    def test_ewma_avoids_a_slow_replica(self, replicas):
+        """
+        Test that the latency-aware strategy stops using a slow replica once it has seen it, keeping p90 low.
+        """
+        client = make_client([replicas['slow']] + replicas['fast'], 'ewma')
+        elapsed = []
+        for post_id in range(1, 41):
+            started = time.perf_counter()
+            client.get(f'posts/{post_id}')
+            elapsed.append(time.perf_counter() - started)
+        client.pool.close()
+        stats = client.balancer_stats()
+        assert stats[replicas['slow']]['requests'] <= 2
+        assert stats[replicas['slow']]['ewma_ms'] >= 200
+        assert sorted(elapsed)[int(len(elapsed) * 0.9)] < 0.1
+
+    def test_least_outstanding_prefers_idle_replicas(self):
+        """
+        Test that requests go to the replicas with the fewest requests in flight.
+        """
+        balancer = LoadBalancer(['http://a', 'http://b', 'http://c'], LeastOutstanding())
+        busy = balancer.acquire()
+        chosen = {balancer.acquire().base_url, balancer.acquire().base_url}
+        assert busy.base_url not in chosen and len(chosen) == 2
+        balancer.release(busy, 0.01, 200)
+        assert balancer.acquire() is busy
+
+    def test_failing_replicas_are_ejected(self, replicas):
+        """
+        Test that retries fail over to healthy replicas and that refusing or failing ones are ejected.
+        """
+        client = make_client([DEAD_URL, replicas['failing']] + replicas['fast'], 'round_robin', max_failures=2)
+        for todo_id in range(1, 21):
+            assert client.get(f'todos/{todo_id}')['id'] == todo_id
+        client.pool.close()
+        stats = client.balancer_stats()
+        for base_url in (DEAD_URL, replicas['failing']):
+            assert stats[base_url] == {**stats[base_url], 'requests': 2, 'failures': 2, 'ejections': 1, 'ejected': True}
+        assert client.retry_stats()['retries'] == 4
+
+    def test_ejected_replicas_return_on_probation(self):
+        """
+        Test that an ejected replica gets traffic again after the ejection time, and one failure ejects it again.
+        """
+        balancer = LoadBalancer(['http://a', 'http://b'], 'round_robin', max_failures=3, ejection_time=0.05)
+        failing = balancer.endpoints[0]
+        for _ in range(3):
+            balancer.release(failing, 0.01, error=ConnectionError())
+        assert {balancer.acquire().base_url for _ in range(4)} == {'http://b'}
+        time.sleep(0.06)
+        assert failing in [balancer.acquire() for _ in range(2)]
+        balancer.release(failing, 0.01, 502)
+        assert balancer.stats()['http://a']['ejections'] == 2
+
+    def test_all_replicas_ejected(self):
+        """
+        Test that requests still go out when every replica is ejected.
+        """
+        balancer = LoadBalancer(['http://a', 'http://b'], 'least_outstanding', max_failures=1)
+        for endpoint in balancer.endpoints:
+            balancer.release(endpoint, 0.01, 503)
+        assert balancer.acquire() in balancer.endpoints
+
+    def test_base_url_lists(self, replicas):
+        """
+        Test that clients accept a list or comma-separated string of base URLs, and keep one key for caching.
+        """
+        base_url, balancer = resolve_base_url(', '.join(replicas['fast']))
+        assert base_url == replicas['fast'][0] and len(balancer.endpoints) == 2
+        assert resolve_base_url(replicas['fast'][1]) == (replicas['fast'][1], None)
+        routed = balancer.route(f'{base_url}/posts?userId=1', balancer.endpoints[1])
+        assert routed == f'{replicas["fast"][1]}/posts?userId=1'
+        with pytest.raises(ValueError):
+            LoadBalancer(replicas['fast'], 'random')
+
+    def test_base_url_settings(self, replicas):
+        """
+        Test that a single replica in API_BASE_URLS is used without API_BASE_URL, and an empty list is rejected.
+        """
+        with settings.override(API_BASE_URLS=f"{replicas['fast'][0]}/"):
+            assert resolve_base_url() == (replicas['fast'][0], None)
+        for empty in ([], ' , '):
+            with pytest.raises(ValueError):
+                resolve_base_url(empty)
+        with settings.override(API_BASE_URLS=','), pytest.raises(ValueError):
+            resolve_base_url()
+
+    def test_async_client_balances(self, replicas):
+        """
+        Test that the async client spreads concurrent requests over the replicas.
+        """
+        async def run():
+            async with AsyncAPIClient(base_url=replicas['fast'], metrics=MetricsRecorder(), coalescer=False) as client:
+                await asyncio.gather(*(client.get(f'comments/{comment_id}') for comment_id in range(1, 21)))
+                return client.balancer_stats()
+
+        stats = asyncio.run(run())
+        assert sum(replica['requests'] for replica in stats.values()) == 20
+        assert all(replica['requests'] > 0 and replica['outstanding'] == 0 for replica in stats.values())
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.services.photo_service import AsyncPhotoService, PhotoService
+from src.utils.helpers import fetch_many
+
+
+class TestBatchFetch:
+    """
+    Test class for the concurrent fetch-by-IDs methods.
+    """
+
+    def test_results_keep_input_order(self, stub_server):
+        """
+        Test that a batch returns items aligned with the requested IDs.
+        """
+        service = PhotoService()
+        service.client = APIClient(base_url=stub_server.base_url)
+        photo_ids = [50, 3, 4999, 1, 720]
+        result = service.fetch_photos_by_ids(photo_ids, max_workers=4)
+        assert result.ok
+        assert [photo['id'] for photo in result] == photo_ids
+
+    def test_failures_do_not_abort_batch(self, stub_server):
+        """
+        Test that a missing ID is reported while the other lookups still succeed.
+        """
+        service = PhotoService()
+        service.client = APIClient(base_url=stub_server.base_url)
+        result = service.fetch_photos_by_ids([1, 999999, 2])
+        assert not result.ok
+        assert list(result.errors) == [999999]
+        assert result.results[0]['id'] == 1
+        assert result.results[1] is None
+        assert result.results[2]['id'] == 2
+
+    def test_repeated_ids_are_fetched_once(self):
+        """
+        Test that duplicate IDs share a single lookup.
+        """
+        calls = []
+        lock = threading.Lock()
+
+        def fetch(item_id):
+            with lock:
+                calls.append(item_id)
+            return {'id': item_id}
+
+        result = fetch_many(fetch, [1, 2, 1, 3, 2], max_workers=3)
+        assert sorted(calls) == [1, 2, 3]
+        assert [item['id'] for item in result] == [1, 2, 1, 3, 2]
+
+    def test_async_batch(self, stub_server):
+        """
+        Test the async batch variant against the stub server.
+        """
+        async def scenario():
+            async with AsyncAPIClient(base_url=stub_server.base_url) as client:
+                return await AsyncPhotoService(client).fetch_photos_by_ids([7, 0, 7, 8], max_workers=2)
+
+        result = asyncio.run(scenario())
+        assert list(result.errors) == [0]
+        assert [photo and photo['id'] for photo in result] == [7, None, 7, 8]
@@ -0,0 +1,63 @@
+import json
+
+from src.benchmarks.run import build_cases, compare, main, run_benchmarks
+
+
+class TestBenchmarks:
+    """
+    Test class for the benchmark suite.
+    """
+
+    def test_matrix_runs_sync_once_per_payload(self):
+        """
+        Test that sync mode is not repeated for every concurrency level.
+        """
+        names = [case.name for case in build_cases(('sync', 'async'), ('small',), (8, 32))]
+        assert names == ['sync/small/c1', 'async/small/c8', 'async/small/c32']
+
+    def test_every_mode_reports_throughput_and_percentiles(self):
+        """
+        Test that each mode completes against the stub and reports its measurements.
+        """
+        results = run_benchmarks(build_cases(payloads=('small',), concurrency_levels=(4,), requests=20), isolate=False)
+        assert set(results) == {'sync/small/c1', 'threaded/small/c4', 'async/small/c4'}
+        for result in results.values():
+            assert result['rps'] > 0
+            assert 0 < result['p50_ms'] <= result['p90_ms'] <= result['p99_ms']
+            assert result['peak_rss_mb'] > 0
+
+    def test_regressions_are_detected(self):
+        """
+        Test that lower throughput, higher latency and higher memory beyond the tolerance are flagged.
+        """
+        baseline = {'sync/small/c1': {'rps': 1000, 'p90_ms': 2.0, 'peak_rss_mb': 50}}
+        assert compare(baseline, {'sync/small/c1': {'rps': 900, 'p90_ms': 2.2, 'peak_rss_mb': 55}}, 0.25) == []
+        regressions = compare(baseline, {'sync/small/c1': {'rps': 500, 'p90_ms': 4.0, 'peak_rss_mb': 50}}, 0.25)
+        assert len(regressions) == 2
+
+    def test_baselines_are_scaled_to_the_machine(self):
+        """
+        Test that a slower, bigger machine is not a regression while a slower client on it still is.
+        """
+        baseline = {'calibration': {'rps': 4000, 'rss_mb': 40},
+                    'sync/small/c1': {'rps': 1000, 'p90_ms': 2.0, 'peak_rss_mb': 50}}
+        machine = {'calibration': {'rps': 2000, 'rss_mb': 60}}
+        same_client = {**machine, 'sync/small/c1': {'rps': 500, 'p90_ms': 4.0, 'peak_rss_mb': 70}}
+        assert compare(baseline, same_client, 0.25) == []
+        slower_client = {**machine, 'sync/small/c1': {'rps': 250, 'p90_ms': 4.0, 'peak_rss_mb': 70}}
+        regressions = compare(baseline, slower_client, 0.25)
+        assert regressions == ['sync/small/c1: throughput 500.0 -> 250 req/s']
+
+    def test_baseline_round_trip(self, tmp_path):
+        """
+        Test that a saved baseline is compared against on the next run and a regression fails it.
+        """
+        baseline = tmp_path / 'baseline.json'
+        args = ['--modes', 'sync', '--payloads', 'small', '--requests', '20', '--baseline', str(baseline)]
+        assert main(args + ['--save-baseline']) == 0
+        assert main(args + ['--tolerance', '10']) == 0
+        stored = json.loads(baseline.read_text())
+        assert stored['calibration']['rps'] > 0
+        stored['sync/small/c1']['rps'] *= 1000
+        baseline.write_text(json.dumps(stored))
+        assert main(args) == 1
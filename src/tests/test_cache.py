@@ -0,0 +1,118 @@
+import time
+
+from src.api.cache import ResponseCache
+from src.api.clients import APIClient
+from src.api.pool import ConnectionPool
+from src.config.settings import settings
+
+
+def make_client(stub_server, **cache_kwargs):
+    return APIClient(base_url=stub_server.base_url, pool=ConnectionPool(), cache=ResponseCache(**cache_kwargs))
+
+
+class TestResponseCache:
+    """
+    Test class for the opt-in GET response cache.
+    """
+
+    def test_fresh_entries_skip_the_network(self, stub_server):
+        """
+        Test that a repeated GET within its TTL is served from the cache.
+        """
+        client = make_client(stub_server)
+        first = client.get('users/1')
+        first['name'] = 'mutated by caller'
+        second = client.get('users/1')
+        assert second['name'] == 'User 1'
+        assert client.pool_stats()['requests'] == 1
+        assert client.cache_stats()['hits'] == 1
+        assert client.cache_stats()['misses'] == 1
+
+    def test_stale_entries_revalidate_with_etag(self, stub_server):
+        """
+        Test that an expired entry is revalidated with If-None-Match and reused on 304.
+        """
+        client = make_client(stub_server, default_ttl=0)
+        client.get('albums')
+        assert len(client.get('albums')) == 100
+        stats = client.cache_stats()
+        assert stats['revalidated'] == 1
+        assert stats['hits'] == 0
+        assert client.pool_stats()['requests'] == 2
+
+    def test_per_endpoint_ttls(self):
+        """
+        Test that the longest matching endpoint prefix decides the TTL.
+        """
+        cache = ResponseCache(default_ttl=5, ttls={'posts': 30, 'posts/1/comments': 1})
+        assert cache.ttl_for('users') == 5
+        assert cache.ttl_for('posts/7') == 30
+        assert cache.ttl_for('posts/1/comments?_limit=2') == 1
+        assert cache.ttl_for('postsx') == 5
+        with settings.override(CACHE_TTLS={'users': 300}):
+            assert ResponseCache(default_ttl=5).ttl_for('users/1') == 300
+
+    def test_lru_eviction(self, stub_server):
+        """
+        Test that the least recently used entry is evicted once the cache is full.
+        """
+        client = make_client(stub_server, max_entries=2)
+        client.get('posts/1')
+        client.get('posts/2')
+        client.get('posts/1')
+        client.get('posts/3')
+        client.get('posts/1')
+        client.get('posts/2')
+        stats = client.cache_stats()
+        assert stats['evictions'] == 2
+        assert stats['size'] == 2
+        assert stats['hits'] == 2
+
+    def test_writes_invalidate_related_paths(self, stub_server):
+        """
+        Test that a write drops the resource and its parent collection but leaves siblings cached.
+        """
+        client = make_client(stub_server, default_ttl=300)
+        for endpoint in ('posts', 'posts/1', 'posts/2', 'users'):
+            client.get(endpoint)
+        client.put('posts/1', {'title': 'updated title'})
+        assert client.cache_stats()['invalidations'] == 2
+        requests_before = client.pool_stats()['requests']
+        client.get('posts/2')
+        client.get('users')
+        assert client.pool_stats()['requests'] == requests_before
+        client.get('posts/1')
+        assert client.pool_stats()['requests'] == requests_before + 1
+
+    def test_reads_during_a_write_are_not_kept(self, stub_server):
+        """
+        Test that a GET cached while a write to the same resource is in flight is dropped once the write succeeds.
+        """
+        client = make_client(stub_server, default_ttl=300)
+        send = client._send
+
+        def send_racing_a_read(method, endpoint, url, **kwargs):
+            if method == 'PUT':
+                client.get('posts/1')
+            return send(method, endpoint, url, **kwargs)
+
+        client._send = send_racing_a_read
+        client.put('posts/1', {'title': 'updated title'})
+        requests_before = client.pool_stats()['requests']
+        client.get('posts/1')
+        assert client.pool_stats()['requests'] == requests_before + 1
+
+    def test_entries_expire(self):
+        """
+        Test that freshness follows the configured TTL.
+        """
+        cache = ResponseCache(default_ttl=0.05)
+
+        class Response:
+            headers = {}
+            content = b'[]'
+
+        cache.store('GET /users', 'users', Response())
+        assert cache.lookup('GET /users').is_fresh()
+        time.sleep(0.06)
+        assert not cache.lookup('GET /users').is_fresh()
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from requests.exceptions import HTTPError
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.api.coalesce import AsyncRequestCoalescer, RequestCoalescer
+from src.api.metrics import MetricsRecorder
+from src.api.pool import ConnectionPool
+from src.config.settings import settings
+from src.mock_server.app import MockServer, create_app
+
+CALLERS = 8
+
+
+@pytest.fixture(scope='class')
+def slow_server():
+    with MockServer(create_app(latency=0.2)) as server:
+        yield server
+
+
+def wait_for_waiters(coalescer, count):
+    deadline = time.monotonic() + 5
+    while coalescer.stats()['coalesced'] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestRequestCoalescing:
+    """
+    Test class for in-flight deduplication of identical GETs.
+    """
+
+    def test_threads_share_one_call(self):
+        """
+        Test that callers arriving while a call is in flight get its result without running it again.
+        """
+        coalescer = RequestCoalescer()
+        release = threading.Event()
+        calls = []
+
+        def fetch(user_id):
+            calls.append(user_id)
+            release.wait(5)
+            return {'id': user_id}
+
+        with ThreadPoolExecutor(CALLERS) as executor:
+            futures = [executor.submit(coalescer.do, 'users/1', fetch, 1) for _ in range(CALLERS)]
+            wait_for_waiters(coalescer, CALLERS - 1)
+            release.set()
+            results = [future.result() for future in futures]
+        assert calls == [1]
+        assert all(result == {'id': 1} for result in results)
+        assert len({id(result) for result in results}) == CALLERS
+        assert coalescer.stats() == {'executed': 1, 'coalesced': CALLERS - 1, 'in_flight': 0}
+        coalescer.do('users/1', fetch, 1)
+        assert calls == [1, 1]
+
+    def test_errors_reach_every_waiter(self):
+        """
+        Test that waiters receive the exception of the call they joined, and the key is released afterwards.
+        """
+        coalescer = RequestCoalescer()
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise HTTPError('404 Error')
+
+        with ThreadPoolExecutor(3) as executor:
+            futures = [executor.submit(coalescer.do, 'users/0', fail) for _ in range(3)]
+            wait_for_waiters(coalescer, 2)
+            release.set()
+            for future in futures:
+                with pytest.raises(HTTPError):
+                    future.result()
+        assert coalescer.do('users/0', lambda: 'recovered') == 'recovered'
+
+    def test_client_coalesces_concurrent_gets(self, slow_server):
+        """
+        Test that concurrent identical GETs from threads reach the server once, while other URLs do not coalesce.
+        """
+        recorder, pool = MetricsRecorder(), ConnectionPool()
+        client = APIClient(base_url=slow_server.base_url, pool=pool, metrics=recorder, coalescer=RequestCoalescer())
+        barrier = threading.Barrier(CALLERS)
+
+        def fetch(index):
+            barrier.wait()
+            return client.get('users/1') if index % 2 else client.get('posts', params={'userId': 1})
+
+        with ThreadPoolExecutor(CALLERS) as executor:
+            results = list(executor.map(fetch, range(CALLERS)))
+        pool.close()
+        assert all(result['id'] == 1 for result in results[1::2])
+        assert all(len(result) == 10 for result in results[::2])
+        endpoints = recorder.summary()['endpoints']
+        assert endpoints['GET users/{id}']['requests'] == 1
+        assert endpoints['GET posts']['requests'] == 1
+        assert client.coalesce_stats() == {'executed': 2, 'coalesced': CALLERS - 2, 'in_flight': 0}
+
+    def test_clients_do_not_share_coalescers(self, slow_server):
+        """
+        Test that identical GETs through different clients are sent separately, each with its own configuration.
+        """
+        recorder, pool = MetricsRecorder(), ConnectionPool()
+        with settings.override(COALESCE_REQUESTS=True):
+            clients = [APIClient(base_url=slow_server.base_url, pool=pool, metrics=recorder) for _ in range(2)]
+        assert clients[0].coalescer is not clients[1].coalescer
+        with ThreadPoolExecutor(2) as executor:
+            list(executor.map(lambda client: client.get('users/1'), clients))
+        pool.close()
+        assert recorder.summary()['endpoints']['GET users/{id}']['requests'] == 2
+
+    def test_async_client_coalesces_concurrent_gets(self, slow_server):
+        """
+        Test that concurrent identical GETs from tasks reach the server once.
+        """
+        recorder = MetricsRecorder()
+
+        async def run():
+            async with AsyncAPIClient(base_url=slow_server.base_url, metrics=recorder,
+                                      coalescer=AsyncRequestCoalescer()) as client:
+                results = await asyncio.gather(*(client.get('users/1') for _ in range(CALLERS)))
+                return results, client.coalesce_stats()
+
+        results, stats = asyncio.run(run())
+        assert all(result == results[0] for result in results)
+        results[0]['name'] = 'changed'
+        assert results[1]['name'] != 'changed'
+        assert recorder.summary()['endpoints']['GET users/{id}']['requests'] == 1
+        assert stats == {'executed': 1, 'coalesced': CALLERS - 1, 'in_flight': 0}
+
+    def test_cancelled_waiter_does_not_cancel_the_call(self):
+        """
+        Test that cancelling the task that started a call leaves it running for the other waiters.
+        """
+        coalescer = AsyncRequestCoalescer()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return {'id': 1}
+
+        async def run():
+            first = asyncio.ensure_future(coalescer.do('users/1', fetch))
+            second = asyncio.ensure_future(coalescer.do('users/1', fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second, first.cancelled()
+
+        assert asyncio.run(run()) == ({'id': 1}, True)
+        assert coalescer.stats() == {'executed': 1, 'coalesced': 1, 'in_flight': 0}
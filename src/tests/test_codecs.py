@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import CODECS, APIClient, get_codec
+from src.api.pool import ConnectionPool
+from src.benchmarks.codecs import benchmark_codecs
+
+
+@pytest.fixture(params=sorted(CODECS))
+def codec(request):
+    return CODECS[request.param]
+
+
+class TestCodecs:
+    """
+    Test class for the pluggable JSON codecs.
+    """
+
+    def test_codec_selection(self):
+        """
+        Test that 'auto' picks the fastest installed backend and unknown names are rejected.
+        """
+        assert get_codec('auto') is next(iter(CODECS.values()))
+        assert get_codec('json').name == 'json'
+        with pytest.raises(ValueError):
+            get_codec('yaml')
+
+    def test_codecs_agree(self, codec):
+        """
+        Test that every codec encodes compact UTF-8 bytes and decodes bytes to the same objects.
+        """
+        record = {'id': 1, 'title': 'café', 'completed': False, 'tags': [1.5, None]}
+        encoded = codec.dumps(record)
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == record
+        assert b' ' not in encoded.replace('café'.encode(), b'')
+        assert codec.loads(json.dumps(record).encode('utf-8')) == record
+        assert json.loads(codec.dumps({1: 'a', 2: ['b']})) == {'1': 'a', '2': ['b']}
+
+    def test_clients_use_the_codec(self, stub_server, codec):
+        """
+        Test that the sync and async clients encode bodies and decode responses with their codec.
+        """
+        pool = ConnectionPool()
+        client = APIClient(base_url=stub_server.base_url, pool=pool, codec=codec)
+        assert len(client.get('photos')) == 5000
+        assert client.post('posts', {'title': 'café', 'userId': 1})['title'] == 'café'
+        pool.close()
+
+        async def run():
+            async with AsyncAPIClient(base_url=stub_server.base_url, codec=codec) as async_client:
+                return await async_client.put('posts/1', {'id': 1, 'title': 'thé'})
+
+        assert asyncio.run(run())['title'] == 'thé'
+
+    def test_parse_time_benchmark(self):
+        """
+        Test that the benchmark times every installed codec on the photos payload.
+        """
+        results = benchmark_codecs(repeat=2)
+        assert set(results) == set(CODECS)
+        assert results['json']['loads_speedup'] == 1.0
+        assert all(result['loads_ms'] > 0 and result['dumps_ms'] > 0 for result in results.values())
@@ -1,19 +1,15 @@
 import pytest
-import json
-import os
 from src.services.comment_service import CommentService
+from src.utils.helpers import load_test_data
 from src.utils.logging_utils import setup_logging
 
 
-@pytest.fixture(scope='class')
-def comment_service():
-    service = CommentService()
+@pytest.fixture(scope='session')
+def comment_service(api_client):
+    service = CommentService(api_client)
     logger = setup_logging('comments')
-    logger.info("Initialized CommentService for test class.")
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_file = os.path.join(base_dir, '../data/comments_test_data.json')
-    with open(data_file) as f:
-        test_data = json.load(f)
+    logger.info("Initialized CommentService for test session.")
+    test_data = load_test_data('comments')
     return service, logger, test_data
 
 
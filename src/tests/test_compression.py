@@ -0,0 +1,103 @@
+import asyncio
+import gzip
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import SUPPORTED_ENCODINGS, APIClient
+from src.api.compression import build_accept_encoding, compress_body
+from src.api.metrics import MetricsRecorder
+from src.api.pool import ConnectionPool
+from src.mock_server.app import MockServer, create_app
+
+
+@pytest.fixture(scope='class')
+def mock_server():
+    with MockServer(create_app()) as server:
+        yield server
+
+
+@pytest.fixture
+def recorder():
+    return MetricsRecorder()
+
+
+@pytest.fixture
+def make_client(mock_server, recorder):
+    pool = ConnectionPool()
+    yield lambda **kwargs: APIClient(base_url=mock_server.base_url, pool=pool, metrics=recorder, **kwargs)
+    pool.close()
+
+
+class TestCompression:
+    """
+    Test class for response and request compression.
+    """
+
+    def test_accept_encoding_negotiation(self):
+        """
+        Test that 'auto' lists the decodable codings by preference and undecodable ones are rejected.
+        """
+        assert build_accept_encoding('auto', ('deflate', 'gzip', 'br')) == 'br, gzip, deflate'
+        assert build_accept_encoding('identity', ('gzip',)) == 'identity'
+        assert build_accept_encoding('gzip, deflate', ('gzip', 'deflate')) == 'gzip, deflate'
+        assert 'gzip' in APIClient(accept_encoding='auto').accept_encoding
+        with pytest.raises(ValueError):
+            build_accept_encoding('snappy', SUPPORTED_ENCODINGS)
+
+    def test_request_bodies_compress_above_the_threshold(self):
+        """
+        Test that only bodies of at least the minimum size are gzipped, and never when it is 0.
+        """
+        body = b'{"title":"' + b'x' * 2000 + b'"}'
+        compressed, headers = compress_body(body, 1024)
+        assert headers == {'Content-Encoding': 'gzip'}
+        assert gzip.decompress(compressed) == body
+        assert compress_body(b'{}', 1024) == (b'{}', {})
+        assert compress_body(body, 0) == (body, {})
+
+    def test_responses_are_smaller_on_the_wire(self, make_client, recorder):
+        """
+        Test that gzipped responses decode transparently and the metrics report both sizes.
+        """
+        photos = make_client().get('photos')
+        assert len(photos) == 5000
+        series = recorder.summary()['endpoints']['GET photos']
+        assert 0 < series['wire_bytes_in'] * 4 < series['bytes_in']
+
+    def test_identity_disables_response_compression(self, make_client, recorder):
+        """
+        Test that 'identity' receives uncompressed bodies, so both sizes match.
+        """
+        make_client(accept_encoding='identity').get('photos')
+        series = recorder.summary()['endpoints']['GET photos']
+        assert series['wire_bytes_in'] == series['bytes_in']
+
+    def test_gzipped_request_body_round_trip(self, make_client, recorder):
+        """
+        Test that large POST bodies are sent gzipped and decoded by the server.
+        """
+        payload = {'title': 'compressed', 'body': 'lorem ipsum ' * 500, 'userId': 1}
+        created = make_client(compress_min_size=1024).post('posts', payload)
+        assert created['body'] == payload['body']
+        series = recorder.summary()['endpoints']['POST posts']
+        assert 0 < series['wire_bytes_out'] * 4 < series['bytes_out']
+
+    def test_async_client_compression(self, mock_server):
+        """
+        Test that the async client negotiates compression and reports wire bytes too.
+        """
+        recorder = MetricsRecorder()
+
+        async def run():
+            async with AsyncAPIClient(base_url=mock_server.base_url, metrics=recorder,
+                                      compress_min_size=1024) as client:
+                photos = await client.get('photos', params={'_limit': 1000})
+                created = await client.post('posts', {'body': 'lorem ipsum ' * 500})
+                return photos, created
+
+        photos, created = asyncio.run(run())
+        assert len(photos) == 1000
+        assert created['body'] == 'lorem ipsum ' * 500
+        summary = recorder.summary()['endpoints']
+        assert 0 < summary['GET photos']['wire_bytes_in'] < summary['GET photos']['bytes_in']
+        assert 0 < summary['POST posts']['wire_bytes_out'] < summary['POST posts']['bytes_out']
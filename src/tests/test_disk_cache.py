@@ -0,0 +1,159 @@
+import multiprocessing
+import sqlite3
+import time
+
+import pytest
+from requests.exceptions import HTTPError, RequestException
+from src.api.clients import APIClient
+from src.api.disk_cache import DiskCache
+from src.api.pool import ConnectionPool
+from src.config.settings import DISK_CACHE_MAX_BYTES
+from src.mock_server.app import MockServer, create_app
+
+
+def _write_entries(path, worker, count, max_bytes=DISK_CACHE_MAX_BYTES):
+    cache = DiskCache(path=path, max_bytes=max_bytes)
+
+    class Response:
+        status_code = 200
+        headers = {}
+        content = b'{"worker": %d}' % worker
+
+    for i in range(count):
+        cache.store(f'GET http://stub/items/{worker}/{i}', f'items/{worker}/{i}', Response())
+
+
+class TestDiskCache:
+    """
+    Test class for the persistent SQLite response cache.
+    """
+
+    def test_responses_persist_across_instances(self, stub_server, tmp_path):
+        """
+        Test that a response stored by one client is served to a later one without a request.
+        """
+        path = str(tmp_path / 'responses.sqlite3')
+        APIClient(base_url=stub_server.base_url, pool=ConnectionPool(), cache=DiskCache(path=path)).get('users')
+        client = APIClient(base_url=stub_server.base_url, pool=ConnectionPool(), cache=DiskCache(path=path))
+        assert len(client.get('users')) == 10
+        assert client.pool_stats()['requests'] == 0
+        assert client.cache_stats()['hits'] == 1
+
+    def test_record_then_replay_offline(self, stub_server, tmp_path):
+        """
+        Test that a recorded sequence of calls, writes included, replays with the network unreachable.
+        """
+        path = str(tmp_path / 'responses.sqlite3')
+        recorder = APIClient(base_url=stub_server.base_url, pool=ConnectionPool(),
+                             cache=DiskCache(path=path, mode='record'))
+        recorded = [recorder.get('posts/1'), recorder.post('posts', {'title': 'foo'}), recorder.delete('posts/1')]
+
+        replayer = APIClient(base_url=stub_server.base_url, pool=ConnectionPool(),
+                             cache=DiskCache(path=path, mode='replay'))
+        replayed = [replayer.get('posts/1'), replayer.post('posts', {'title': 'foo'}), replayer.delete('posts/1')]
+        assert replayed == recorded
+        assert replayer.pool_stats()['requests'] == 0
+        with pytest.raises(RequestException):
+            replayer.get('posts/2')
+
+    def test_streams_and_pages_replay_offline(self, tmp_path):
+        """
+        Test that streamed collections and pages are recorded, and replay with their headers and no network.
+        """
+        path = str(tmp_path / 'responses.sqlite3')
+        with MockServer(create_app()) as server:
+            recorder = APIClient(base_url=server.base_url, pool=ConnectionPool(),
+                                 cache=DiskCache(path=path, mode='record'))
+            streamed = list(recorder.stream('comments', params={'postId': 1}))
+            page = recorder.get_page('posts', params={'_page': 2, '_limit': 10})
+        replayer = APIClient(base_url=server.base_url, pool=ConnectionPool(),
+                             cache=DiskCache(path=path, mode='replay'))
+        assert list(replayer.stream('comments', params={'postId': 1})) == streamed and len(streamed) == 5
+        assert replayer.get_page('posts', params={'_page': 2, '_limit': 10}) == page and page[1] == 100
+        assert replayer.pool_stats()['requests'] == 0
+        with pytest.raises(RequestException):
+            list(replayer.stream('comments', params={'postId': 2}))
+
+    def test_only_successful_gets_are_served(self, tmp_path):
+        """
+        Test that failed GETs are not recorded, recorded GETs expire, and stored errors are never served as hits.
+        """
+        path = str(tmp_path / 'responses.sqlite3')
+        with MockServer(create_app()) as server:
+            recorder = APIClient(base_url=server.base_url, pool=ConnectionPool(),
+                                 cache=DiskCache(path=path, mode='record'))
+            with pytest.raises(HTTPError):
+                list(recorder.stream('unknown'))
+            with pytest.raises(HTTPError):
+                recorder.get_page('unknown')
+            recorder.get_page('posts', params={'_page': 1, '_limit': 5})
+        rows = sqlite3.connect(path).execute('SELECT status, expires_at FROM responses').fetchall()
+        assert len(rows) == 1 and rows[0][0] == 200 and rows[0][1] < time.time() + DiskCache(path=path).default_ttl + 1
+
+        class Failure:
+            status_code = 500
+            headers = {}
+            content = b'{"error": "boom"}'
+
+        cache = DiskCache(path=path)
+        cache.record('GET http://stub/broken', 'broken', Failure())
+        assert cache.lookup('GET http://stub/broken') is None
+
+    def test_size_based_eviction(self, tmp_path):
+        """
+        Test that the least recently used bodies are evicted once the size limit is exceeded.
+        """
+        path = str(tmp_path / 'responses.sqlite3')
+        _write_entries(path, 1, 5, max_bytes=40)
+        _write_entries(path, 2, 5, max_bytes=40)
+        cache = DiskCache(path=path)
+        assert cache.stats()['bytes'] <= 40
+        assert cache.lookup('GET http://stub/items/1/0') is None
+        assert cache.lookup('GET http://stub/items/2/4') is not None
+
+    def test_running_size_total(self, tmp_path):
+        """
+        Test that the stored size total follows inserts, overwrites, evictions and clears.
+        """
+        path = str(tmp_path / 'responses.sqlite3')
+        _write_entries(path, 1, 5)
+        _write_entries(path, 1, 5)
+        assert DiskCache(path=path).stats()['bytes'] == 5 * len(b'{"worker": 1}')
+        _write_entries(path, 10, 3, max_bytes=60)
+        cache = DiskCache(path=path)
+        rows = sqlite3.connect(path).execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        assert cache.stats()['bytes'] == rows <= 60
+        cache.clear()
+        assert cache.stats()['bytes'] == 0
+
+    def test_access_time_updates_are_throttled(self, tmp_path):
+        """
+        Test that a hit only rewrites the entry's access time once the previous one is old enough.
+        """
+        path = str(tmp_path / 'responses.sqlite3')
+        _write_entries(path, 1, 1)
+        cache, key = DiskCache(path=path), 'GET http://stub/items/1/0'
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.execute('UPDATE responses SET accessed_at = ?', (time.time() - 10,))
+        accessed_at = conn.execute('SELECT accessed_at FROM responses').fetchone()[0]
+        assert cache.lookup(key) is not None
+        assert conn.execute('SELECT accessed_at FROM responses').fetchone()[0] == accessed_at
+        conn.execute('UPDATE responses SET accessed_at = ?', (time.time() - 3600,))
+        assert cache.lookup(key) is not None
+        assert conn.execute('SELECT accessed_at FROM responses').fetchone()[0] > time.time() - 10
+
+    def test_concurrent_writer_processes(self, tmp_path):
+        """
+        Test that several processes can write to the same store at once.
+        """
+        path = str(tmp_path / 'responses.sqlite3')
+        DiskCache(path=path)
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=_write_entries, args=(path, worker, 50)) for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+        assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+        assert DiskCache(path=path).stats()['size'] == 200
+
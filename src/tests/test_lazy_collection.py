@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.api.pagination import LazyCollection
+from src.api.pool import ConnectionPool
+from src.api.retry import RetryPolicy
+from src.mock_server.app import MockServer, create_app
+from src.mock_server.store import DataStore
+from src.services.comment_service import AsyncCommentService
+from src.services.photo_service import PhotoService
+
+
+@pytest.fixture(scope='class')
+def mock_server():
+    with MockServer(create_app(DataStore())) as server:
+        yield server
+
+
+@pytest.fixture
+def mock_client(mock_server):
+    pool = ConnectionPool()
+    yield APIClient(base_url=mock_server.base_url, pool=pool, retry=RetryPolicy(max_retries=0))
+    pool.close()
+
+
+def fake_pages(size, delay=0.0, with_total=True):
+    """
+    Builds a fetch_page function over ``range(size)`` that records the pages requested.
+    """
+    requested = []
+
+    def fetch_page(params):
+        requested.append(params['_page'])
+        time.sleep(delay)
+        start = (params['_page'] - 1) * params['_limit']
+        return list(range(size))[start:start + params['_limit']], size if with_total else None
+
+    return fetch_page, requested
+
+
+class TestLazyCollection:
+    """
+    Test class for the auto-paginating lazy collections.
+    """
+
+    def test_iterates_every_page(self, mock_client):
+        """
+        Test that a lazy fetch_all_* yields the whole filtered collection and knows its size from one request.
+        """
+        photos = PhotoService(mock_client).fetch_all_photos({'albumId': 2}, lazy=True, page_size=20)
+        assert len(photos) == 50
+        assert photos.pages_fetched == 1
+        assert [photo['id'] for photo in photos] == list(range(51, 101))
+        assert photos.pages_fetched == 3
+
+    def test_prefetch_stays_one_page_ahead(self):
+        """
+        Test that the next page downloads while the current one is processed, and never more than one ahead.
+        """
+        fetch_page, requested = fake_pages(50, delay=0.05)
+        started = time.perf_counter()
+        for index, page in enumerate(LazyCollection(fetch_page, page_size=10).pages(), start=1):
+            assert len(requested) <= index + 1
+            time.sleep(0.05)
+        assert time.perf_counter() - started < 0.45
+        assert requested == [1, 2, 3, 4, 5]
+
+    def test_stops_when_the_consumer_breaks(self):
+        """
+        Test that breaking out of the loop stops requesting pages.
+        """
+        fetch_page, requested = fake_pages(1000)
+        for item in LazyCollection(fetch_page, page_size=100):
+            if item == 150:
+                break
+        time.sleep(0.05)
+        assert requested in ([1, 2], [1, 2, 3])
+
+    def test_len_without_total_count(self):
+        """
+        Test that the size is counted page by page when the server sends no X-Total-Count.
+        """
+        fetch_page, requested = fake_pages(250, with_total=False)
+        collection = LazyCollection(fetch_page, page_size=100, params={'_page': 7, 'userId': 1})
+        assert len(collection) == 250
+        assert requested == [1, 2, 3]
+        assert collection.params == {'userId': 1}
+
+    def test_page_errors_are_wrapped(self):
+        """
+        Test that a lazy collection fails like the eager call when a page cannot be fetched.
+        """
+        pool = ConnectionPool()
+        client = APIClient(base_url='http://127.0.0.1:1', pool=pool, retry=RetryPolicy(max_retries=0))
+        photos = PhotoService(client).fetch_all_photos(lazy=True)
+        with pytest.raises(Exception, match='Failed to fetch all photos'):
+            list(photos)
+        pool.close()
+
+    def test_async_collection(self, mock_server):
+        """
+        Test async iteration, count() and early exit of the async lazy collection.
+        """
+        async def run():
+            async with AsyncAPIClient(base_url=mock_server.base_url) as client:
+                comments = await AsyncCommentService(client).fetch_all_comments({'postId': 3}, lazy=True, page_size=2)
+                with pytest.raises(TypeError):
+                    len(comments)
+                size = await comments.count()
+                ids = [comment['id'] async for comment in comments]
+                everything = await AsyncCommentService(client).fetch_all_comments(lazy=True, page_size=50)
+                async for comment in everything:
+                    if comment['id'] == 60:
+                        break
+                await asyncio.sleep(0.05)
+            return size, ids, everything.pages_fetched
+
+        size, ids, pages_fetched = asyncio.run(run())
+        assert size == 5
+        assert ids == [11, 12, 13, 14, 15]
+        assert pages_fetched <= 3
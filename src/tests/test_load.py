@@ -0,0 +1,52 @@
+import pytest
+from src.load.runner import LoadConfig, run_load
+from src.load.scenarios import ScenarioMix, parse_mix
+
+MIX = 'fetch_post_by_id=70,create_comment=20,fetch_all_todos=10'
+
+
+class TestLoadRunner:
+    """
+    Test class for the load runner built on the async services.
+    """
+
+    def test_mix_is_parsed_from_service_methods(self):
+        """
+        Test that mix entries resolve to service methods and unknown ones are rejected.
+        """
+        operations = parse_mix(MIX)
+        assert [(op.name, op.resource, op.weight) for op in operations] == [
+            ('fetch_post_by_id', 'posts', 70), ('create_comment', 'comments', 20), ('fetch_all_todos', 'todos', 10)]
+        with pytest.raises(ValueError):
+            parse_mix('fetch_everything=1')
+        with pytest.raises(ValueError):
+            parse_mix({'fetch_post_by_id': 0})
+
+    def test_mix_is_picked_by_weight(self):
+        """
+        Test that operations are drawn in proportion to their weights.
+        """
+        mix = ScenarioMix(parse_mix(MIX), seed=1)
+        picks = [mix.pick().name for _ in range(10000)]
+        assert 0.67 < picks.count('fetch_post_by_id') / len(picks) < 0.73
+        assert 0.08 < picks.count('fetch_all_todos') / len(picks) < 0.12
+
+    def test_closed_model(self, stub_server):
+        """
+        Test that N users across worker processes run the mix and report percentiles.
+        """
+        config = LoadConfig(MIX, duration=1, workers=2, users=4, base_url=stub_server.base_url, seed=7)
+        summary = run_load(config, live=False).summary()
+        assert set(summary['operations']) == {'fetch_post_by_id', 'create_comment', 'fetch_all_todos'}
+        assert summary['total']['count'] > 20
+        assert summary['total']['errors'] == 0
+        assert summary['total']['p50_ms'] <= summary['total']['p99_ms']
+
+    def test_open_model_holds_the_arrival_rate(self, stub_server):
+        """
+        Test that the open model starts operations at the configured rate.
+        """
+        config = LoadConfig('fetch_user_by_id=1', duration=1, workers=1, rate=50, base_url=stub_server.base_url)
+        summary = run_load(config, live=False).summary()
+        assert 45 <= summary['total']['count'] <= 51
+        assert summary['dropped'] == 0
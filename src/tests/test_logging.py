@@ -0,0 +1,280 @@
+import gzip
+import io
+import json
+import logging
+import queue
+import threading
+
+import pytest
+from src.benchmarks.logging_startup import benchmark_startup
+from src.config import logging_config
+from src.config.logging_config import (LOG_FORMAT, BatchingQueueListener, CompressingRotatingFileHandler,
+                                       JSONFormatter, NonBlockingQueueHandler, SamplingFilter, configure_logging,
+                                       get_file_handler)
+
+
+class Payload:
+    """
+    Log argument recording the thread that turned it into text.
+    """
+
+    def __init__(self):
+        self.formatted_on = None
+
+    def __str__(self):
+        self.formatted_on = threading.current_thread().name
+        return 'payload'
+
+
+@pytest.fixture
+def queue_logger():
+    logger = logging.getLogger('test.queue_logging')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    logger.handlers.clear()
+
+
+@pytest.fixture
+def restore_logging():
+    """
+    Puts back the log file the session was writing to.
+    """
+    previous = logging_config._file_handler
+    yield
+    configure_logging(previous.baseFilename if previous is not None else None)
+
+
+def root_file_handlers():
+    """
+    Returns the registered file handlers the root logger writes to, directly or through the queue writer.
+    """
+    listener = logging_config._listener
+    targets = listener.handlers if listener is not None else logging.getLogger().handlers
+    return [handler for handler in targets if handler in logging_config._file_handlers.values()]
+
+
+def attach(logger, size=0, policy='drop'):
+    stream = io.StringIO()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.Queue(size)
+    handler = NonBlockingQueueHandler(log_queue, policy)
+    logger.addHandler(handler)
+    return handler, BatchingQueueListener(log_queue, [target], batch_size=64), stream
+
+
+class TestQueueLogging:
+    """
+    Test class for the queue logging mode and its background writer.
+    """
+
+    def test_records_are_formatted_and_written_on_the_writer_thread(self, queue_logger):
+        """
+        Test that messages are built from their arguments by the writer, in order, and all written on stop.
+        """
+        handler, listener, stream = attach(queue_logger)
+        listener.start()
+        payload = Payload()
+        queue_logger.info("Created new post successfully: %s", payload)
+        for number in range(200):
+            queue_logger.info("record %s", number)
+        listener.stop()
+        lines = stream.getvalue().splitlines()
+        assert lines[0].endswith('Created new post successfully: payload')
+        assert [line.rsplit(' ', 1)[1] for line in lines[1:]] == [str(number) for number in range(200)]
+        assert payload.formatted_on == 'log-writer'
+        assert listener.written == 201
+        assert listener.batches <= 201
+
+    def test_disabled_levels_are_never_formatted(self, queue_logger):
+        """
+        Test that lazy arguments of filtered-out records are never turned into text.
+        """
+        handler, listener, stream = attach(queue_logger)
+        payload = Payload()
+        queue_logger.debug("Fetched %s", payload)
+        assert payload.formatted_on is None
+        assert handler.queue.empty()
+
+    def test_full_queue_drops_records(self, queue_logger):
+        """
+        Test that the drop policy discards and counts records instead of blocking the caller.
+        """
+        handler, listener, stream = attach(queue_logger, size=5)
+        for number in range(8):
+            queue_logger.info("record %s", number)
+        assert handler.dropped == 3
+        listener.start()
+        listener.stop()
+        assert stream.getvalue().count('INFO - record') == 5
+
+    def test_full_queue_blocks_callers(self, queue_logger):
+        """
+        Test that the block policy keeps every record by waiting for the writer.
+        """
+        handler, listener, stream = attach(queue_logger, size=2, policy='block')
+        listener.start()
+        for number in range(100):
+            queue_logger.info("record %s", number)
+        listener.stop()
+        assert handler.dropped == 0
+        assert stream.getvalue().count('INFO - record') == 100
+
+    def test_unknown_policy_is_rejected(self):
+        """
+        Test that only the drop and block policies are accepted.
+        """
+        with pytest.raises(ValueError):
+            NonBlockingQueueHandler(queue.Queue(), 'spill')
+
+
+class TestLoggingSetup:
+    """
+    Test class for the one-time, process-wide logging initialization.
+    """
+
+    def test_repeated_configuration_is_a_no_op(self, restore_logging):
+        """
+        Test that calls without a log file, as made by every service import, change nothing once configured.
+        """
+        configure_logging()
+        handlers = list(logging.getLogger().handlers)
+        registered = len(logging_config._file_handlers)
+        for _ in range(10):
+            configure_logging()
+        assert logging.getLogger().handlers == handlers
+        assert len(logging_config._file_handlers) == registered
+
+    def test_file_handlers_are_reused_per_name(self, tmp_path, restore_logging):
+        """
+        Test that switching between log files reuses one handler per file and keeps one on the root logger.
+        """
+        first, second = str(tmp_path / 'test_posts.log'), str(tmp_path / 'test_users.log')
+        configure_logging(first)
+        handler = root_file_handlers()[0]
+        configure_logging(second)
+        configure_logging(first)
+        assert root_file_handlers() == [handler]
+        assert get_file_handler(first) is handler
+        logging.getLogger('test.setup').info('written once')
+        if logging_config._listener is not None:
+            logging_config._listener.stop()
+            logging_config._listener.start()
+        assert open(first).read().count('written once') == 1
+
+    def test_forked_workers_initialize_again(self, restore_logging, monkeypatch):
+        """
+        Test that a process with another pid, such as a forked worker, sets up its own handlers.
+        """
+        configure_logging()
+        console = logging_config._console_handler
+        monkeypatch.setattr(logging_config.os, 'getpid', lambda: -1)
+        configure_logging()
+        assert logging_config._console_handler is not console
+        assert logging_config._configured_pid == -1
+
+    def test_startup_benchmark(self):
+        """
+        Test that importing every service and switching through the test log files creates one log file.
+        """
+        results = benchmark_startup(repeat=1)
+        assert results['log_files'] == 1
+        assert results['open_log_files'] == 1
+        assert results['collect_ms'] > 0
+
+
+class TestStructuredLogging:
+    """
+    Test class for JSON-lines output, sampling and compressed rotation.
+    """
+
+    def test_json_lines(self, queue_logger):
+        """
+        Test that records become one parseable JSON object per line, with the traceback of errors.
+        """
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JSONFormatter())
+        queue_logger.addHandler(handler)
+        queue_logger.info("Created new post successfully: %s", {'id': 101, 'title': 'café'})
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            queue_logger.exception("Failed to create post")
+        first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert first['message'] == "Created new post successfully: {'id': 101, 'title': 'café'}"
+        assert (first['level'], first['logger'], first['func']) == ('INFO', 'test.queue_logging', 'test_json_lines')
+        assert second['level'] == 'ERROR' and 'ValueError: boom' in second['exc']
+
+    def test_sampling_rates_resolve_by_longest_key(self):
+        """
+        Test that the most specific logger prefix and function pattern decides the rate.
+        """
+        sampler = SamplingFilter({'src.services': 0.5, 'src.services:fetch_*': 0.01, 'src.api': 0})
+        assert sampler.rate_for('src.services.post_service', 'fetch_post_by_id') == 0.01
+        assert sampler.rate_for('src.services.post_service', 'create_post') == 0.5
+        assert sampler.rate_for('src.api.clients', 'get') == 0
+        assert sampler.rate_for('src.servicesx', 'fetch_post_by_id') == 1.0
+
+    def test_sampling_keeps_errors_and_a_share_of_successes(self):
+        """
+        Test that 1% of successful fetch_* records are kept, every error is, and handlers agree.
+        """
+        sampler = SamplingFilter({'test.sampling:fetch_*': 0.01}, seed=3)
+        logger = logging.getLogger('test.sampling')
+        logger.propagate = False
+        streams = [io.StringIO(), io.StringIO()]
+        for stream in streams:
+            handler = logging.StreamHandler(stream)
+            handler.addFilter(sampler)
+            logger.addHandler(handler)
+
+        def fetch_post_by_id(post_id):
+            logger.info("Fetched post by ID %s successfully.", post_id)
+            if post_id % 100 == 0:
+                logger.error("Failed to fetch post by ID %s: %s", post_id, 'timeout')
+
+        try:
+            for post_id in range(1, 10001):
+                fetch_post_by_id(post_id)
+        finally:
+            logger.handlers.clear()
+        lines = streams[0].getvalue().splitlines()
+        assert streams[1].getvalue() == streams[0].getvalue()
+        assert sum(line.startswith('Failed') for line in lines) == 100
+        assert 50 <= sum(line.startswith('Fetched') for line in lines) <= 150
+        assert sampler.kept + sampler.skipped == 10000
+
+    def test_rotated_files_are_compressed(self, tmp_path, queue_logger):
+        """
+        Test that files past the size limit rotate into gzipped backups, keeping only the newest ones.
+        """
+        path = tmp_path / 'app.log'
+        handler = CompressingRotatingFileHandler(str(path), max_bytes=2000, backup_count=2)
+        handler.setFormatter(JSONFormatter())
+        queue_logger.addHandler(handler)
+        for number in range(200):
+            queue_logger.info("record %s", number)
+        handler.close()
+        assert sorted(file.name for file in tmp_path.iterdir()) == ['app.log', 'app.log.1.gz', 'app.log.2.gz']
+        backup = gzip.decompress((tmp_path / 'app.log.1.gz').read_bytes()).decode()
+        numbers = [int(json.loads(line)['message'].split()[1]) for line in backup.splitlines()]
+        assert numbers == list(range(numbers[0], numbers[0] + len(numbers)))
+        assert 2000 <= len(backup) < 2200
+
+    def test_queue_writer_rotates(self, tmp_path, queue_logger):
+        """
+        Test that batched writes in queue mode also rotate the file.
+        """
+        handler = CompressingRotatingFileHandler(str(tmp_path / 'app.log'), max_bytes=2000, backup_count=5)
+        handler.setFormatter(JSONFormatter())
+        log_queue = queue.Queue()
+        queue_logger.addHandler(NonBlockingQueueHandler(log_queue))
+        listener = BatchingQueueListener(log_queue, [handler], batch_size=10)
+        for number in range(100):
+            queue_logger.info("record %s", number)
+        listener.start()
+        listener.stop()
+        handler.close()
+        assert (tmp_path / 'app.log.1.gz').exists()
@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+from requests.exceptions import HTTPError
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.api.metrics import (Histogram, JSONFileSink, MetricsRecorder, PrometheusFileSink, RequestTiming,
+                             endpoint_template)
+from src.api.pool import ConnectionPool
+
+
+@pytest.fixture
+def recorder():
+    return MetricsRecorder()
+
+
+@pytest.fixture
+def metered_client(stub_server, recorder):
+    pool = ConnectionPool()
+    yield APIClient(base_url=stub_server.base_url, pool=pool, metrics=recorder)
+    pool.close()
+
+
+class TestMetrics:
+    """
+    Test class for per-request latency instrumentation.
+    """
+
+    def test_endpoint_template_groups_ids(self):
+        """
+        Test that numeric path segments collapse so one route is one series.
+        """
+        assert endpoint_template('posts/1') == 'posts/{id}'
+        assert endpoint_template('/posts/42/comments?x=1') == 'posts/{id}/comments'
+        assert endpoint_template('users') == 'users'
+
+    def test_histogram_percentiles_within_a_bucket(self):
+        """
+        Test that percentiles land within one 10% bucket of the exact value.
+        """
+        histogram = Histogram()
+        for millis in range(1, 1001):
+            histogram.observe(millis / 1000)
+        assert histogram.count == 1000
+        assert 0.5 <= histogram.percentile(50) <= 0.55
+        assert 0.9 <= histogram.percentile(90) <= 0.99
+        assert 0.99 <= histogram.percentile(99) <= 1.0
+        assert histogram.percentile(100) == 1.0
+
+    def test_requests_are_recorded_per_endpoint_and_method(self, metered_client, recorder):
+        """
+        Test that every call lands in its endpoint and method series with phase timings.
+        """
+        for post_id in range(1, 6):
+            metered_client.get(f'posts/{post_id}')
+        metered_client.post('posts', {'title': 'foo'})
+        summary = metered_client.metrics_summary()
+        gets = summary['endpoints']['GET posts/{id}']
+        assert gets['requests'] == 5
+        assert gets['statuses'] == {'200': 5}
+        assert gets['bytes_in'] > 0
+        assert gets['timings']['connect']['count'] == 1
+        assert gets['timings']['ttfb']['count'] == 5
+        assert gets['timings']['total']['p50'] <= gets['timings']['total']['p99']
+        assert summary['endpoints']['POST posts']['bytes_out'] > 0
+        assert summary['methods']['GET']['requests'] == 5
+        assert summary['methods']['POST']['requests'] == 1
+
+    def test_error_statuses_are_counted(self, stub_server, metered_client):
+        """
+        Test that failing responses are recorded with their status.
+        """
+        stub_server.inject(status=404)
+        with pytest.raises(HTTPError):
+            metered_client.get('posts/1')
+        assert metered_client.metrics_summary()['endpoints']['GET posts/{id}']['statuses'] == {'404': 1}
+
+    def test_async_requests_are_recorded(self, stub_server, recorder):
+        """
+        Test that the async client records into the same recorder through aiohttp tracing.
+        """
+        async def scenario():
+            async with AsyncAPIClient(base_url=stub_server.base_url, metrics=recorder) as client:
+                await asyncio.gather(*(client.get(f'todos/{todo_id}') for todo_id in range(1, 11)))
+
+        asyncio.run(scenario())
+        todos = recorder.summary()['endpoints']['GET todos/{id}']
+        assert todos['requests'] == 10
+        assert todos['timings']['ttfb']['count'] == 10
+        assert todos['timings']['connect']['count'] >= 1
+
+    def test_disabled_recorder_records_nothing(self, stub_server):
+        """
+        Test that a disabled recorder leaves the summary empty.
+        """
+        recorder = MetricsRecorder(enabled=False)
+        APIClient(base_url=stub_server.base_url, pool=ConnectionPool(), metrics=recorder).get('users/1')
+        assert recorder.summary() == {'endpoints': {}, 'methods': {}}
+
+    def test_file_sinks(self, tmp_path):
+        """
+        Test that flushing writes the JSON snapshot and the Prometheus exposition.
+        """
+        json_path, prom_path = tmp_path / 'metrics.json', tmp_path / 'metrics.prom'
+        recorder = MetricsRecorder(sinks=[JSONFileSink(str(json_path)), PrometheusFileSink(str(prom_path))])
+        timing = recorder.start('GET', 'users/3')
+        recorder.finish(timing, 200, bytes_in=120)
+        recorder.flush()
+        assert json.loads(json_path.read_text())['endpoints']['GET users/{id}']['bytes_in'] == 120
+        text = prom_path.read_text()
+        assert 'api_request_duration_seconds_count{method="GET",endpoint="users/{id}"} 1' in text
+        assert 'api_requests_total{method="GET",endpoint="users/{id}",status="200"} 1' in text
+
+    def test_timing_is_slotted(self):
+        """
+        Test that request timings carry no per-instance dict.
+        """
+        assert not hasattr(RequestTiming('GET', 'posts'), '__dict__')
@@ -0,0 +1,132 @@
+import time
+
+import pytest
+import requests
+from requests.exceptions import HTTPError
+from src.api.clients import APIClient
+from src.api.pool import ConnectionPool
+from src.api.retry import RetryPolicy
+from src.mock_server.app import MockServer, create_app
+from src.mock_server.store import DataStore
+from src.services.comment_service import CommentService
+from src.services.post_service import PostService
+from src.utils.helpers import load_test_data
+
+
+@pytest.fixture(scope='class')
+def mock_server():
+    with MockServer(create_app(DataStore(scale=1000))) as server:
+        yield server
+
+
+@pytest.fixture
+def mock_client(mock_server):
+    pool = ConnectionPool()
+    yield APIClient(base_url=mock_server.base_url, pool=pool, retry=RetryPolicy(max_retries=0))
+    pool.close()
+
+
+class TestMockServer:
+    """
+    Test class for the Flask mock backend.
+    """
+
+    def test_services_run_against_mock(self, mock_client):
+        """
+        Test that the post service CRUD test data works unchanged against the mock.
+        """
+        data = load_test_data('posts')
+        service = PostService(mock_client)
+        assert service.fetch_post_by_id(data['get_post_by_id']['post_id'])['id'] == 1
+        created = service.create_post(data['create_post']['new_post'])
+        assert created['title'] == 'foo'
+        assert service.fetch_post_by_id(created['id'])['title'] == 'foo'
+        updated = data['update_post']['updated_post']
+        assert service.update_post(updated['id'], updated)['title'] == 'updated title'
+        assert service.delete_post(created['id']) == 200
+        with pytest.raises(Exception):
+            service.fetch_post_by_id(created['id'])
+
+    def test_millions_of_records_are_indexed(self, mock_server):
+        """
+        Test that a five-million-record store answers id and foreign key lookups without scanning.
+        """
+        started = time.perf_counter()
+        photo = requests.get(f'{mock_server.base_url}/photos/4999999').json()
+        album_photos = requests.get(f'{mock_server.base_url}/photos?albumId=99999').json()
+        assert time.perf_counter() - started < 1
+        assert photo['albumId'] == 100000
+        assert [item['id'] for item in album_photos] == list(range(4999901, 4999951))
+
+    def test_pagination_reports_total_count(self, mock_server):
+        """
+        Test _page/_limit and _start/_end slicing with the X-Total-Count header.
+        """
+        response = requests.get(f'{mock_server.base_url}/posts', params={'_page': 3, '_limit': 5})
+        assert [item['id'] for item in response.json()] == [11, 12, 13, 14, 15]
+        assert response.headers['X-Total-Count'] == '100000'
+        assert 'rel="next"' in response.headers['Link']
+        response = requests.get(f'{mock_server.base_url}/comments', params={'postId': 2, '_start': 1, '_end': 3})
+        assert [item['id'] for item in response.json()] == [7, 8]
+        assert response.headers['X-Total-Count'] == '5'
+
+    def test_deep_pages_are_indexed(self):
+        """
+        Test that a page deep into millions of records is located by position, around deleted and created records.
+        """
+        data = DataStore(scale=1000)
+        store = data['photos']
+        for record_id in (1, 2, 4999999):
+            store.delete(record_id)
+        created = store.create({'albumId': 1})['id']
+        with MockServer(create_app(data)) as server:
+            started = time.perf_counter()
+            response = requests.get(f'{server.base_url}/photos', params={'_page': 50000, '_limit': 100})
+            assert time.perf_counter() - started < 0.5
+        assert [item['id'] for item in response.json()] == list(range(4999903, 4999999)) + [5000000, created]
+        assert response.headers['X-Total-Count'] == '4999998'
+        assert store.page_ids(0, 3) == [3, 4, 5]
+
+    def test_nested_resources_and_filters(self, mock_client):
+        """
+        Test nested routes and filtering on non-indexed fields.
+        """
+        comments = mock_client.get('posts/1/comments')
+        assert [comment['postId'] for comment in comments] == [1] * 5
+        todos = mock_client.get('users/1/todos?completed=true')
+        assert len(todos) == 10 and all(todo['completed'] for todo in todos)
+        with pytest.raises(HTTPError):
+            mock_client.get('users/1/comments')
+
+    def test_foreign_key_index_follows_writes(self, mock_client):
+        """
+        Test that created and moved records show up under their new parent.
+        """
+        service = CommentService(mock_client)
+        created = service.create_comment({'postId': 3, 'name': 'new', 'email': 'a@b.c', 'body': 'x'})
+        service.update_comment(11, {'postId': 4, 'name': 'moved', 'email': 'a@b.c', 'body': 'y'})
+        assert created['id'] in [comment['id'] for comment in mock_client.get('posts/3/comments')]
+        post_3 = [comment['id'] for comment in mock_client.get('comments?postId=3')]
+        post_4 = [comment['id'] for comment in mock_client.get('comments?postId=4')]
+        assert 11 not in post_3 and 11 in post_4
+
+    def test_fault_injection(self):
+        """
+        Test configurable latency and error injection, including changes at runtime.
+        """
+        with MockServer(create_app(DataStore(), error_rate=1.0, error_status=503)) as server:
+            assert requests.get(f'{server.base_url}/users/1').status_code == 503
+            requests.put(f'{server.base_url}/__admin/faults', json={'error_rate': 0, 'latency': 0.05})
+            started = time.perf_counter()
+            assert requests.get(f'{server.base_url}/users/1').status_code == 200
+            assert time.perf_counter() - started >= 0.05
+
+    def test_seed_directory_is_served(self, tmp_path):
+        """
+        Test that seed records replace generated ones.
+        """
+        (tmp_path / 'users.json').write_text('[{"id": 1, "name": "Seeded"}, {"id": 42, "name": "Extra"}]')
+        store = DataStore(seed_dir=str(tmp_path))
+        assert store['users'].get(1)['name'] == 'Seeded'
+        assert store['users'].get(42)['name'] == 'Extra'
+        assert len(store['users']) == 11
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import sys
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.api.pool import ConnectionPool
+from src.api.retry import RetryPolicy
+from src.mock_server.app import MockServer, create_app
+from src.mock_server.store import DataStore, build_dataset
+from src.models.resources import Comment, Photo, User, decode
+from src.services.photo_service import AsyncPhotoService, PhotoService
+from src.services.post_service import PostService
+from src.services.user_service import UserService
+
+USER = {
+    'id': 1, 'name': 'Leanne Graham', 'username': 'Bret', 'email': 'Sincere@april.biz',
+    'address': {'street': 'Kulas Light', 'suite': 'Apt. 556', 'city': 'Gwenborough', 'zipcode': '92998-3874',
+                'geo': {'lat': '-37.3159', 'lng': '81.1496'}},
+    'phone': '1-770-736-8031 x56442', 'website': 'hildegard.org',
+    'company': {'name': 'Romaguera-Crona', 'catchPhrase': 'Multi-layered client-server neural-net',
+                'bs': 'harness real-time e-markets'},
+}
+
+
+@pytest.fixture(scope='class')
+def mock_server():
+    with MockServer(create_app(DataStore())) as server:
+        yield server
+
+
+@pytest.fixture
+def mock_client(mock_server):
+    pool = ConnectionPool()
+    yield APIClient(base_url=mock_server.base_url, pool=pool, retry=RetryPolicy(max_retries=0))
+    pool.close()
+
+
+class TestModels:
+    """
+    Test class for the __slots__ resource models.
+    """
+
+    def test_round_trip(self):
+        """
+        Test that models map camelCase keys to attributes, nested objects included, and back.
+        """
+        user = decode(User, USER)
+        assert user.address.geo.lat == '-37.3159'
+        assert user.company.catch_phrase == 'Multi-layered client-server neural-net'
+        assert user.to_dict() == USER
+        assert not hasattr(user, '__dict__')
+        partial = decode(Comment, [{'postId': 1, 'id': 1, 'name': 'a', 'email': 'b', 'body': 'c'}, {'id': 501}])
+        assert partial[1] == Comment(id=501)
+        assert partial[1].to_dict() == {'id': 501}
+
+    def test_models_are_smaller_than_dicts(self):
+        """
+        Test that models of the photos payload take well under half the memory of the dicts.
+        """
+        dicts = json.loads(json.dumps(build_dataset()['photos']))
+        models = decode(Photo, dicts)
+        # Field values are the same objects either way; the difference is the per-record container
+        assert sum(map(sys.getsizeof, models)) < 0.5 * sum(map(sys.getsizeof, dicts))
+
+    def test_services_return_models(self, mock_client):
+        """
+        Test the opt-in models flag across list, lookup, nested, lazy and write methods.
+        """
+        photos = PhotoService(mock_client, models=True)
+        assert all(isinstance(photo, Photo) for photo in photos.fetch_all_photos({'albumId': 1}))
+        assert photos.fetch_photo_by_id(7).album_id == 1
+        assert [photo.id for photo in photos.fetch_all_photos(lazy=True, page_size=2000)][-1] == 5000
+        assert next(photos.iter_all_photos({'albumId': 2})).id == 51
+        assert next(photos.iter_photo_pages(page_size=3))[2].id == 3
+        assert photos.fetch_photos_by_ids([1, 2]).results[1].id == 2
+        created = photos.create_photo(Photo(album_id=1, title='new', url='u', thumbnail_url='t'))
+        assert isinstance(created, Photo) and created.thumbnail_url == 't'
+        assert isinstance(PostService(mock_client, models=True).fetch_post_comments(1)[0], Comment)
+        user = UserService(mock_client, models=True).fetch_user_by_id(1)
+        assert isinstance(user, User) and user.company.catch_phrase == 'catch phrase 1'
+        assert user.address.geo.lat is not None and user.phone and user.website
+        assert isinstance(PhotoService(mock_client).fetch_photo_by_id(7), dict)
+
+    def test_async_services_return_models(self, mock_server):
+        """
+        Test the models flag on the async services.
+        """
+        async def run():
+            async with AsyncAPIClient(base_url=mock_server.base_url) as client:
+                service = AsyncPhotoService(client, models=True)
+                photos = await service.fetch_all_photos({'albumId': 3})
+                streamed = [photo async for photo in service.iter_all_photos({'albumId': 3})]
+            return photos, streamed
+
+        photos, streamed = asyncio.run(run())
+        assert photos == streamed
+        assert photos[0] == Photo(album_id=3, id=101, title='photo 101', url='https://via.placeholder.com/600/000065',
+                                  thumbnail_url='https://via.placeholder.com/150/000065')
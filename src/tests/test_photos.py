@@ -1,19 +1,15 @@
 import pytest
-import json
-import os
 from src.services.photo_service import PhotoService
+from src.utils.helpers import load_test_data
 from src.utils.logging_utils import setup_logging
 
 
-@pytest.fixture(scope='class')
-def photo_service():
-    service = PhotoService()
+@pytest.fixture(scope='session')
+def photo_service(api_client):
+    service = PhotoService(api_client)
     logger = setup_logging('photos')
-    logger.info("Initialized PhotoService for test class.")
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_file = os.path.join(base_dir, '../data/photos_test_data.json')
-    with open(data_file) as f:
-        test_data = json.load(f)
+    logger.info("Initialized PhotoService for test session.")
+    test_data = load_test_data('photos')
     return service, logger, test_data
 
 
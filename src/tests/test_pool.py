@@ -0,0 +1,94 @@
+import socket
+import threading
+
+import pytest
+from src.api.clients import APIClient
+from src.api.metrics import MetricsRecorder
+from src.api.pool import ConnectionPool, get_default_pool
+from src.services.post_service import PostService
+from src.services.user_service import UserService
+
+
+@pytest.fixture
+def pooled_client(stub_server):
+    pool = ConnectionPool(pool_maxsize=4)
+    yield APIClient(base_url=stub_server.base_url, pool=pool)
+    pool.close()
+
+
+class TestConnectionPool:
+    """
+    Test class for the keep-alive connection pool behind APIClient.
+    """
+
+    def test_sequential_requests_reuse_connection(self, pooled_client):
+        """
+        Test that back-to-back calls share one kept-alive connection.
+        """
+        for post_id in range(1, 11):
+            assert pooled_client.get(f'posts/{post_id}')['id'] == post_id
+        stats = pooled_client.pool_stats()
+        assert stats['opened'] == 1
+        assert stats['reused'] == 9
+        assert stats['requests'] == 10
+        assert stats['idle'] == 1
+
+    def test_threaded_requests_stay_within_pool_size(self, pooled_client):
+        """
+        Test that concurrent callers share the pool without opening a socket per call.
+        Each thread asks for its own user, so no call is coalesced with another thread's.
+        """
+        def worker(user_id):
+            for _ in range(10):
+                pooled_client.get(f'users/{user_id}')
+
+        threads = [threading.Thread(target=worker, args=(user_id,)) for user_id in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = pooled_client.pool_stats()
+        assert stats['requests'] == 40
+        assert stats['opened'] <= 4
+        assert stats['opened'] + stats['reused'] == 40
+
+    def test_idle_connections_expire(self, stub_server):
+        """
+        Test that a connection idle past the keep-alive timeout is replaced.
+        """
+        pool = ConnectionPool(idle_timeout=0)
+        client = APIClient(base_url=stub_server.base_url, pool=pool)
+        client.get('posts/1')
+        client.get('posts/2')
+        stats = pool.stats()
+        pool.close()
+        assert stats['opened'] == 2
+        assert stats['expired'] == 1
+
+    def test_services_share_default_pool(self):
+        """
+        Test that every service client uses the process-wide pool.
+        """
+        assert PostService().client.pool is get_default_pool()
+        assert UserService().client.pool is get_default_pool()
+
+    def test_connect_falls_back_to_later_addresses(self, stub_server, monkeypatch):
+        """
+        Test that with connect timing on, a host whose first address refuses is reached on the next one.
+        """
+        port = stub_server.base_url.rsplit(':', 1)[1]
+        resolve = socket.getaddrinfo
+
+        def dual_stack(host, *args, **kwargs):
+            if host != 'dual-stack.test':
+                return resolve(host, *args, **kwargs)
+            # Nothing listens on 127.0.0.2, so the first address is refused
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (address, int(port)))
+                    for address in ('127.0.0.2', '127.0.0.1')]
+
+        monkeypatch.setattr(socket, 'getaddrinfo', dual_stack)
+        recorder, pool = MetricsRecorder(), ConnectionPool()
+        client = APIClient(base_url=f'http://dual-stack.test:{port}', pool=pool, metrics=recorder)
+        assert client.get('posts/1')['id'] == 1
+        pool.close()
+        assert recorder.summary()['endpoints']['GET posts/{id}']['timings']['dns']['count'] == 1
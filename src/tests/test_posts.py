@@ -1,19 +1,15 @@
 import pytest
-import json
-import os
 from src.services.post_service import PostService
+from src.utils.helpers import load_test_data
 from src.utils.logging_utils import setup_logging
 
 
-@pytest.fixture(scope='class')
-def post_service():
-    service = PostService()
+@pytest.fixture(scope='session')
+def post_service(api_client):
+    service = PostService(api_client)
     logger = setup_logging('posts')
-    logger.info("Initialized PostService for test class.")
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_file = os.path.join(base_dir, '../data/posts_test_data.json')
-    with open(data_file) as f:
-        test_data = json.load(f)
+    logger.info("Initialized PostService for test session.")
+    test_data = load_test_data('posts')
     return service, logger, test_data
 
 
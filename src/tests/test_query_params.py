@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient, with_query
+from src.api.pool import ConnectionPool
+from src.api.retry import RetryPolicy
+from src.mock_server.app import MockServer, create_app
+from src.mock_server.store import DataStore
+from src.services.album_service import AsyncAlbumService
+from src.services.comment_service import AsyncCommentService, CommentService
+from src.services.photo_service import PhotoService
+from src.services.post_service import PostService
+from src.services.user_service import UserService
+
+
+@pytest.fixture(scope='class')
+def mock_server():
+    with MockServer(create_app(DataStore())) as server:
+        yield server
+
+
+@pytest.fixture
+def mock_client(mock_server):
+    pool = ConnectionPool()
+    yield APIClient(base_url=mock_server.base_url, pool=pool, retry=RetryPolicy(max_retries=0))
+    pool.close()
+
+
+class TestQueryParams:
+    """
+    Test class for query parameters, pagination and nested resources.
+    """
+
+    def test_query_is_normalised(self):
+        """
+        Test that params are sorted, None values dropped and existing queries extended.
+        """
+        assert with_query('comments', {'postId': 1, '_limit': 5, 'email': None}) == 'comments?_limit=5&postId=1'
+        assert with_query('todos?completed=true', {'userId': 2}) == 'todos?completed=true&userId=2'
+        assert with_query('posts', {}) == 'posts'
+
+    def test_filters_and_slices(self, mock_client):
+        """
+        Test that fetch_all_* sends filters, _page/_limit and _start/_end to the server.
+        """
+        service = CommentService(mock_client)
+        assert {comment['postId'] for comment in service.fetch_all_comments({'postId': 1})} == {1}
+        assert [c['id'] for c in service.fetch_all_comments({'_page': 2, '_limit': 3})] == [4, 5, 6]
+        assert [c['id'] for c in service.fetch_all_comments({'_start': 10, '_end': 12})] == [11, 12]
+        assert [c['id'] for c in service.iter_all_comments({'postId': 2})] == [6, 7, 8, 9, 10]
+
+    def test_pages_are_fetched_on_demand(self, mock_client):
+        """
+        Test that the page iterator stops requesting once the consumer stops or a short page arrives.
+        """
+        service = PhotoService(mock_client)
+        pages = service.iter_photo_pages(page_size=20, params={'albumId': 1})
+        assert [len(page) for page in pages] == [20, 20, 10]
+        requests_before = mock_client.metrics_summary()['endpoints']['GET photos']['requests']
+        first = next(service.iter_photo_pages(page_size=100))
+        assert [photo['id'] for photo in first] == list(range(1, 101))
+        assert mock_client.metrics_summary()['endpoints']['GET photos']['requests'] == requests_before + 1
+
+    def test_nested_resources(self, mock_client):
+        """
+        Test the nested-resource helpers.
+        """
+        assert {c['postId'] for c in PostService(mock_client).fetch_post_comments(1)} == {1}
+        users = UserService(mock_client)
+        assert len(users.fetch_user_posts(1)) == 10
+        assert len(users.fetch_user_albums(2)) == 10
+        assert all(todo['completed'] for todo in users.fetch_user_todos(1, {'completed': 'true'}))
+
+    def test_cache_keys_include_query(self, mock_client):
+        """
+        Test that differently filtered responses are cached separately.
+        """
+        first = mock_client.get('comments', params={'postId': 1})
+        second = mock_client.get('comments', params={'postId': 2})
+        assert first != second
+        assert mock_client.get('comments', params={'postId': 1}) == first
+
+    def test_async_variants(self, mock_server):
+        """
+        Test params, pages and nested helpers on the async services.
+        """
+        async def run():
+            async with AsyncAPIClient(base_url=mock_server.base_url) as client:
+                comments = await AsyncCommentService(client).fetch_all_comments({'postId': 3})
+                pages = [page async for page in AsyncCommentService(client).iter_comment_pages(page_size=2,
+                                                                                                 params={'postId': 3})]
+                photos = await AsyncAlbumService(client).fetch_album_photos(1, {'_limit': 5})
+            return comments, pages, photos
+
+        comments, pages, photos = asyncio.run(run())
+        assert [c['id'] for c in comments] == [11, 12, 13, 14, 15]
+        assert [[c['id'] for c in page] for page in pages] == [[11, 12], [13, 14], [15]]
+        assert [photo['id'] for photo in photos] == [1, 2, 3, 4, 5]
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.api.pool import ConnectionPool
+from src.api.rate_limit import EndpointLimit, RateLimiter, TokenBucket
+from src.api.retry import RetryPolicy
+
+
+@pytest.fixture
+def stub(stub_server):
+    stub_server.reset_faults()
+    yield stub_server
+    stub_server.reset_faults()
+
+
+class TestRateLimiter:
+    """
+    Test class for the client-side rate limiter and concurrency governor.
+    """
+
+    def test_token_bucket_paces_requests(self, stub):
+        """
+        Test that requests beyond the burst are spread out at the configured rate.
+        """
+        limiter = RateLimiter(limits={'posts': {'rate': 50, 'burst': 5}})
+        client = APIClient(base_url=stub.base_url, pool=ConnectionPool(), rate_limiter=limiter)
+        start = time.monotonic()
+        for post_id in range(1, 16):
+            client.get(f'posts/{post_id}')
+        elapsed = time.monotonic() - start
+        assert elapsed >= 10 / 50 * 0.9
+
+    def test_limits_resolve_by_longest_prefix(self):
+        """
+        Test that per-endpoint-prefix limits apply and other endpoints fall back to the default.
+        """
+        limiter = RateLimiter(rate=0, limits={'photos': {'rate': 10}, 'posts/1/comments': {'max_in_flight': 2}})
+        assert limiter.limit_for('photos/7').prefix == 'photos'
+        assert limiter.limit_for('posts/1/comments?_limit=5').prefix == 'posts/1/comments'
+        assert limiter.limit_for('posts/1').prefix == ''
+        assert limiter.limit_for('photosets').prefix == ''
+
+    def test_max_in_flight_caps_threads(self):
+        """
+        Test that no more than max_in_flight threaded callers hold a slot at once.
+        """
+        limit = EndpointLimit('photos', max_in_flight=3)
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def worker():
+            with limit.slot():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=worker) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert peak[0] == 3
+
+    def test_max_in_flight_caps_coroutines(self, stub):
+        """
+        Test that async callers share the same governor without blocking the event loop.
+        """
+        limiter = RateLimiter(limits={'comments': {'max_in_flight': 2}})
+        stub.inject(delay=0.05, count=6)
+
+        async def scenario():
+            async with AsyncAPIClient(base_url=stub.base_url, rate_limiter=limiter) as client:
+                start = time.monotonic()
+                await asyncio.gather(*(client.get(f'comments/{i}') for i in range(1, 7)))
+                return time.monotonic() - start
+
+        assert asyncio.run(scenario()) >= 3 * 0.05 * 0.9
+
+    def test_429_slows_the_bucket_and_recovers(self, stub):
+        """
+        Test that a 429 halves the rate and pauses callers, and successes restore the rate.
+        """
+        limiter = RateLimiter(limits={'users': {'rate': 100, 'burst': 100}})
+        client = APIClient(base_url=stub.base_url, pool=ConnectionPool(), rate_limiter=limiter,
+                           retry=RetryPolicy(base_delay=0.001, max_delay=0.01))
+        stub.inject(429, headers={'Retry-After': '0.2'})
+        start = time.monotonic()
+        client.get('users/1')
+        assert time.monotonic() - start >= 0.2
+        # Halved by the 429, then nudged back up by the successful retry
+        assert limiter.stats()['users'] == 55
+        for _ in range(10):
+            client.get('users/1')
+        assert limiter.stats()['users'] == 100
+
+    def test_rate_limit_headers_adapt_rate(self):
+        """
+        Test that the remaining quota and reset window lower the rate to what the server allows.
+        """
+        limit = EndpointLimit('posts', rate=100)
+        limit.observe(200, {'X-RateLimit-Remaining': '20', 'X-RateLimit-Reset': '2'})
+        assert limit.bucket.rate == 10
+        limit.observe(200, {'RateLimit-Remaining': '0', 'RateLimit-Reset': '1'})
+        assert limit.bucket.reserve() > 0.9
+
+    def test_bucket_reservations_are_fair(self):
+        """
+        Test that borrowing tokens queues callers one interval apart.
+        """
+        bucket = TokenBucket(rate=10, burst=1)
+        waits = [bucket.reserve() for _ in range(4)]
+        assert waits[0] == 0
+        assert waits[3] == pytest.approx(0.3, abs=0.02)
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from requests.exceptions import HTTPError, ReadTimeout
+from src.api.clients import APIClient
+from src.api.pool import ConnectionPool
+from src.api.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+@pytest.fixture
+def stub(stub_server):
+    stub_server.reset_faults()
+    yield stub_server
+    stub_server.reset_faults()
+
+
+def make_client(stub, **policy_kwargs):
+    policy = RetryPolicy(base_delay=0.001, max_delay=0.05, **policy_kwargs)
+    return APIClient(base_url=stub.base_url, pool=ConnectionPool(), retry=policy)
+
+
+class TestRetryPolicy:
+    """
+    Test class for timeouts, retries and the retry budget.
+    """
+
+    def test_transient_errors_are_retried(self, stub):
+        """
+        Test that an idempotent GET survives 503 and 429 responses.
+        """
+        client = make_client(stub)
+        stub.inject(503)
+        stub.inject(429, headers={'Retry-After': '0'})
+        assert client.get('posts/1')['id'] == 1
+        stats = client.retry_stats()
+        assert stats['retries'] == 2
+        assert stats['reasons'] == {'503': 1, '429': 1}
+
+    def test_post_is_not_retried(self, stub):
+        """
+        Test that non-idempotent requests fail on the first error.
+        """
+        client = make_client(stub)
+        stub.inject(503)
+        with pytest.raises(HTTPError):
+            client.post('posts', {'title': 'foo'})
+        assert client.retry_stats()['retries'] == 0
+
+    def test_retries_are_bounded(self, stub):
+        """
+        Test that the last error surfaces once RETRY_COUNT retries are used up.
+        """
+        client = make_client(stub, max_retries=2)
+        stub.inject(500, count=5)
+        with pytest.raises(HTTPError):
+            client.get('posts/1')
+        stats = client.retry_stats()
+        assert stats['retries'] == 2
+        assert stats['gave_up'] == 1
+
+    def test_read_timeout_is_retried(self, stub):
+        """
+        Test that a hung response times out instead of stalling, and the retry then succeeds.
+        """
+        client = make_client(stub)
+        client.timeout = (1, 0.2)
+        stub.inject(delay=0.5)
+        assert client.get('users/1')['id'] == 1
+        assert client.retry_stats()['reasons'] == {'ReadTimeout': 1}
+
+    def test_timeout_surfaces_when_retries_run_out(self, stub):
+        """
+        Test that a persistently slow backend raises a timeout error.
+        """
+        client = make_client(stub, max_retries=0)
+        client.timeout = (1, 0.1)
+        stub.inject(delay=0.3)
+        with pytest.raises(ReadTimeout):
+            client.get('users/1')
+
+    def test_budget_limits_retry_amplification(self, stub):
+        """
+        Test that once the budget is spent, failures are no longer retried.
+        """
+        client = make_client(stub, budget=RetryBudget(ratio=0.0, min_retries=1))
+        stub.inject(503, count=10)
+        with pytest.raises(HTTPError):
+            client.get('posts/1')
+        with pytest.raises(HTTPError):
+            client.get('posts/1')
+        stats = client.retry_stats()
+        assert stats['retries'] == 1
+        assert stats['budget_exhausted'] == 2
+
+    def test_decorrelated_jitter_stays_in_bounds(self):
+        """
+        Test that delays stay between the base delay and the cap.
+        """
+        policy = RetryPolicy(base_delay=0.1, max_delay=2)
+        delay = policy.base_delay
+        for _ in range(50):
+            delay = policy.next_delay(delay)
+            assert 0.1 <= delay <= 2
+
+    def test_parse_retry_after(self):
+        """
+        Test both Retry-After formats.
+        """
+        assert parse_retry_after('3') == 3
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('soon') is None
+        future = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(time.time() + 30))
+        assert 25 < parse_retry_after(future) <= 30
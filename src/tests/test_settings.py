@@ -0,0 +1,164 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.api.pool import ConnectionPool
+from src.config import settings as settings_module
+from src.config.settings import Field, Settings, settings
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """
+    Writes a .env file with a staging profile next to it, with no overriding environment variables.
+    """
+    for name in ('API_BASE_URL', 'ENV', 'TIMEOUT', 'RETRY_COUNT', 'LOG_LEVEL', 'PYTEST_XDIST_WORKER'):
+        monkeypatch.delenv(name, raising=False)
+    path = tmp_path / '.env'
+    path.write_text('API_BASE_URL=https://dev.example.com\nTIMEOUT=12.5\nRETRY_COUNT=4\nLOG_LEVEL=debug\n'
+                    'API_BASE_URL__GW1=https://dev-1.example.com\n')
+    (tmp_path / '.env.staging').write_text('API_BASE_URL=https://staging.example.com\nRETRY_COUNT=1\n')
+    return path
+
+
+class TestSettings:
+    """
+    Test class for the lazily loaded, typed settings.
+    """
+
+    def test_import_reads_nothing(self):
+        """
+        Test that importing the client modules neither reads .env nor requires API_BASE_URL.
+        """
+        code = ('import src.api.clients, src.api.async_client, src.utils.helpers\n'
+                'from src.config.settings import settings\n'
+                'print(settings._raw is None)')
+        env = {'PATH': '', 'ENV_FILE': '/nonexistent/.env'}
+        root = os.path.dirname(settings_module.ENV_FILE)
+        completed = subprocess.run([sys.executable, '-c', code], cwd=root, env=env, capture_output=True, text=True,
+                                   check=True)
+        assert completed.stdout.strip() == 'True'
+
+    def test_values_are_typed_and_cached(self, env_file):
+        """
+        Test that values are converted from their strings once, and defaults apply to unset keys.
+        """
+        config = Settings(env_file=str(env_file))
+        assert config.TIMEOUT == 12.5 and config.RETRY_COUNT == 4 and config.LOG_LEVEL == 'DEBUG'
+        assert config.ENV == 'development'
+        assert config.POOL_BLOCK is False and config.RATE_LIMIT_BURST is None and config.RATE_LIMITS == {}
+        assert config.BATCH_MAX_WORKERS == config.POOL_MAXSIZE
+        env_file.write_text('API_BASE_URL=https://other.example.com\n')
+        assert config.API_BASE_URL == 'https://dev.example.com'
+
+    def test_environment_wins_over_env_file(self, env_file, monkeypatch):
+        """
+        Test that process environment variables override the .env file.
+        """
+        monkeypatch.setenv('TIMEOUT', '3')
+        assert Settings(env_file=str(env_file)).TIMEOUT == 3.0
+
+    def test_profile_overrides(self, env_file, monkeypatch):
+        """
+        Test that the .env.<profile> file selected by ENV or the constructor overrides the .env file.
+        """
+        config = Settings(env_file=str(env_file), profile='staging')
+        assert (config.ENV, config.API_BASE_URL, config.RETRY_COUNT) == ('staging', 'https://staging.example.com', 1)
+        assert config.TIMEOUT == 12.5
+        monkeypatch.setenv('ENV', 'staging')
+        assert Settings(env_file=str(env_file)).API_BASE_URL == 'https://staging.example.com'
+
+    def test_worker_overrides(self, env_file, monkeypatch):
+        """
+        Test that each pytest-xdist worker can have its own base URL.
+        """
+        monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+        assert Settings(env_file=str(env_file)).API_BASE_URL == 'https://dev-1.example.com'
+        monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw0')
+        assert Settings(env_file=str(env_file)).API_BASE_URL == 'https://dev.example.com'
+
+    def test_reload(self, env_file, monkeypatch):
+        """
+        Test that reload picks up an edited .env file and switches profile.
+        """
+        config = Settings(env_file=str(env_file))
+        assert config.RETRY_COUNT == 4
+        env_file.write_text('API_BASE_URL=https://dev.example.com\nRETRY_COUNT=7\n')
+        config.reload()
+        assert config.RETRY_COUNT == 7
+        config.reload(profile='staging')
+        assert config.RETRY_COUNT == 1
+
+    def test_reload_during_a_read_is_kept(self, env_file):
+        """
+        Test that a value read before a concurrent reload is not cached over the reloaded sources.
+        """
+        reloaded = []
+
+        def parse_then_reload(value):
+            if not reloaded:
+                env_file.write_text('API_BASE_URL=https://dev.example.com\nRETRY_COUNT=7\n')
+                config.reload()
+                reloaded.append(True)
+            return int(value)
+
+        class ReloadingSettings(Settings):
+            RETRY_COUNT = Field(parse_then_reload, '3')
+
+        config = ReloadingSettings(env_file=str(env_file))
+        assert config.RETRY_COUNT == 4
+        assert config.RETRY_COUNT == 7
+
+    def test_missing_and_invalid_values(self, tmp_path, monkeypatch):
+        """
+        Test that a missing required key or an unparsable value fails when read, naming the key.
+        """
+        monkeypatch.delenv('API_BASE_URL', raising=False)
+        monkeypatch.setenv('TIMEOUT', 'soon')
+        config = Settings(env_file=str(tmp_path / '.env'))
+        with pytest.raises(ValueError, match='API_BASE_URL environment variable is not set'):
+            config.API_BASE_URL
+        with pytest.raises(ValueError, match='Invalid value for TIMEOUT'):
+            config.TIMEOUT
+
+    def test_clients_read_settings_when_created(self, monkeypatch):
+        """
+        Test that clients created after an override or reload use the new values, without reimporting anything,
+        including the shared retry policy, pool and rate limiter.
+        """
+        pool = ConnectionPool()
+        with settings.override(API_BASE_URL='http://127.0.0.1:1', TIMEOUT=2.0, COALESCE_REQUESTS=False):
+            client = APIClient(pool=pool)
+            async_client = AsyncAPIClient()
+            assert settings_module.API_BASE_URL == 'http://127.0.0.1:1'
+        assert client.base_url == async_client.base_url == 'http://127.0.0.1:1'
+        assert client.timeout[1] == 2.0 and client.coalescer is None
+        assert APIClient(pool=pool).base_url == settings.API_BASE_URL
+        pool.close()
+
+        before = APIClient()
+        retries_before = before.retry.max_retries
+        monkeypatch.setenv('RETRY_COUNT', '0')
+        monkeypatch.setenv('POOL_MAXSIZE', '2')
+        monkeypatch.setenv('RATE_LIMIT', '50')
+        settings.reload()
+        try:
+            client = APIClient()
+            assert client.retry.max_retries == 0 and client.pool._adapter._pool_maxsize == 2
+            assert client.rate_limiter.stats()[''] == 50
+            assert client.pool is not before.pool and before.retry.max_retries == retries_before
+        finally:
+            monkeypatch.undo()
+            settings.reload()
+        assert APIClient().retry.max_retries == settings.RETRY_COUNT
+
+    def test_unknown_override_is_rejected(self):
+        """
+        Test that overriding a setting that does not exist fails instead of being ignored.
+        """
+        with pytest.raises(AttributeError):
+            with settings.override(API_BASE_UR='http://127.0.0.1:1'):
+                pass
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+from src.api.async_client import AsyncAPIClient
+from src.api.clients import APIClient
+from src.api.streaming import JSONArrayDecoder
+from src.services.comment_service import AsyncCommentService
+from src.services.photo_service import PhotoService
+
+
+class TestStreaming:
+    """
+    Test class for incremental decoding of collection responses.
+    """
+
+    def test_decoder_handles_arbitrary_chunk_boundaries(self):
+        """
+        Test that items split across chunks, including multi-byte characters, decode intact.
+        """
+        payload = [{'id': 1, 'title': 'café ☕'}, 12345, 'text, with ] brackets', None, [1, [2]]]
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        decoder = JSONArrayDecoder()
+        items = []
+        for i in range(len(body)):
+            items.extend(decoder.feed(body[i:i + 1]))
+        items.extend(decoder.close())
+        assert items == payload
+
+    @pytest.mark.parametrize('body', [b'{"id": 1}', b'[1, 2', b'[1 2]', b'[1,]', b'[1] 2'])
+    def test_decoder_rejects_malformed_bodies(self, body):
+        """
+        Test that anything other than one complete JSON array is rejected.
+        """
+        decoder = JSONArrayDecoder()
+        with pytest.raises(ValueError):
+            decoder.feed(body)
+            decoder.close()
+
+    def test_service_streams_collection(self, stub_server):
+        """
+        Test that the iterator variant yields the same items as the buffered fetch.
+        """
+        service = PhotoService()
+        service.client = APIClient(base_url=stub_server.base_url)
+        streamed = service.iter_all_photos()
+        assert next(streamed)['id'] == 1
+        assert sum(1 for _ in streamed) == 4999
+        assert list(service.iter_all_photos()) == service.fetch_all_photos()
+
+    def test_stream_can_stop_early(self, stub_server):
+        """
+        Test that breaking out of the iterator releases the response.
+        """
+        client = APIClient(base_url=stub_server.base_url)
+        for photo in client.stream('photos', chunk_size=1024):
+            if photo['id'] == 10:
+                break
+        assert client.get('photos/10')['id'] == 10
+
+    def test_async_service_streams_collection(self, stub_server):
+        """
+        Test the async iterator variant.
+        """
+        async def scenario():
+            async with AsyncAPIClient(base_url=stub_server.base_url) as client:
+                return [comment['id'] async for comment in AsyncCommentService(client).iter_all_comments()]
+
+        assert asyncio.run(scenario()) == list(range(1, 501))
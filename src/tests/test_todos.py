@@ -1,19 +1,15 @@
 import pytest
-import json
-import os
 from src.services.todo_service import TodoService
+from src.utils.helpers import load_test_data
 from src.utils.logging_utils import setup_logging
 
 
-@pytest.fixture(scope='class')
-def todo_service():
-    service = TodoService()
+@pytest.fixture(scope='session')
+def todo_service(api_client):
+    service = TodoService(api_client)
     logger = setup_logging('todos')
-    logger.info("Initialized TodoService for test class.")
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_file = os.path.join(base_dir, '../data/todos_test_data.json')
-    with open(data_file) as f:
-        test_data = json.load(f)
+    logger.info("Initialized TodoService for test session.")
+    test_data = load_test_data('todos')
     return service, logger, test_data
 
 
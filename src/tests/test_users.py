@@ -1,19 +1,15 @@
 import pytest
-import json
-import os
 from src.services.user_service import UserService
+from src.utils.helpers import load_test_data
 from src.utils.logging_utils import setup_logging
 
 
-@pytest.fixture(scope='class')
-def user_service():
-    service = UserService()
+@pytest.fixture(scope='session')
+def user_service(api_client):
+    service = UserService(api_client)
     logger = setup_logging('users')
-    logger.info("Initialized UserService for test class.")
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    data_file = os.path.join(base_dir, '../data/users_test_data.json')
-    with open(data_file) as f:
-        test_data = json.load(f)
+    logger.info("Initialized UserService for test session.")
+    test_data = load_test_data('users')
     return service, logger, test_data
 
 
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+
+import pytest
+from src.api import metrics
+from src.api.metrics import PERCENTILES, Histogram
+
+PROFILE_PROPERTY = 'api_profile'
+
+
+def _network_time(intervals):
+    """
+    Returns the wall-clock time covered by at least one request, so concurrent calls are not double counted.
+
+    Args:
+        intervals (list): (start, end) pairs in seconds.
+
+    Returns:
+        float: The length of the union of the intervals.
+    """
+    covered, current_start, current_end = 0.0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                covered += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        covered += current_end - current_start
+    return covered
+
+
+def compare_reports(baseline, current, threshold=0.2, percentile='p90'):
+    """
+    Lists endpoints whose latency percentile grew by more than ``threshold`` between two reports.
+
+    Args:
+        baseline (dict): An earlier report written by APIProfiler.
+        current (dict): The report of the current run.
+        threshold (float): Allowed relative growth, e.g. 0.2 for 20%.
+        percentile (str): The percentile to compare, e.g. 'p90'.
+
+    Returns:
+        list: (endpoint, baseline seconds, current seconds) tuples, worst regression first.
+    """
+    regressions = []
+    for endpoint, stats in current.get('endpoints', {}).items():
+        before = baseline.get('endpoints', {}).get(endpoint, {}).get(percentile)
+        after = stats.get(percentile)
+        if before and after and after > before * (1 + threshold):
+            regressions.append((endpoint, before, after))
+    return sorted(regressions, key=lambda regression: regression[2] / regression[1], reverse=True)
+
+
+class APIProfiler:
+    """
+    pytest plugin that attributes every API request to the test that made it.
+    Each test's requests are summarized into its report's user properties, so the
+    profile survives pytest-xdist and is aggregated wherever reports are collected.
+
+    Attributes:
+        top (int): Number of endpoints and tests listed in the terminal summary.
+        report_path (str): Where the JSON report is written, or None to skip it.
+        compare_path (str): An earlier report to check for latency regressions, or None.
+        threshold (float): Relative p90 growth reported as a regression.
+        endpoints (dict): Mapping of 'METHOD endpoint' to its aggregated latency Histogram.
+        tests (dict): Mapping of test node ID to its duration, network time and request count.
+    """
+
+    def __init__(self, top, report_path=None, compare_path=None, threshold=0.2):
+        self.top = top
+        self.report_path = report_path
+        self.compare_path = compare_path
+        self.threshold = threshold
+        self.endpoints = {}
+        self.errors = {}
+        self.tests = {}
+        self._timings = []
+        self._recording = False
+        self._lock = threading.Lock()
+
+    def _on_request(self, timing):
+        # Calls from worker threads of a test (e.g. batch fetches) count towards that test
+        with self._lock:
+            if self._recording:
+                self._timings.append(timing)
+
+    def _drain(self):
+        """
+        Summarizes the requests of the running test and starts a new collection.
+        """
+        with self._lock:
+            timings, self._timings = self._timings, []
+        endpoints = {}
+        for timing in timings:
+            key = f'{timing.method} {timing.endpoint}'
+            entry = endpoints.get(key)
+            if entry is None:
+                entry = endpoints[key] = {'histogram': Histogram(), 'errors': 0}
+            entry['histogram'].observe(timing.total)
+            if timing.error is not None or (timing.status or 0) >= 400:
+                entry['errors'] += 1
+        return {
+            'calls': len(timings),
+            'network': _network_time([(timing.started, timing.started + timing.total) for timing in timings]),
+            'endpoints': {key: {'errors': entry['errors'], **entry['histogram'].to_dict()}
+                          for key, entry in endpoints.items()},
+        }
+
+    def pytest_configure(self, config):
+        metrics.add_listener(self._on_request)
+
+    def pytest_unconfigure(self, config):
+        metrics.remove_listener(self._on_request)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        with self._lock:
+            self._timings = []
+            self._recording = True
+        yield
+        with self._lock:
+            self._recording = False
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when == 'teardown':
+            item.user_properties.append((PROFILE_PROPERTY, self._drain()))
+        yield
+
+    def pytest_runtest_logreport(self, report):
+        test = self.tests.setdefault(report.nodeid, {'duration': 0.0, 'network': 0.0, 'calls': 0})
+        test['duration'] += report.duration
+        for name, profile in report.user_properties:
+            if name != PROFILE_PROPERTY:
+                continue
+            test['network'] += profile['network']
+            test['calls'] += profile['calls']
+            for key, data in profile['endpoints'].items():
+                self.endpoints.setdefault(key, Histogram()).merge(data)
+                self.errors[key] = self.errors.get(key, 0) + data['errors']
+
+    def report(self):
+        """
+        Builds the run report. Keys are sorted and times rounded to 0.1 ms so reports of two runs diff cleanly.
+
+        Returns:
+            dict: ``endpoints`` with calls, errors, total/mean/max and percentiles in seconds,
+            and ``tests`` with duration, network and local time in seconds plus the request count.
+        """
+        endpoints = {}
+        for key, histogram in self.endpoints.items():
+            stats = {'calls': histogram.count, 'errors': self.errors.get(key, 0),
+                     'total': round(histogram.sum, 4), 'mean': round(histogram.sum / histogram.count, 4),
+                     'max': round(histogram.max, 4)}
+            for percent in PERCENTILES:
+                stats[f'p{percent}'] = round(histogram.percentile(percent), 4)
+            endpoints[key] = stats
+        tests = {nodeid: {'calls': test['calls'], 'duration': round(test['duration'], 4),
+                          'network': round(test['network'], 4),
+                          'local': round(max(0.0, test['duration'] - test['network']), 4)}
+                 for nodeid, test in self.tests.items()}
+        return {'endpoints': endpoints, 'tests': tests}
+
+    def pytest_terminal_summary(self, terminalreporter, exitstatus, config):
+        if hasattr(config, 'workerinput'):
+            return
+        report = self.report()
+        baseline = None
+        # Read the baseline before writing, in case a run is compared against its own previous report
+        if self.compare_path and os.path.exists(self.compare_path):
+            with open(self.compare_path) as f:
+                baseline = json.load(f)
+        if self.report_path:
+            directory = os.path.dirname(self.report_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.report_path, 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+        if not report['endpoints']:
+            return
+        write = terminalreporter.write_line
+        terminalreporter.write_sep('=', f'slowest {self.top} API endpoints')
+        write(f"{'endpoint':<40} {'calls':>7} {'total s':>9} {'mean ms':>9} {'p50 ms':>9} {'p90 ms':>9} "
+              f"{'p99 ms':>9} {'errors':>7}")
+        ranked = sorted(report['endpoints'].items(), key=lambda item: item[1]['total'], reverse=True)
+        for key, stats in ranked[:self.top]:
+            write(f"{key:<40} {stats['calls']:>7} {stats['total']:>9.3f} {stats['mean'] * 1000:>9.1f} "
+                  f"{stats['p50'] * 1000:>9.1f} {stats['p90'] * 1000:>9.1f} {stats['p99'] * 1000:>9.1f} "
+                  f"{stats['errors']:>7}")
+        terminalreporter.write_sep('=', f'network vs local time of the {self.top} slowest tests')
+        write(f"{'calls':>7} {'network s':>10} {'local s':>9}  test")
+        ranked = sorted(report['tests'].items(), key=lambda item: item[1]['duration'], reverse=True)
+        for nodeid, stats in ranked[:self.top]:
+            write(f"{stats['calls']:>7} {stats['network']:>10.3f} {stats['local']:>9.3f}  {nodeid}")
+        if self.report_path:
+            write(f"API profile written to {self.report_path}")
+        if baseline is not None:
+            regressions = compare_reports(baseline, report, self.threshold)
+            terminalreporter.write_sep('=', f'{len(regressions)} API latency regressions vs {self.compare_path}')
+            for key, before, after in regressions:
+                write(f"{key:<40} p90 {before * 1000:.1f} ms -> {after * 1000:.1f} ms")
@@ -1,3 +1,15 @@
+import asyncio
+import copy
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+from src.config.settings import settings
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
 def format_response(response):
     """
     Formats the API response into a dictionary containing the status code and JSON data.
@@ -12,3 +24,221 @@ def format_response(response):
         "status_code": response.status_code,
         "json": response.json()
     }
+
+
+@lru_cache(maxsize=None)
+def _read_test_data(resource):
+    with open(os.path.join(DATA_DIR, f'{resource}_test_data.json')) as f:
+        return json.load(f)
+
+
+def load_test_data(resource):
+    """
+    Loads the test data for a resource from src/data, reading each file once per process.
+
+    Args:
+        resource (str): The resource name, e.g. 'posts'.
+
+    Returns:
+        dict: A fresh copy of the parsed test data.
+    """
+    return copy.deepcopy(_read_test_data(resource))
+
+
+class BatchResult:
+    """
+    Outcome of a batch lookup, aligned with the requested IDs.
+
+    Attributes:
+        ids (list): The requested IDs, in input order and including repeats.
+        results (list): The fetched item for each entry of ``ids``, or None where the lookup failed.
+        errors (dict): Mapping of each failed ID to the exception it raised.
+    """
+
+    def __init__(self, ids, results, errors):
+        self.ids = ids
+        self.results = results
+        self.errors = errors
+
+    @property
+    def ok(self):
+        """
+        bool: True when every lookup succeeded.
+        """
+        return not self.errors
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+
+def _unique(ids):
+    """
+    Returns the IDs with repeats removed, keeping first-seen order.
+    """
+    return list(dict.fromkeys(ids))
+
+
+def fetch_many(fetch, ids, max_workers):
+    """
+    Runs ``fetch`` for every distinct ID on a thread pool and collects the results in input order.
+
+    A failing lookup is recorded in ``BatchResult.errors`` without cancelling the rest of the batch.
+
+    Args:
+        fetch (callable): Function taking a single ID and returning the item.
+        ids (iterable): The IDs to fetch; repeated IDs are fetched once.
+        max_workers (int): Maximum number of lookups running at once; None for BATCH_MAX_WORKERS from settings.
+
+    Returns:
+        BatchResult: The fetched items and per-ID failures.
+    """
+    max_workers = max_workers or settings.BATCH_MAX_WORKERS
+    ids = list(ids)
+    unique_ids = _unique(ids)
+    fetched, errors = {}, {}
+    if unique_ids:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_ids)))) as executor:
+            futures = {executor.submit(fetch, item_id): item_id for item_id in unique_ids}
+            for future in as_completed(futures):
+                item_id = futures[future]
+                try:
+                    fetched[item_id] = future.result()
+                except Exception as e:
+                    errors[item_id] = e
+    return BatchResult(ids, [fetched.get(item_id) for item_id in ids], errors)
+
+
+async def fetch_many_async(fetch, ids, max_workers):
+    """
+    Awaits ``fetch`` for every distinct ID concurrently and collects the results in input order.
+
+    Args:
+        fetch (callable): Coroutine function taking a single ID and returning the item.
+        ids (iterable): The IDs to fetch; repeated IDs are fetched once.
+        max_workers (int): Maximum number of lookups awaited at once; None for BATCH_MAX_WORKERS from settings.
+
+    Returns:
+        BatchResult: The fetched items and per-ID failures.
+    """
+    max_workers = max_workers or settings.BATCH_MAX_WORKERS
+    ids = list(ids)
+    unique_ids = _unique(ids)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def bounded(item_id):
+        async with semaphore:
+            return await fetch(item_id)
+
+    outcomes = await asyncio.gather(*(bounded(item_id) for item_id in unique_ids), return_exceptions=True)
+    fetched, errors = {}, {}
+    for item_id, outcome in zip(unique_ids, outcomes):
+        if isinstance(outcome, Exception):
+            errors[item_id] = outcome
+        else:
+            fetched[item_id] = outcome
+    return BatchResult(ids, [fetched.get(item_id) for item_id in ids], errors)
+
+
+def iter_pages(fetch_page, page_size, transform=None):
+    """
+    Yields a collection page by page using JSONPlaceholder's ``_page``/``_limit`` pagination.
+    Iteration stops at the first page shorter than ``page_size``.
+
+    Args:
+        fetch_page (callable): Function taking the pagination params and returning the page as a list.
+        page_size (int): Records requested per page; None for PAGE_SIZE from settings.
+        transform (callable): Applied to each page before it is yielded, e.g. to build models.
+
+    Yields:
+        list: The records of each non-empty page.
+    """
+    page_size = page_size or settings.PAGE_SIZE
+    page = 1
+    while True:
+        items = fetch_page({'_page': page, '_limit': page_size})
+        if items:
+            yield transform(items) if transform is not None else items
+        if len(items) < page_size:
+            return
+        page += 1
+
+
+async def iter_pages_async(fetch_page, page_size, transform=None):
+    """
+    Async counterpart of ``iter_pages``.
+
+    Args:
+        fetch_page (callable): Coroutine function taking the pagination params and returning the page as a list.
+        page_size (int): Records requested per page; None for PAGE_SIZE from settings.
+        transform (callable): Applied to each page before it is yielded, e.g. to build models.
+
+    Yields:
+        list: The records of each non-empty page.
+    """
+    page_size = page_size or settings.PAGE_SIZE
+    page = 1
+    while True:
+        items = await fetch_page({'_page': page, '_limit': page_size})
+        if items:
+            yield transform(items) if transform is not None else items
+        if len(items) < page_size:
+            return
+        page += 1
+
+
+def logged_page_fetch(fetch_page, transform, resource, logger):
+    """
+    Wraps the page fetch of a lazy ``fetch_all_*`` collection so that each page is logged, and its errors
+    are logged and wrapped like those of the eager call.
+
+    Args:
+        fetch_page (callable): Function taking the query params of a page and returning the page items and
+            the total count, like ``APIClient.get_page``.
+        transform (callable): Applied to each page's items, e.g. to build models.
+        resource (str): The collection name used in the messages, e.g. 'posts'.
+        logger (logging.Logger): The service's logger.
+
+    Returns:
+        callable: The page fetch to give to a LazyCollection.
+    """
+    def fetch(page):
+        try:
+            items, total = fetch_page(page)
+            items = transform(items)
+            logger.info("Fetched page %s of %s successfully.", page['_page'], resource)
+            return items, total
+        except Exception as e:
+            logger.error("Failed to fetch all %s: %s", resource, e)
+            raise Exception(f"Failed to fetch all {resource}: {e}")
+
+    return fetch
+
+
+def logged_page_fetch_async(fetch_page, transform, resource, logger):
+    """
+    Async counterpart of ``logged_page_fetch``, for an AsyncLazyCollection.
+
+    Args:
+        fetch_page (callable): Coroutine function taking the query params of a page and returning the page
+            items and the total count, like ``AsyncAPIClient.get_page``.
+        transform (callable): Applied to each page's items, e.g. to build models.
+        resource (str): The collection name used in the messages, e.g. 'posts'.
+        logger (logging.Logger): The service's logger.
+
+    Returns:
+        callable: The page fetch to give to an AsyncLazyCollection.
+    """
+    async def fetch(page):
+        try:
+            items, total = await fetch_page(page)
+            items = transform(items)
+            logger.info("Fetched page %s of %s successfully.", page['_page'], resource)
+            return items, total
+        except Exception as e:
+            logger.error("Failed to fetch all %s: %s", resource, e)
+            raise Exception(f"Failed to fetch all {resource}: {e}")
+
+    return fetch
@@ -1,10 +1,11 @@
-from src.config.logging_config import configure_logging, get_logger
+from src.config.logging_config import configure_logging, get_logger, worker_log_file
 
 
 def setup_logging(test_name: str):
     """
     Configures logging for a test run with a unique log file based on the test name.
+    In parallel runs each worker writes to its own file, e.g. logs/test_posts_gw0.log.
     """
-    log_file = f'logs/test_{test_name}.log'
+    log_file = worker_log_file(f'test_{test_name}')
     configure_logging(log_file)
     return get_logger(test_name)